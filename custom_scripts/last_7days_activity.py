@@ -3,6 +3,8 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from garminconnect import Garmin
+from garminconnect.intensity import IntensityEngine, ZoneModel
+from garminconnect.series import HeartRateSeries
 import garth
 from datetime import date, timedelta, datetime
 from config import email, password, MODERATE_MIN, MODERATE_MAX, VIGOROUS_MIN
@@ -31,6 +33,14 @@ try:
     end_date = date.today()
     start_date = end_date - timedelta(days=6)  # 6 days ago + today = 7 days
 
+    # Moderate/vigorous minutes per day; days evaluated once are cached for
+    # the weekly totals below (today included, the script runs only briefly)
+    intensity = IntensityEngine(
+        ZoneModel.create((MODERATE_MIN, VIGOROUS_MIN), MODERATE_MIN, VIGOROUS_MIN,
+                         moderate_max=MODERATE_MAX),
+        today=end_date + timedelta(days=1),
+    )
+
     print(f"{'=' * 50}")
     print(f"🏃 LAST 7 DAYS RUNNING SUMMARY")
     print(f"   {start_date} to {end_date}")
@@ -103,10 +113,13 @@ try:
 
                             if moderate_hrs:
                                 avg_hr_moderate = sum(moderate_hrs) / len(moderate_hrs)
-                                moderate_mins = len(moderate_hrs)  # Each reading ≈ 1 minute
                             if vigorous_hrs:
                                 avg_hr_vigorous = sum(vigorous_hrs) / len(vigorous_hrs)
-                                vigorous_mins = len(vigorous_hrs)  # Each reading ≈ 1 minute
+                            day_intensity = intensity.days(
+                                {current_date: HeartRateSeries.from_response(heart_rate)}
+                            )[current_date]
+                            moderate_mins = day_intensity.moderate_minutes
+                            vigorous_mins = day_intensity.vigorous_minutes
 
                             # Find when max HR occurred
                             if max_hr:
@@ -372,29 +385,16 @@ try:
         total_vigorous_mins = 0
         total_moderate_mins = 0
 
-        # We need to recalculate from daily data with proper exclusion
-        current_date = start_date
-        while current_date <= end_date:
-            date_str = current_date.isoformat()
-            try:
-                heart_rate = garmin.get_heart_rates(date_str)
-                if heart_rate:
-                    hr_values = heart_rate.get('heartRateValues', [])
-                    if hr_values:
-                        # First collect vigorous and track timestamps
-                        vigorous_timestamps = set()
-                        for timestamp, hr in hr_values:
-                            if hr and hr >= VIGOROUS_MIN:
-                                vigorous_timestamps.add(timestamp)
-                                total_vigorous_mins += 1
-
-                        # Then collect moderate ONLY from non-vigorous timestamps
-                        for timestamp, hr in hr_values:
-                            if hr and MODERATE_MIN <= hr < MODERATE_MAX and timestamp not in vigorous_timestamps:
-                                total_moderate_mins += 1
-            except:
-                pass
-            current_date += timedelta(days=1)
+        # Days already evaluated above come from the intensity cache; only
+        # the missing ones are fetched again
+        try:
+            week = intensity.summary(
+                intensity.from_api(garmin, start_date, end_date).values()
+            )
+            total_vigorous_mins = week["vigorous_minutes"]
+            total_moderate_mins = week["moderate_minutes"]
+        except Exception:
+            pass
 
         # WHO recommendation: 150 mins moderate OR 75 mins vigorous per week
         # For tennis stamina: vigorous intensity is key
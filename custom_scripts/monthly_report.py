@@ -2,6 +2,9 @@
 """
 Monthly Report - Last 4 Weeks Summary
 Shows weekly breakdown with trends and progress
+
+Daily data is read from the local sync store (~/.garminconnect/sync.db) and
+only missing days are fetched from Garmin, so repeated runs are fast.
 """
 
 import sys
@@ -9,16 +12,21 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from garminconnect import Garmin
+from garminconnect.reports import ReportData, summarize
+from garminconnect.sync import SQLiteSink
 import garth
 from datetime import date, timedelta
 from config import email, password
 
-def safe_get(data, key, default=None):
-    """Safely get value, returning default if None"""
-    if data is None:
-        return default
-    val = data.get(key, default)
-    return default if val is None else val
+SYNC_DB = os.path.expanduser("~/.garminconnect/sync.db")
+# the only endpoints whose columns this report shows
+REPORT_ENDPOINTS = ["get_user_summary", "get_sleep_data", "get_heart_rates"]
+
+
+def stat(summary, column, key, default=0):
+    """Return one statistic of a ReportData summary column, or default"""
+    values = summary.get(column)
+    return values[key] if values else default
 
 try:
     print("Connecting to Garmin...")
@@ -57,102 +65,48 @@ try:
     print(f"   {weeks[0]['start'].strftime('%Y-%m-%d')} to {weeks[3]['end'].strftime('%Y-%m-%d')}")
     print("=" * 95)
 
-    # Process each week
+    # Process each week from the local store; only days that are missing
+    # locally (and today) are requested from Garmin
+    reports = ReportData(
+        SQLiteSink(SYNC_DB), account=email, api=garmin, endpoints=REPORT_ENDPOINTS
+    )
     weekly_data = []
 
     for week in weeks:
-        week_totals = {
-            'sleep': 0, 'sleep_count': 0,
-            'steps': 0, 'calories': 0, 'active_cal': 0, 'distance': 0,
-            'moderate_mins': 0, 'vigorous_mins': 0,
-            'resting_hrs': [], 'days_with_data': 0
-        }
-
-        for day in week['days']:
-            day_str = day.isoformat()
-            has_data = False
-
-            # Sleep
-            try:
-                sleep_data = garmin.get_sleep_data(day_str)
-                if sleep_data:
-                    daily_sleep = sleep_data.get('dailySleepDTO', {})
-                    if daily_sleep:
-                        sleep_sec = safe_get(daily_sleep, 'sleepTimeSeconds', 0)
-                        if sleep_sec and sleep_sec > 0:
-                            week_totals['sleep'] += sleep_sec / 3600
-                            week_totals['sleep_count'] += 1
-            except:
-                pass
-
-            # Heart Rate
-            try:
-                hr_data = garmin.get_heart_rates(day_str)
-                if hr_data:
-                    rhr = safe_get(hr_data, 'restingHeartRate')
-                    if rhr:
-                        week_totals['resting_hrs'].append(rhr)
-            except:
-                pass
-
-            # Stats
-            try:
-                stats = garmin.get_stats(day_str)
-                if stats:
-                    steps = safe_get(stats, 'totalSteps')
-                    if steps:
-                        week_totals['steps'] += steps
-                        has_data = True
-
-                    cal = safe_get(stats, 'totalKilocalories')
-                    if cal:
-                        week_totals['calories'] += cal
-
-                    active = safe_get(stats, 'activeKilocalories')
-                    if active:
-                        week_totals['active_cal'] += active
-
-                    dist = safe_get(stats, 'totalDistanceMeters')
-                    if dist:
-                        week_totals['distance'] += dist / 1000
-
-                    mod = safe_get(stats, 'moderateIntensityMinutes')
-                    if mod:
-                        week_totals['moderate_mins'] += mod
-
-                    vig = safe_get(stats, 'vigorousIntensityMinutes')
-                    if vig:
-                        week_totals['vigorous_mins'] += vig
-            except:
-                pass
-
-            if has_data:
-                week_totals['days_with_data'] += 1
-
-        # Calculate averages
-        days_count = max(week_totals['days_with_data'], 1)
-        sleep_count = max(week_totals['sleep_count'], 1)
+        rows = reports.daily(week['start'], week['end'])
+        summary = summarize(rows)
+        # a day counts when it has steps, as before
+        days_with_data = sum(1 for row in rows if row['steps'])
+        days_count = max(days_with_data, 1)
+        sleep_avg = stat(summary, 'sleep_hours', 'mean')
+        rhr_avg = stat(summary, 'resting_hr', 'mean')
+        steps_total = int(stat(summary, 'steps', 'sum'))
+        calories = stat(summary, 'calories', 'sum')
+        distance = stat(summary, 'distance_km', 'sum')
+        moderate = int(stat(summary, 'moderate_minutes', 'sum'))
+        vigorous = int(stat(summary, 'vigorous_minutes', 'sum'))
 
         weekly_data.append({
             'week_num': week['num'],
             'date_range': f"{week['start'].strftime('%m/%d')}-{week['end'].strftime('%m/%d')}",
-            'sleep_avg': round(week_totals['sleep'] / sleep_count, 1) if week_totals['sleep_count'] > 0 else 0,
-            'sleep_total': round(week_totals['sleep'], 1),
-            'rhr_avg': round(sum(week_totals['resting_hrs']) / len(week_totals['resting_hrs'])) if week_totals['resting_hrs'] else 0,
-            'steps_total': week_totals['steps'],
-            'steps_avg': week_totals['steps'] // days_count,
-            'calories_total': int(week_totals['calories']),
-            'calories_avg': int(week_totals['calories'] / days_count),
-            'active_cal': int(week_totals['active_cal']),
-            'distance_total': round(week_totals['distance'], 1),
-            'distance_avg': round(week_totals['distance'] / days_count, 1),
-            'moderate_mins': week_totals['moderate_mins'],
-            'vigorous_mins': week_totals['vigorous_mins'],
-            'intensity_total': week_totals['moderate_mins'] + week_totals['vigorous_mins'],
-            'days_with_data': week_totals['days_with_data']
+            'sleep_avg': round(sleep_avg, 1),
+            'sleep_total': round(stat(summary, 'sleep_hours', 'sum'), 1),
+            'rhr_avg': round(rhr_avg),
+            'steps_total': steps_total,
+            'steps_avg': steps_total // days_count,
+            'calories_total': int(calories),
+            'calories_avg': int(calories / days_count),
+            'active_cal': int(stat(summary, 'active_calories', 'sum')),
+            'distance_total': round(distance, 1),
+            'distance_avg': round(distance / days_count, 1),
+            'moderate_mins': moderate,
+            'vigorous_mins': vigorous,
+            'intensity_total': moderate + vigorous,
+            'days_with_data': days_with_data,
         })
 
         print(f"   Week {week['num']} processed...")
+    print(f"   ({reports.requests} API requests)")
 
     # ===== WEEKLY COMPARISON TABLE =====
     print("\n" + "─" * 95)
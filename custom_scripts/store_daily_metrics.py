@@ -4,18 +4,36 @@ Fetch daily Garmin metrics and store in PostgreSQL.
 Usage:
     python3 custom_scripts/store_daily_metrics.py              # store today only
     python3 custom_scripts/store_daily_metrics.py --backfill 60  # store last 60 days
+    python3 custom_scripts/store_daily_metrics.py --backfill 365 --workers 8
+    python3 custom_scripts/store_daily_metrics.py --backfill 365 --local-load
+
+A backfill fetches several days in parallel under a shared rate limit and
+writes the rows in batches from a separate writer thread (see MetricsWriter).
+Completed endpoints are checkpointed in garmin_backfill_progress, so running
+the same backfill again skips finished days and retries only what failed.
+
+With --local-load the acute/chronic load, ACWR and load balance columns are
+computed from the activity list (one request for the whole range, see
+garminconnect.training_load) instead of one get_training_status request per
+day; VO2 max and the training status columns are then left empty.
 """
 
 import sys
 import os
 import argparse
-import time
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
 
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from garminconnect import Garmin
-import garth
+from garminconnect.pool import RateLimiter
+from garminconnect.projection import Projection
+from garminconnect.tokenstore import CachedTokenStore, FileTokenStore
+from garminconnect.training_load import WARMUP_DAYS, TrainingLoad
 import psycopg2
+from psycopg2.extras import execute_values
 from datetime import date, timedelta
 from config import email, password, DB_HOST, DB_PORT, DB_NAME, DB_USER, DB_PASSWORD
 
@@ -93,99 +111,77 @@ CREATE TABLE IF NOT EXISTS garmin_daily_metrics (
 );
 """
 
-UPSERT_SQL = """
-INSERT INTO garmin_daily_metrics (
-    report_date,
-    readiness_score, readiness_level, readiness_sleep_score, readiness_sleep_history,
-    readiness_hrv_status, readiness_stress_history, readiness_acute_load, readiness_recovery_mins,
-    vo2_max, vo2_max_date, training_status, training_feedback, status_since,
-    acute_load, chronic_load, acwr_ratio, acwr_status, acwr_percent,
-    aerobic_low, aerobic_low_target_min, aerobic_low_target_max,
-    aerobic_high, aerobic_high_target_min, aerobic_high_target_max,
-    anaerobic, anaerobic_target_min, anaerobic_target_max, balance_feedback,
-    hrv_last_night, hrv_weekly_avg, hrv_status,
-    sleep_hours, sleep_score, deep_sleep_mins, light_sleep_mins,
-    rem_sleep_mins, awake_mins, sleep_start, sleep_end,
-    resting_hr, max_hr, min_hr,
-    body_battery_charged, body_battery_drained,
-    avg_stress, max_stress
-) VALUES (
-    %(report_date)s,
-    %(readiness_score)s, %(readiness_level)s, %(readiness_sleep_score)s, %(readiness_sleep_history)s,
-    %(readiness_hrv_status)s, %(readiness_stress_history)s, %(readiness_acute_load)s, %(readiness_recovery_mins)s,
-    %(vo2_max)s, %(vo2_max_date)s, %(training_status)s, %(training_feedback)s, %(status_since)s,
-    %(acute_load)s, %(chronic_load)s, %(acwr_ratio)s, %(acwr_status)s, %(acwr_percent)s,
-    %(aerobic_low)s, %(aerobic_low_target_min)s, %(aerobic_low_target_max)s,
-    %(aerobic_high)s, %(aerobic_high_target_min)s, %(aerobic_high_target_max)s,
-    %(anaerobic)s, %(anaerobic_target_min)s, %(anaerobic_target_max)s, %(balance_feedback)s,
-    %(hrv_last_night)s, %(hrv_weekly_avg)s, %(hrv_status)s,
-    %(sleep_hours)s, %(sleep_score)s, %(deep_sleep_mins)s, %(light_sleep_mins)s,
-    %(rem_sleep_mins)s, %(awake_mins)s, %(sleep_start)s, %(sleep_end)s,
-    %(resting_hr)s, %(max_hr)s, %(min_hr)s,
-    %(body_battery_charged)s, %(body_battery_drained)s,
-    %(avg_stress)s, %(max_stress)s
+COLUMNS = (
+    "report_date",
+    "readiness_score", "readiness_level", "readiness_sleep_score", "readiness_sleep_history",
+    "readiness_hrv_status", "readiness_stress_history", "readiness_acute_load", "readiness_recovery_mins",
+    "vo2_max", "vo2_max_date", "training_status", "training_feedback", "status_since",
+    "acute_load", "chronic_load", "acwr_ratio", "acwr_status", "acwr_percent",
+    "aerobic_low", "aerobic_low_target_min", "aerobic_low_target_max",
+    "aerobic_high", "aerobic_high_target_min", "aerobic_high_target_max",
+    "anaerobic", "anaerobic_target_min", "anaerobic_target_max", "balance_feedback",
+    "hrv_last_night", "hrv_weekly_avg", "hrv_status",
+    "sleep_hours", "sleep_score", "deep_sleep_mins", "light_sleep_mins",
+    "rem_sleep_mins", "awake_mins", "sleep_start", "sleep_end",
+    "resting_hr", "max_hr", "min_hr",
+    "body_battery_charged", "body_battery_drained",
+    "avg_stress", "max_stress",
 )
-ON CONFLICT (report_date) DO UPDATE SET
-    readiness_score = EXCLUDED.readiness_score,
-    readiness_level = EXCLUDED.readiness_level,
-    readiness_sleep_score = EXCLUDED.readiness_sleep_score,
-    readiness_sleep_history = EXCLUDED.readiness_sleep_history,
-    readiness_hrv_status = EXCLUDED.readiness_hrv_status,
-    readiness_stress_history = EXCLUDED.readiness_stress_history,
-    readiness_acute_load = EXCLUDED.readiness_acute_load,
-    readiness_recovery_mins = EXCLUDED.readiness_recovery_mins,
-    vo2_max = EXCLUDED.vo2_max,
-    vo2_max_date = EXCLUDED.vo2_max_date,
-    training_status = EXCLUDED.training_status,
-    training_feedback = EXCLUDED.training_feedback,
-    status_since = EXCLUDED.status_since,
-    acute_load = EXCLUDED.acute_load,
-    chronic_load = EXCLUDED.chronic_load,
-    acwr_ratio = EXCLUDED.acwr_ratio,
-    acwr_status = EXCLUDED.acwr_status,
-    acwr_percent = EXCLUDED.acwr_percent,
-    aerobic_low = EXCLUDED.aerobic_low,
-    aerobic_low_target_min = EXCLUDED.aerobic_low_target_min,
-    aerobic_low_target_max = EXCLUDED.aerobic_low_target_max,
-    aerobic_high = EXCLUDED.aerobic_high,
-    aerobic_high_target_min = EXCLUDED.aerobic_high_target_min,
-    aerobic_high_target_max = EXCLUDED.aerobic_high_target_max,
-    anaerobic = EXCLUDED.anaerobic,
-    anaerobic_target_min = EXCLUDED.anaerobic_target_min,
-    anaerobic_target_max = EXCLUDED.anaerobic_target_max,
-    balance_feedback = EXCLUDED.balance_feedback,
-    hrv_last_night = EXCLUDED.hrv_last_night,
-    hrv_weekly_avg = EXCLUDED.hrv_weekly_avg,
-    hrv_status = EXCLUDED.hrv_status,
-    sleep_hours = EXCLUDED.sleep_hours,
-    sleep_score = EXCLUDED.sleep_score,
-    deep_sleep_mins = EXCLUDED.deep_sleep_mins,
-    light_sleep_mins = EXCLUDED.light_sleep_mins,
-    rem_sleep_mins = EXCLUDED.rem_sleep_mins,
-    awake_mins = EXCLUDED.awake_mins,
-    sleep_start = EXCLUDED.sleep_start,
-    sleep_end = EXCLUDED.sleep_end,
-    resting_hr = EXCLUDED.resting_hr,
-    max_hr = EXCLUDED.max_hr,
-    min_hr = EXCLUDED.min_hr,
-    body_battery_charged = EXCLUDED.body_battery_charged,
-    body_battery_drained = EXCLUDED.body_battery_drained,
-    avg_stress = EXCLUDED.avg_stress,
-    max_stress = EXCLUDED.max_stress;
+
+# Multi-row upsert for psycopg2.extras.execute_values: "VALUES %s" expands to
+# one (...) tuple per row, rendered from ROW_TEMPLATE. The SQL below is built
+# from the constant COLUMNS only; values are always passed as parameters.
+UPSERT_SQL = (
+    f"INSERT INTO garmin_daily_metrics ({', '.join(COLUMNS)}) VALUES %s\n"  # noqa: S608
+    "ON CONFLICT (report_date) DO UPDATE SET\n    "
+    + ",\n    ".join(f"{c} = EXCLUDED.{c}" for c in COLUMNS[1:])
+    + ";"
+)
+ROW_TEMPLATE = "(" + ", ".join(f"%({c})s" for c in COLUMNS) + ")"
+LOAD_ROWS_SQL = (
+    f"SELECT {', '.join(COLUMNS)} FROM garmin_daily_metrics "  # noqa: S608
+    "WHERE report_date = ANY(%s)"
+)
+
+BATCH_SIZE = 50        # rows per INSERT and per commit
+FLUSH_INTERVAL = 5.0   # seconds before a partial batch is written anyway
+MAX_PENDING = 200      # fetched rows waiting for the writer
+FETCH_WORKERS = 4
+REQUEST_RATE = 2.0     # requests per second shared by all fetch workers
+REQUEST_BURST = 5
+RETRIES = 1            # extra passes over failed endpoints per run
+REFRESH_DAYS = 3       # recent days re-fetched even when complete
+
+# One row per (day, endpoint section) fetched by a backfill; error is NULL
+# once the section is stored, so an interrupted backfill resumes where it
+# stopped and retries only what failed.
+CREATE_PROGRESS_SQL = """
+CREATE TABLE IF NOT EXISTS garmin_backfill_progress (
+    report_date         DATE NOT NULL,
+    section             VARCHAR(30) NOT NULL,
+    error               TEXT,
+    updated_at          TIMESTAMP DEFAULT NOW(),
+    PRIMARY KEY (report_date, section)
+);
+"""
+
+PROGRESS_UPSERT_SQL = """
+INSERT INTO garmin_backfill_progress (report_date, section, error) VALUES %s
+ON CONFLICT (report_date, section) DO UPDATE SET
+    error = EXCLUDED.error,
+    updated_at = NOW();
 """
 
 
 def connect_garmin():
-    """Connect to Garmin API and return client."""
-    garth_home = os.path.expanduser("~/.garth")
-    os.makedirs(garth_home, exist_ok=True)
-    try:
-        garth.resume(garth_home)
-    except Exception:
-        garth.login(email, password)
-        garth.save(garth_home)
-    garmin = Garmin()
-    garmin.login(tokenstore=garth_home)
+    """Connect to Garmin API and return client.
+
+    Tokens live in ~/.garth (same layout as garth.save); credentials are only
+    used when no valid tokens are stored, and fresh tokens are saved back.
+    """
+    store = CachedTokenStore(FileTokenStore(os.path.expanduser("~/.garth")))
+    garmin = Garmin(email, password)
+    garmin.login(tokenstore=store)
     return garmin
 
 
@@ -202,9 +198,10 @@ def connect_db():
 
 
 def ensure_table(conn):
-    """Create the garmin_daily_metrics table if it doesn't exist."""
+    """Create the metrics and backfill progress tables if they don't exist."""
     with conn.cursor() as cur:
         cur.execute(CREATE_TABLE_SQL)
+        cur.execute(CREATE_PROGRESS_SQL)
     conn.commit()
 
 
@@ -217,194 +214,461 @@ def millis_to_time(millis):
     return dt.strftime("%H:%M:%S")
 
 
-def fetch_metrics(garmin, cdate):
-    """Fetch all metrics for a single date and return a dict for DB insertion."""
-    date_str = cdate.isoformat()
-    row = {"report_date": cdate}
-
-    # --- Training Readiness ---
+# Field projections per endpoint: {column: dotted path}. "*" picks the first
+# device of the per-device maps in the training status response.
+READINESS_FIELDS = Projection({
+    "readiness_score": "score",
+    "readiness_level": "levelKey",
+    "readiness_level_fallback": "level",
+    "readiness_sleep_score": "sleepScore",
+    "readiness_sleep_history": "sleepHistoryScore",
+    "readiness_hrv_status": "hrvStatus",
+    "readiness_stress_history": "stressHistoryScore",
+    "readiness_acute_load": "acuteTrainingLoad",
+    "readiness_recovery_mins": "recoveryTimeInMinutes",
+})
+
+_DEVICE_STATUS = "mostRecentTrainingStatus.latestTrainingStatusData.*"
+_ACWR = _DEVICE_STATUS + ".acuteTrainingLoadDTO"
+_BALANCE = "mostRecentTrainingLoadBalance.metricsTrainingLoadBalanceDTOMap.*"
+
+STATUS_FIELDS = Projection({
+    "vo2_max_precise": "mostRecentVO2Max.generic.vo2MaxPreciseValue",
+    "vo2_max": "mostRecentVO2Max.generic.vo2MaxValue",
+    "vo2_max_date": "mostRecentVO2Max.generic.calendarDate",
+    "training_status": _DEVICE_STATUS + ".trainingStatus",
+    "training_feedback": _DEVICE_STATUS + ".trainingStatusFeedbackPhrase",
+    "status_since": _DEVICE_STATUS + ".sinceDate",
+    "acute_load": _ACWR + ".dailyTrainingLoadAcute",
+    "chronic_load": _ACWR + ".dailyTrainingLoadChronic",
+    "acwr_ratio": _ACWR + ".dailyAcuteChronicWorkloadRatio",
+    "acwr_status": _ACWR + ".acwrStatus",
+    "acwr_percent": _ACWR + ".acwrPercent",
+    "aerobic_low": _BALANCE + ".monthlyLoadAerobicLow",
+    "aerobic_low_target_min": _BALANCE + ".monthlyLoadAerobicLowTargetMin",
+    "aerobic_low_target_max": _BALANCE + ".monthlyLoadAerobicLowTargetMax",
+    "aerobic_high": _BALANCE + ".monthlyLoadAerobicHigh",
+    "aerobic_high_target_min": _BALANCE + ".monthlyLoadAerobicHighTargetMin",
+    "aerobic_high_target_max": _BALANCE + ".monthlyLoadAerobicHighTargetMax",
+    "anaerobic": _BALANCE + ".monthlyLoadAnaerobic",
+    "anaerobic_target_min": _BALANCE + ".monthlyLoadAnaerobicTargetMin",
+    "anaerobic_target_max": _BALANCE + ".monthlyLoadAnaerobicTargetMax",
+    "balance_feedback": _BALANCE + ".trainingBalanceFeedbackPhrase",
+})
+
+HRV_FIELDS = Projection({
+    "hrv_last_night": "hrvSummary.lastNightAvg",
+    "hrv_weekly_avg": "hrvSummary.weeklyAvg",
+    "hrv_status": "hrvSummary.status",
+})
+
+SLEEP_FIELDS = Projection({
+    "sleep_seconds": "dailySleepDTO.sleepTimeSeconds",
+    "sleep_score": "sleepScores.overall.value",
+    "deep_sleep_seconds": "dailySleepDTO.deepSleepSeconds",
+    "light_sleep_seconds": "dailySleepDTO.lightSleepSeconds",
+    "rem_sleep_seconds": "dailySleepDTO.remSleepSeconds",
+    "awake_seconds": "dailySleepDTO.awakeSleepSeconds",
+    "sleep_start": "dailySleepDTO.sleepStartTimestampLocal",
+    "sleep_end": "dailySleepDTO.sleepEndTimestampLocal",
+})
+
+HEART_RATE_FIELDS = Projection({
+    "resting_hr": "restingHeartRate",
+    "max_hr": "maxHeartRate",
+    "min_hr": "minHeartRate",
+})
+
+BODY_BATTERY_FIELDS = Projection({
+    "date": "date",
+    "body_battery_charged": "charged",
+    "body_battery_drained": "drained",
+})
+
+STRESS_FIELDS = Projection({
+    "avg_stress": "overallStressLevel",
+    "max_stress": "maxStressLevel",
+})
+
+
+def fetch_body_battery(garmin, start, end):
+    """Fetch body battery for a whole date range in one request, keyed by date.
+
+    Returns None if the request fails.
+    """
     try:
-        readiness = garmin.get_training_readiness(date_str)
+        days = garmin.get_body_battery(
+            start.isoformat(), end.isoformat(), fields=BODY_BATTERY_FIELDS
+        )
     except Exception:
-        readiness = None
-
-    if readiness:
-        row["readiness_score"] = readiness.get("score")
-        row["readiness_level"] = readiness.get("levelKey", readiness.get("level"))
-        row["readiness_sleep_score"] = readiness.get("sleepScore")
-        row["readiness_sleep_history"] = readiness.get("sleepHistoryScore")
-        row["readiness_hrv_status"] = readiness.get("hrvStatus")
-        row["readiness_stress_history"] = readiness.get("stressHistoryScore")
-        row["readiness_acute_load"] = readiness.get("acuteTrainingLoad")
-        row["readiness_recovery_mins"] = readiness.get("recoveryTimeInMinutes")
-    else:
-        for k in ["readiness_score", "readiness_level", "readiness_sleep_score",
-                   "readiness_sleep_history", "readiness_hrv_status",
-                   "readiness_stress_history", "readiness_acute_load",
-                   "readiness_recovery_mins"]:
-            row[k] = None
+        return None
+    return {day.pop("date"): day for day in days}
 
-    # --- Training Status ---
-    try:
-        status = garmin.get_training_status(date_str)
-    except Exception:
-        status = None
-
-    if status:
-        # VO2 Max
-        vo2 = status.get("mostRecentVO2Max", {})
-        generic = vo2.get("generic", {}) if vo2 else {}
-        row["vo2_max"] = generic.get("vo2MaxPreciseValue") or generic.get("vo2MaxValue") if generic else None
-        row["vo2_max_date"] = generic.get("calendarDate") if generic else None
-
-        # Training status from latest device
-        latest = status.get("mostRecentTrainingStatus", {})
-        latest_data = latest.get("latestTrainingStatusData", {}) if latest else {}
-        device_status = next(iter(latest_data.values()), {}) if latest_data else {}
-
-        if device_status:
-            ts_code = device_status.get("trainingStatus")
-            row["training_status"] = TRAINING_STATUS_MAP.get(ts_code, str(ts_code)) if ts_code is not None else None
-            row["training_feedback"] = device_status.get("trainingStatusFeedbackPhrase")
-            row["status_since"] = device_status.get("sinceDate")
-
-            # ACWR
-            acwr = device_status.get("acuteTrainingLoadDTO", {})
-            row["acute_load"] = acwr.get("dailyTrainingLoadAcute") if acwr else None
-            row["chronic_load"] = acwr.get("dailyTrainingLoadChronic") if acwr else None
-            row["acwr_ratio"] = acwr.get("dailyAcuteChronicWorkloadRatio") if acwr else None
-            row["acwr_status"] = acwr.get("acwrStatus") if acwr else None
-            row["acwr_percent"] = acwr.get("acwrPercent") if acwr else None
-        else:
-            for k in ["training_status", "training_feedback", "status_since",
-                       "acute_load", "chronic_load", "acwr_ratio", "acwr_status", "acwr_percent"]:
-                row[k] = None
-
-        # Training Load Balance
-        balance = status.get("mostRecentTrainingLoadBalance", {})
-        balance_data = balance.get("metricsTrainingLoadBalanceDTOMap", {}) if balance else {}
-        device_balance = next(iter(balance_data.values()), {}) if balance_data else {}
-
-        if device_balance:
-            row["aerobic_low"] = device_balance.get("monthlyLoadAerobicLow")
-            row["aerobic_low_target_min"] = device_balance.get("monthlyLoadAerobicLowTargetMin")
-            row["aerobic_low_target_max"] = device_balance.get("monthlyLoadAerobicLowTargetMax")
-            row["aerobic_high"] = device_balance.get("monthlyLoadAerobicHigh")
-            row["aerobic_high_target_min"] = device_balance.get("monthlyLoadAerobicHighTargetMin")
-            row["aerobic_high_target_max"] = device_balance.get("monthlyLoadAerobicHighTargetMax")
-            row["anaerobic"] = device_balance.get("monthlyLoadAnaerobic")
-            row["anaerobic_target_min"] = device_balance.get("monthlyLoadAnaerobicTargetMin")
-            row["anaerobic_target_max"] = device_balance.get("monthlyLoadAnaerobicTargetMax")
-            row["balance_feedback"] = device_balance.get("trainingBalanceFeedbackPhrase")
-        else:
-            for k in ["aerobic_low", "aerobic_low_target_min", "aerobic_low_target_max",
-                       "aerobic_high", "aerobic_high_target_min", "aerobic_high_target_max",
-                       "anaerobic", "anaerobic_target_min", "anaerobic_target_max",
-                       "balance_feedback"]:
-                row[k] = None
-    else:
-        for k in ["vo2_max", "vo2_max_date", "training_status", "training_feedback",
-                   "status_since", "acute_load", "chronic_load", "acwr_ratio",
-                   "acwr_status", "acwr_percent",
-                   "aerobic_low", "aerobic_low_target_min", "aerobic_low_target_max",
-                   "aerobic_high", "aerobic_high_target_min", "aerobic_high_target_max",
-                   "anaerobic", "anaerobic_target_min", "anaerobic_target_max",
-                   "balance_feedback"]:
-            row[k] = None
-
-    # --- HRV ---
-    try:
-        hrv = garmin.get_hrv_data(date_str)
-    except Exception:
-        hrv = None
 
-    if hrv:
-        summary = hrv.get("hrvSummary", {})
-        row["hrv_last_night"] = summary.get("lastNightAvg") if summary else None
-        row["hrv_weekly_avg"] = summary.get("weeklyAvg") if summary else None
-        row["hrv_status"] = summary.get("status") if summary else None
-    else:
-        row["hrv_last_night"] = None
-        row["hrv_weekly_avg"] = None
-        row["hrv_status"] = None
+def _rounded(value, divisor, digits):
+    return round(value / divisor, digits) if value else None
 
-    # --- Sleep ---
-    try:
-        sleep = garmin.get_sleep_data(date_str)
-    except Exception:
-        sleep = None
-
-    if sleep:
-        daily_summary = sleep.get("dailySleepDTO", {})
-        row["sleep_hours"] = round(daily_summary.get("sleepTimeSeconds", 0) / 3600, 2) if daily_summary.get("sleepTimeSeconds") else None
-        row["sleep_score"] = sleep.get("sleepScores", {}).get("overall", {}).get("value") if sleep.get("sleepScores") else None
-        row["deep_sleep_mins"] = round(daily_summary.get("deepSleepSeconds", 0) / 60, 1) if daily_summary.get("deepSleepSeconds") else None
-        row["light_sleep_mins"] = round(daily_summary.get("lightSleepSeconds", 0) / 60, 1) if daily_summary.get("lightSleepSeconds") else None
-        row["rem_sleep_mins"] = round(daily_summary.get("remSleepSeconds", 0) / 60, 1) if daily_summary.get("remSleepSeconds") else None
-        row["awake_mins"] = round(daily_summary.get("awakeSleepSeconds", 0) / 60, 1) if daily_summary.get("awakeSleepSeconds") else None
-        row["sleep_start"] = millis_to_time(daily_summary.get("sleepStartTimestampLocal"))
-        row["sleep_end"] = millis_to_time(daily_summary.get("sleepEndTimestampLocal"))
-    else:
-        for k in ["sleep_hours", "sleep_score", "deep_sleep_mins", "light_sleep_mins",
-                   "rem_sleep_mins", "awake_mins", "sleep_start", "sleep_end"]:
-            row[k] = None
 
-    # --- Heart Rate ---
-    try:
-        hr = garmin.get_heart_rates(date_str)
-    except Exception:
-        hr = None
+# Each section fetches one endpoint for a day and returns its columns; a
+# failed request raises. The body battery section also takes the prefetched
+# result of fetch_body_battery.
 
-    if hr:
-        row["resting_hr"] = hr.get("restingHeartRate")
-        row["max_hr"] = hr.get("maxHeartRate")
-        row["min_hr"] = hr.get("minHeartRate")
-    else:
-        row["resting_hr"] = None
-        row["max_hr"] = None
-        row["min_hr"] = None
+def fetch_readiness(garmin, date_str):
+    readiness = garmin.get_training_readiness(date_str, fields=READINESS_FIELDS)
+    fallback = readiness.pop("readiness_level_fallback")
+    if readiness["readiness_level"] is None:
+        readiness["readiness_level"] = fallback
+    return readiness
 
-    # --- Body Battery ---
-    try:
-        bb = garmin.get_body_battery(date_str)
-    except Exception:
-        bb = None
 
-    if bb and isinstance(bb, list) and len(bb) > 0:
-        day_data = bb[0]
-        row["body_battery_charged"] = day_data.get("charged")
-        row["body_battery_drained"] = day_data.get("drained")
-    else:
-        row["body_battery_charged"] = None
-        row["body_battery_drained"] = None
+def fetch_training_status(garmin, date_str):
+    status = garmin.get_training_status(date_str, fields=STATUS_FIELDS)
+    precise = status.pop("vo2_max_precise")
+    status["vo2_max"] = precise or status["vo2_max"]
+    ts_code = status["training_status"]
+    if ts_code is not None:
+        status["training_status"] = TRAINING_STATUS_MAP.get(ts_code, str(ts_code))
+    return status
+
 
-    # --- Stress ---
+def fetch_hrv(garmin, date_str):
+    return garmin.get_hrv_data(date_str, fields=HRV_FIELDS)
+
+
+def fetch_sleep(garmin, date_str):
+    sleep = garmin.get_sleep_data(date_str, fields=SLEEP_FIELDS)
+    return {
+        "sleep_hours": _rounded(sleep["sleep_seconds"], 3600, 2),
+        "sleep_score": sleep["sleep_score"],
+        "deep_sleep_mins": _rounded(sleep["deep_sleep_seconds"], 60, 1),
+        "light_sleep_mins": _rounded(sleep["light_sleep_seconds"], 60, 1),
+        "rem_sleep_mins": _rounded(sleep["rem_sleep_seconds"], 60, 1),
+        "awake_mins": _rounded(sleep["awake_seconds"], 60, 1),
+        "sleep_start": millis_to_time(sleep["sleep_start"]),
+        "sleep_end": millis_to_time(sleep["sleep_end"]),
+    }
+
+
+def fetch_heart_rate(garmin, date_str):
+    return garmin.get_heart_rates(date_str, fields=HEART_RATE_FIELDS)
+
+
+def fetch_body_battery_day(garmin, date_str, body_battery=None):
+    if body_battery is None:
+        days = garmin.get_body_battery(date_str, date_str, fields=BODY_BATTERY_FIELDS)
+        body_battery = {day.pop("date"): day for day in days}
+    return body_battery.get(date_str) or {
+        "body_battery_charged": None,
+        "body_battery_drained": None,
+    }
+
+
+def fetch_stress(garmin, date_str):
+    return garmin.get_stress_data(date_str, fields=STRESS_FIELDS)
+
+
+SECTIONS = {
+    "readiness": fetch_readiness,
+    "training_status": fetch_training_status,
+    "hrv": fetch_hrv,
+    "sleep": fetch_sleep,
+    "heart_rate": fetch_heart_rate,
+    "body_battery": fetch_body_battery_day,
+    "stress": fetch_stress,
+}
+
+
+# sections fetched with --local-load; the load columns come from activities
+LOCAL_LOAD_SECTIONS = tuple(name for name in SECTIONS if name != "training_status")
+# backfill progress entry of the load columns computed with --local-load
+LOCAL_LOAD = "local_load"
+
+# column -> TrainingLoad.row key
+LOCAL_LOAD_COLUMNS = {
+    "acute_load": "acute_load",
+    "chronic_load": "chronic_load",
+    "acwr_ratio": "acwr",
+    "acwr_status": "acwr_status",
+    "aerobic_low": "aerobic_low",
+    "aerobic_high": "aerobic_high",
+    "anaerobic": "anaerobic",
+}
+
+
+def fetch_local_load(garmin, start, end):
+    """Compute the load columns for ``start..end`` from the activity list.
+
+    One request covers the range and the warm-up before it. Returns the
+    columns keyed by date, or None if the request fails.
+    """
     try:
-        stress = garmin.get_stress_data(date_str)
+        activities = garmin.get_activities_by_date(
+            (start - timedelta(days=WARMUP_DAYS)).isoformat(), end.isoformat()
+        )
     except Exception:
-        stress = None
+        return None
+    load = TrainingLoad.from_activities(activities, start, end)
+    return {
+        row["date"]: {column: row[key] for column, key in LOCAL_LOAD_COLUMNS.items()}
+        for row in load.rows()
+    }
 
-    if stress:
-        row["avg_stress"] = stress.get("overallStressLevel")
-        row["max_stress"] = stress.get("maxStressLevel")
-    else:
-        row["avg_stress"] = None
-        row["max_stress"] = None
 
+def empty_row(cdate):
+    return {"report_date": cdate, **dict.fromkeys(COLUMNS[1:])}
+
+
+def fetch_sections(garmin, cdate, sections=SECTIONS, body_battery=None,
+                   limiter=None):
+    """Fetch the named sections for one date.
+
+    Returns ``(columns, failed)`` where ``failed`` maps each failed section
+    to its error message. ``limiter`` is an optional shared
+    :class:`~garminconnect.pool.RateLimiter` taken once per request.
+    """
+    date_str = cdate.isoformat()
+    columns, failed = {}, {}
+    for name in sections:
+        if limiter is not None:
+            limiter.acquire()
+        args = (body_battery,) if name == "body_battery" else ()
+        try:
+            columns.update(SECTIONS[name](garmin, date_str, *args))
+        except Exception as e:
+            failed[name] = str(e) or type(e).__name__
+    return columns, failed
+
+
+def fetch_metrics(garmin, cdate, body_battery=None, local_load=False):
+    """Fetch all metrics for a single date and return a dict for DB insertion.
+
+    Columns of sections that fail are None. ``body_battery`` is an optional
+    prefetched result of :func:`fetch_body_battery` covering ``cdate``.
+    With ``local_load`` the load columns are computed from activities.
+    """
+    row = empty_row(cdate)
+    if local_load:
+        row.update(fetch_sections(garmin, cdate, LOCAL_LOAD_SECTIONS, body_battery)[0])
+        row.update((fetch_local_load(garmin, cdate, cdate) or {}).get(cdate, {}))
+    else:
+        row.update(fetch_sections(garmin, cdate, body_battery=body_battery)[0])
     return row
 
 
-def store_row(conn, row):
-    """Upsert a single row into garmin_daily_metrics."""
+def store_rows(conn, rows, progress=()):
+    """Upsert rows and backfill progress in one transaction and commit.
+
+    ``progress`` holds ``(report_date, section, error)`` tuples.
+    """
+    # a statement may not update the same key twice; keep the latest
+    unique = list({row["report_date"]: row for row in rows}.values())
+    checkpoints = list({(d, name): (d, name, e) for d, name, e in progress}.values())
     with conn.cursor() as cur:
-        cur.execute(UPSERT_SQL, row)
+        if unique:
+            execute_values(cur, UPSERT_SQL, unique, template=ROW_TEMPLATE,
+                           page_size=len(unique))
+        if checkpoints:
+            execute_values(cur, PROGRESS_UPSERT_SQL, checkpoints,
+                           page_size=len(checkpoints))
     conn.commit()
+    return len(unique)
+
+
+_STOP = object()
+
+
+class MetricsWriter:
+    """Write rows to PostgreSQL in batches from a background thread.
+
+    Fetch workers hand rows to :meth:`put`, which blocks once ``max_pending``
+    rows are waiting, so fetching and writing overlap without unbounded
+    memory. The writer commits every ``batch_size`` rows, or after
+    ``flush_interval`` seconds without a full batch. A failed batch is rolled
+    back and the error is raised from the next :meth:`put` or :meth:`close`.
+    """
+
+    def __init__(self, conn, batch_size=BATCH_SIZE, flush_interval=FLUSH_INTERVAL,
+                 max_pending=MAX_PENDING):
+        self.conn = conn
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.queue = queue.Queue(maxsize=max_pending)
+        self.written = 0
+        self.commits = 0
+        self.error = None
+        self._thread = threading.Thread(target=self._run, name="MetricsWriter",
+                                        daemon=True)
+        self._thread.start()
+
+    def put(self, row, progress=()):
+        """Queue a row and its ``(report_date, section, error)`` checkpoints."""
+        if self.error is not None:
+            raise self.error
+        self.queue.put((row, tuple(progress)))
+
+    def _flush(self, batch):
+        if not batch or self.error is not None:
+            return
+        rows = [row for row, _ in batch]
+        progress = [checkpoint for _, done in batch for checkpoint in done]
+        try:
+            self.written += store_rows(self.conn, rows, progress)
+            self.commits += 1
+        except Exception as e:
+            self.conn.rollback()
+            self.error = e
+
+    def _run(self):
+        batch = []
+        while True:
+            try:
+                item = self.queue.get(timeout=self.flush_interval)
+            except queue.Empty:
+                self._flush(batch)
+                batch = []
+                continue
+            if item is _STOP:
+                break
+            batch.append(item)
+            if len(batch) >= self.batch_size:
+                self._flush(batch)
+                batch = []
+        self._flush(batch)
+
+    def close(self):
+        """Write the remaining rows and stop the writer thread."""
+        self.queue.put(_STOP)
+        self._thread.join()
+        if self.error is not None:
+            raise self.error
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def load_progress(conn, start, end):
+    """Return the sections stored without error per date in ``start..end``."""
+    with conn.cursor() as cur:
+        cur.execute(
+            "SELECT report_date, section FROM garmin_backfill_progress "
+            "WHERE report_date BETWEEN %s AND %s AND error IS NULL",
+            (start, end),
+        )
+        done = {}
+        for report_date, section in cur.fetchall():
+            done.setdefault(report_date, set()).add(section)
+    return done
+
+
+def load_rows(conn, dates):
+    """Return the stored rows for ``dates`` keyed by date."""
+    if not dates:
+        return {}
+    with conn.cursor() as cur:
+        cur.execute(LOAD_ROWS_SQL, (list(dates),))
+        return {
+            values[0]: dict(zip(COLUMNS, values, strict=True))
+            for values in cur.fetchall()
+        }
+
+
+def plan_backfill(dates, done, refresh_after, sections=SECTIONS):
+    """Map each date to the sections still missing; recent dates get all."""
+    todo = {}
+    for d in dates:
+        missing = [name for name in sections
+                   if d > refresh_after or name not in done.get(d, ())]
+        if missing:
+            todo[d] = missing
+    return todo
+
+
+def backfill(garmin, conn, dates, workers=FETCH_WORKERS, batch_size=BATCH_SIZE,
+             rate=REQUEST_RATE, retries=RETRIES, refresh_days=REFRESH_DAYS,
+             local_load=False):
+    """Fetch ``dates`` concurrently while a writer stores rows and checkpoints.
+
+    Dates whose sections were all stored by an earlier run are skipped
+    (except the last ``refresh_days``, which Garmin may still revise), and
+    partially stored dates only fetch their missing sections. Sections that
+    fail are retried ``retries`` times and otherwise left for the next run.
+    With ``local_load`` the load columns of the fetched days are computed
+    from one activity list request per pass instead of ``get_training_status``
+    and checkpointed as the ``local_load`` section.
+    """
+    sections = (*LOCAL_LOAD_SECTIONS, LOCAL_LOAD) if local_load else tuple(SECTIONS)
+    done = load_progress(conn, dates[0], dates[-1])
+    todo = plan_backfill(dates, done, date.today() - timedelta(days=refresh_days),
+                         sections)
+    print(f"{len(dates) - len(todo)} days already complete, {len(todo)} to fetch")
+    if not todo:
+        return
+
+    rows = load_rows(conn, [d for d, names in todo.items()
+                            if len(names) < len(sections)])
+    limiter = RateLimiter(rate=rate, burst=REQUEST_BURST)
+    limiter.acquire()
+    body_battery = fetch_body_battery(garmin, min(todo), max(todo))
+
+    with MetricsWriter(conn, batch_size=batch_size) as writer, \
+            ThreadPoolExecutor(max_workers=workers) as pool:
+        for attempt in range(retries + 1):
+            load, load_error = {}, None
+            load_days = [d for d, names in todo.items() if LOCAL_LOAD in names]
+            if load_days:
+                limiter.acquire()
+                load = fetch_local_load(garmin, min(load_days), max(load_days))
+                if load is None:
+                    load, load_error = {}, "could not fetch the activity list"
+            futures = {
+                pool.submit(fetch_sections, garmin, d,
+                            [name for name in names if name != LOCAL_LOAD],
+                            body_battery, limiter): d
+                for d, names in todo.items()
+            }
+            failed_days = {}
+            for i, future in enumerate(as_completed(futures), 1):
+                d = futures[future]
+                columns, failed = future.result()
+                if load_error and LOCAL_LOAD in todo[d]:
+                    failed[LOCAL_LOAD] = load_error
+                row = rows.setdefault(d, empty_row(d))
+                row.update(columns)
+                row.update(load.get(d, {}))
+                writer.put(dict(row), [(d, name, failed.get(name)) for name in todo[d]])
+                if failed:
+                    failed_days[d] = list(failed)
+                status = f"failed: {', '.join(failed)}" if failed else "fetched"
+                print(f"  [{i}/{len(futures)}] {d} - {status}")
+            todo = failed_days
+            if not todo:
+                break
+            if attempt < retries:
+                print(f"Retrying failed endpoints on {len(todo)} days...")
+    print(f"Stored {writer.written} rows in {writer.commits} commits.")
+    if todo:
+        print(f"{sum(map(len, todo.values()))} endpoint(s) still failing on "
+              f"{len(todo)} days; run the backfill again to retry them.")
 
 
 def main():
     parser = argparse.ArgumentParser(description="Store daily Garmin metrics in PostgreSQL")
     parser.add_argument("--backfill", type=int, default=0,
                         help="Number of days to backfill (e.g. 60)")
+    parser.add_argument("--workers", type=int, default=FETCH_WORKERS,
+                        help="Days fetched in parallel during a backfill")
+    parser.add_argument("--batch-size", type=int, default=BATCH_SIZE,
+                        help="Rows per INSERT and commit during a backfill")
+    parser.add_argument("--rate", type=float, default=REQUEST_RATE,
+                        help="Requests per second across all workers")
+    parser.add_argument("--retries", type=int, default=RETRIES,
+                        help="Extra passes over failed endpoints per run")
+    parser.add_argument("--local-load", action="store_true",
+                        help="Compute training load from activities instead of "
+                             "requesting the training status per day")
     args = parser.parse_args()
 
     print("Connecting to Garmin...")
@@ -422,19 +686,13 @@ def main():
         dates = [today - timedelta(days=i) for i in range(args.backfill)]
         dates.reverse()  # oldest first
         print(f"\nBackfilling {len(dates)} days: {dates[0]} to {dates[-1]}")
-        for i, d in enumerate(dates):
-            try:
-                row = fetch_metrics(garmin, d)
-                store_row(conn, row)
-                print(f"  [{i+1}/{len(dates)}] {d} - stored (readiness={row.get('readiness_score')})")
-            except Exception as e:
-                print(f"  [{i+1}/{len(dates)}] {d} - ERROR: {e}")
-            if i < len(dates) - 1:
-                time.sleep(0.3)
+        backfill(garmin, conn, dates, workers=args.workers,
+                 batch_size=args.batch_size, rate=args.rate, retries=args.retries,
+                 local_load=args.local_load)
     else:
         print(f"\nFetching metrics for {today}...")
-        row = fetch_metrics(garmin, today)
-        store_row(conn, row)
+        row = fetch_metrics(garmin, today, local_load=args.local_load)
+        store_rows(conn, [row])
         print(f"Stored: {today} (readiness={row.get('readiness_score')}, "
               f"acute_load={row.get('acute_load')}, sleep={row.get('sleep_hours')}h)")
 
@@ -12,16 +12,15 @@ import os
 sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from garminconnect import Garmin
+from garminconnect.reports import ReportData
+from garminconnect.sync import SQLiteSink
 import garth
 from datetime import date, timedelta
 from config import email, password
 
-def safe_get(data, key, default=None):
-    """Safely get value, returning default if None"""
-    if data is None:
-        return default
-    val = data.get(key, default)
-    return default if val is None else val
+SYNC_DB = os.path.expanduser("~/.garminconnect/sync.db")
+# the only endpoints whose columns this report shows
+REPORT_ENDPOINTS = ["get_user_summary", "get_sleep_data", "get_heart_rates"]
 
 try:
     print("Connecting to Garmin...")
@@ -58,8 +57,14 @@ try:
     counts = {'sleep': 0, 'days_with_data': 0}
     resting_hrs = []
 
+    # Daily rows from the local sync store; only missing days (and today)
+    # are requested from Garmin
+    reports = ReportData(
+        SQLiteSink(SYNC_DB), account=email, api=garmin, endpoints=REPORT_ENDPOINTS
+    )
+    stored = {row['date']: row for row in reports.daily(days[0], days[-1])}
+
     for day in days:
-        day_str = day.isoformat()
         day_name = day.strftime('%a %m/%d')
 
         row = {
@@ -71,63 +76,38 @@ try:
 
         has_data = False
 
-        # ===== SLEEP DATA =====
-        try:
-            sleep_data = garmin.get_sleep_data(day_str)
-            if sleep_data:
-                daily_sleep = sleep_data.get('dailySleepDTO', {})
-                if daily_sleep:
-                    sleep_sec = safe_get(daily_sleep, 'sleepTimeSeconds', 0)
-                    if sleep_sec and sleep_sec > 0:
-                        row['sleep_hours'] = round(sleep_sec / 3600, 1)
-                        totals['sleep'] += row['sleep_hours']
-                        counts['sleep'] += 1
-
-                sleep_scores = sleep_data.get('sleepScores')
-                if sleep_scores:
-                    overall = sleep_scores.get('overall', {})
-                    if overall:
-                        row['sleep_score'] = safe_get(overall, 'value')
-        except:
-            pass
-
-        # ===== HEART RATE =====
-        try:
-            hr_data = garmin.get_heart_rates(day_str)
-            if hr_data:
-                row['resting_hr'] = safe_get(hr_data, 'restingHeartRate')
-                if row['resting_hr']:
-                    resting_hrs.append(row['resting_hr'])
-        except:
-            pass
-
-        # ===== STATS (Steps, Calories, Distance, Intensity) =====
-        try:
-            stats = garmin.get_stats(day_str)
-            if stats:
-                row['steps'] = safe_get(stats, 'totalSteps')
-                row['calories'] = safe_get(stats, 'totalKilocalories')
-                row['active_cal'] = safe_get(stats, 'activeKilocalories')
-                distance_m = safe_get(stats, 'totalDistanceMeters')
-                row['distance'] = round(distance_m / 1000, 2) if distance_m else None
-                row['moderate_mins'] = safe_get(stats, 'moderateIntensityMinutes')
-                row['vigorous_mins'] = safe_get(stats, 'vigorousIntensityMinutes')
-
-                if row['steps']:
-                    totals['steps'] += row['steps']
-                    has_data = True
-                if row['calories']:
-                    totals['calories'] += row['calories']
-                if row['active_cal']:
-                    totals['active_cal'] += row['active_cal']
-                if row['distance']:
-                    totals['distance'] += row['distance']
-                if row['moderate_mins']:
-                    totals['moderate_mins'] += row['moderate_mins']
-                if row['vigorous_mins']:
-                    totals['vigorous_mins'] += row['vigorous_mins']
-        except:
-            pass
+        local = stored.get(day)
+        if local:
+            if local['sleep_hours']:
+                row['sleep_hours'] = round(local['sleep_hours'], 1)
+                totals['sleep'] += row['sleep_hours']
+                counts['sleep'] += 1
+            row['sleep_score'] = local['sleep_score']
+
+            row['resting_hr'] = local['resting_hr']
+            if row['resting_hr']:
+                resting_hrs.append(row['resting_hr'])
+
+            row['steps'] = local['steps']
+            row['calories'] = local['calories']
+            row['active_cal'] = local['active_calories']
+            row['distance'] = local['distance_km'] or None
+            row['moderate_mins'] = local['moderate_minutes']
+            row['vigorous_mins'] = local['vigorous_minutes']
+
+            if row['steps']:
+                totals['steps'] += row['steps']
+                has_data = True
+            if row['calories']:
+                totals['calories'] += row['calories']
+            if row['active_cal']:
+                totals['active_cal'] += row['active_cal']
+            if row['distance']:
+                totals['distance'] += row['distance']
+            if row['moderate_mins']:
+                totals['moderate_mins'] += row['moderate_mins']
+            if row['vigorous_mins']:
+                totals['vigorous_mins'] += row['vigorous_mins']
 
         if has_data:
             counts['days_with_data'] += 1
@@ -1,21 +1,48 @@
 """Python 3 API wrapper for Garmin Connect."""
 
+from __future__ import annotations
+
+import hashlib
+import importlib
 import logging
 import numbers
 import os
 import re
-from collections.abc import Callable
+import threading
+import time
+from collections.abc import Callable, Iterator, Mapping
 from datetime import date, datetime, timedelta, timezone
 from enum import Enum, auto
 from pathlib import Path
-from typing import Any
-
-import garth
-import requests
-from garth.exc import GarthException, GarthHTTPError
-from requests import HTTPError
-
-from .fit import FitEncoderWeight  # type: ignore
+from typing import TYPE_CHECKING, Any, overload
+
+from .endpoints import DISPLAY_NAME, ENDPOINTS
+from .jsondecode import DECODERS, DecodeStats, get_decoder
+from .lazyjson import MIN_LAZY_BYTES, LazyArray, loads_lazy
+from .projection import (
+    Fields,
+    Projected,
+    Projection,
+    compile_projection,
+    project,
+)
+from .tokenstore import (
+    DEFAULT_REFRESH_MARGIN,
+    FileTokenStore,
+    TokenRefresher,
+    TokenStore,
+)
+
+if TYPE_CHECKING:
+    import requests
+
+    from .series import (
+        ActivityDetails,
+        BodyBatterySeries,
+        HeartRateSeries,
+        StressSeries,
+    )
+    from .sleep import SleepSeries
 
 logger = logging.getLogger(__name__)
 
@@ -25,6 +52,7 @@ MAX_HYDRATION_ML = 10000  # 10 liters
 DATE_FORMAT_REGEX = r"^\d{4}-\d{2}-\d{2}$"
 DATE_FORMAT_STR = "%Y-%m-%d"
 VALID_WEIGHT_UNITS = {"kg", "lbs"}
+DEFAULT_PROFILE_TTL = 7 * 24 * 3600  # seconds
 
 
 # Add validation utilities
@@ -86,19 +114,163 @@ def _validate_positive_integer(value: int, param_name: str = "value") -> int:
     return value
 
 
+def _date_range(startdate: str, enddate: str | None = None) -> list[str]:
+    """Return all dates from startdate through enddate (inclusive) as strings."""
+    startdate = _validate_date_format(startdate, "startdate")
+    enddate = (
+        startdate if enddate is None else _validate_date_format(enddate, "enddate")
+    )
+    start = datetime.strptime(startdate, DATE_FORMAT_STR).date()
+    end = datetime.strptime(enddate, DATE_FORMAT_STR).date()
+    if start > end:
+        raise ValueError("startdate cannot be after enddate")
+    return [
+        (start + timedelta(days=i)).isoformat() for i in range((end - start).days + 1)
+    ]
+
+
 def _fmt_ts(dt: datetime) -> str:
     # Use ms precision to match server expectations
     return dt.replace(tzinfo=None).strftime("%Y-%m-%dT%H:%M:%S.%f")[:-3]
 
 
+def _as_token_store(tokenstore: str | TokenStore | None) -> TokenStore | None:
+    """Return the TokenStore for a login tokenstore argument, if it has one."""
+    if isinstance(tokenstore, TokenStore):
+        return tokenstore
+    if tokenstore and len(tokenstore) <= 512:
+        return FileTokenStore(Path(tokenstore).expanduser().resolve())
+    return None
+
+
 def _validate_json_exists(response: requests.Response) -> dict[str, Any] | None:
     if response.status_code == 204:
         return None
     return response.json()
 
 
+_LAZY_SUBMODULES = frozenset(
+    {
+        "activity_index",
+        "archive",
+        "export",
+        "fit",
+        "intensity",
+        "models",
+        "pool",
+        "reports",
+        "rolling",
+        "series",
+        "sleep",
+        "sync",
+        "training_load",
+        "workout",
+    }
+)
+
+
+# names the package exported before their modules became lazy -> module
+_LAZY_ATTRIBUTES = {"FitEncoderWeight": "fit"}
+
+
+def __getattr__(name: str) -> Any:
+    # submodules with heavy dependencies are imported on first access
+    if name in _LAZY_SUBMODULES:
+        return importlib.import_module(f".{name}", __name__)
+    if name in _LAZY_ATTRIBUTES:
+        module = importlib.import_module(f".{_LAZY_ATTRIBUTES[name]}", __name__)
+        return getattr(module, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+
+
 class Garmin:
-    """Class for fetching data from Garmin Connect."""
+    """Class for fetching data from Garmin Connect.
+
+    An instance may be shared between threads once logged in.
+    """
+
+    # API paths are class constants (the read endpoints are in
+    # endpoints.ENDPOINTS, see _url); instances only hold per-user state.
+    garmin_connect_user_settings_url = "/userprofile-service/userprofile/user-settings"
+    garmin_connect_userprofile_settings_url = (
+        "/userprofile-service/userprofile/settings"
+    )
+    garmin_connect_device_url = "/device-service/deviceservice"
+
+    garmin_connect_primary_device_url = (
+        "/web-gateway/device-info/primary-training-device"
+    )
+
+    garmin_connect_solar_url = "/web-gateway/solar"
+    garmin_connect_weight_url = "/weight-service"
+    garmin_connect_biometric_url = "/biometric-service/biometric"
+
+    garmin_connect_biometric_stats_url = "/biometric-service/stats"
+    garmin_connect_set_hydration_url = "/usersummary-service/usersummary/hydration/log"
+    garmin_connect_adhoc_challenges_url = (
+        "/adhocchallenge-service/adHocChallenge/historical"
+    )
+    garmin_connect_badge_challenges_url = (
+        "/badgechallenge-service/badgeChallenge/completed"
+    )
+    garmin_connect_available_badge_challenges_url = (
+        "/badgechallenge-service/badgeChallenge/available"
+    )
+    garmin_connect_non_completed_badge_challenges_url = (
+        "/badgechallenge-service/badgeChallenge/non-completed"
+    )
+    garmin_connect_inprogress_virtual_challenges_url = (
+        "/badgechallenge-service/virtualChallenge/inProgress"
+    )
+    garmin_connect_hill_score_url = "/metrics-service/metrics/hillscore"
+
+    garmin_connect_set_blood_pressure_endpoint = "/bloodpressure-service/bloodpressure"
+
+    garmin_connect_endurance_score_url = "/metrics-service/metrics/endurancescore"
+    garmin_connect_menstrual_calendar_url = (
+        "/periodichealth-service/menstrualcycle/calendar"
+    )
+
+    garmin_connect_menstrual_dayview_url = (
+        "/periodichealth-service/menstrualcycle/dayview"
+    )
+    garmin_connect_pregnancy_snapshot_url = (
+        "/periodichealth-service/menstrualcycle/pregnancysnapshot"
+    )
+    garmin_connect_goals_url = "/goal-service/goal/goals"
+
+    garmin_connect_race_predictor_url = "/metrics-service/metrics/racepredictions"
+    garmin_daily_events_url = "/wellness-service/wellness/dailyEvents"
+    garmin_connect_activities = "/activitylist-service/activities/search/activities"
+    garmin_connect_activities_count = "/activitylist-service/activities/count"
+    garmin_connect_activities_baseurl = "/activitylist-service/activities/"
+    garmin_connect_activity = "/activity-service/activity"
+    garmin_connect_activity_types = "/activity-service/activity/activityTypes"
+    garmin_connect_activity_fordate = "/mobile-gateway/heartRate/forDate"
+    garmin_connect_fitnessstats = "/fitnessstats-service/activity"
+
+    garmin_connect_fit_download = "/download-service/files/activity"
+    garmin_connect_tcx_download = "/download-service/export/tcx/activity"
+    garmin_connect_gpx_download = "/download-service/export/gpx/activity"
+    garmin_connect_kml_download = "/download-service/export/kml/activity"
+    garmin_connect_csv_download = "/download-service/export/csv/activity"
+
+    garmin_connect_upload = "/upload-service/upload"
+
+    garmin_connect_gear = "/gear-service/gear/filterGear"
+    garmin_connect_gear_baseurl = "/gear-service/gear"
+
+    garmin_request_reload_url = "/wellness-service/wellness/epoch/request"
+
+    garmin_workouts = "/workout-service"
+
+    garmin_workouts_schedule_url = f"{garmin_workouts}/schedule"
+
+    garmin_connect_delete_activity_url = "/activity-service/activity"
+
+    garmin_graphql_endpoint = "graphql-gateway/graphql"
+
+    garmin_connect_training_plan_url = "/trainingplan-service/trainingplan"
 
     def __init__(
         self,
@@ -107,8 +279,22 @@ class Garmin:
         is_cn: bool = False,
         prompt_mfa: Callable[[], str] | None = None,
         return_on_mfa: bool = False,
+        lazy_json: bool = False,
+        json_decoder: str = "json",
     ) -> None:
-        """Create a new class instance."""
+        """Create a new class instance.
+
+        With lazy_json=True, API responses of at least
+        lazyjson.MIN_LAZY_BYTES are returned as read-only lazy proxies (see
+        garminconnect.lazyjson) that parse fields on first access. This only
+        lowers peak memory: reading even one field costs more CPU time than
+        decoding the whole response. The proxies are Mappings and Sequences,
+        not dicts and lists.
+        json_decoder selects the JSON backend: the standard library ("json",
+        the default), or opt in to "orjson", "msgspec" or "auto" (whichever
+        of those is installed); decode timings are collected in
+        ``decode_stats``.
+        """
 
         # Validate input types
         if email is not None and not isinstance(email, str):
@@ -119,182 +305,64 @@ class Garmin:
             raise ValueError("is_cn must be a boolean")
         if not isinstance(return_on_mfa, bool):
             raise ValueError("return_on_mfa must be a boolean")
+        if not isinstance(lazy_json, bool):
+            raise ValueError("lazy_json must be a boolean")
+        if json_decoder not in DECODERS:
+            raise ValueError(f"json_decoder must be one of {DECODERS}")
 
         self.username = email
         self.password = password
         self.is_cn = is_cn
         self.prompt_mfa = prompt_mfa
         self.return_on_mfa = return_on_mfa
+        self.lazy_json = lazy_json
+        self.json_decoder = get_decoder(json_decoder)
+        self.decode_stats = DecodeStats()
 
-        self.garmin_connect_user_settings_url = (
-            "/userprofile-service/userprofile/user-settings"
-        )
-        self.garmin_connect_userprofile_settings_url = (
-            "/userprofile-service/userprofile/settings"
-        )
-        self.garmin_connect_devices_url = "/device-service/deviceregistration/devices"
-        self.garmin_connect_device_url = "/device-service/deviceservice"
-
-        self.garmin_connect_primary_device_url = (
-            "/web-gateway/device-info/primary-training-device"
-        )
-
-        self.garmin_connect_solar_url = "/web-gateway/solar"
-        self.garmin_connect_weight_url = "/weight-service"
-        self.garmin_connect_daily_summary_url = "/usersummary-service/usersummary/daily"
-        self.garmin_connect_metrics_url = "/metrics-service/metrics/maxmet/daily"
-        self.garmin_connect_biometric_url = "/biometric-service/biometric"
-
-        self.garmin_connect_biometric_stats_url = "/biometric-service/stats"
-        self.garmin_connect_daily_hydration_url = (
-            "/usersummary-service/usersummary/hydration/daily"
-        )
-        self.garmin_connect_set_hydration_url = (
-            "/usersummary-service/usersummary/hydration/log"
-        )
-        self.garmin_connect_daily_stats_steps_url = (
-            "/usersummary-service/stats/steps/daily"
-        )
-        self.garmin_connect_personal_record_url = (
-            "/personalrecord-service/personalrecord/prs"
-        )
-        self.garmin_connect_earned_badges_url = "/badge-service/badge/earned"
-        self.garmin_connect_available_badges_url = "/badge-service/badge/available"
-        self.garmin_connect_adhoc_challenges_url = (
-            "/adhocchallenge-service/adHocChallenge/historical"
-        )
-        self.garmin_connect_badge_challenges_url = (
-            "/badgechallenge-service/badgeChallenge/completed"
-        )
-        self.garmin_connect_available_badge_challenges_url = (
-            "/badgechallenge-service/badgeChallenge/available"
-        )
-        self.garmin_connect_non_completed_badge_challenges_url = (
-            "/badgechallenge-service/badgeChallenge/non-completed"
-        )
-        self.garmin_connect_inprogress_virtual_challenges_url = (
-            "/badgechallenge-service/virtualChallenge/inProgress"
-        )
-        self.garmin_connect_daily_sleep_url = (
-            "/wellness-service/wellness/dailySleepData"
-        )
-        self.garmin_connect_daily_stress_url = "/wellness-service/wellness/dailyStress"
-        self.garmin_connect_hill_score_url = "/metrics-service/metrics/hillscore"
-
-        self.garmin_connect_daily_body_battery_url = (
-            "/wellness-service/wellness/bodyBattery/reports/daily"
-        )
-
-        self.garmin_connect_body_battery_events_url = (
-            "/wellness-service/wellness/bodyBattery/events"
-        )
-
-        self.garmin_connect_blood_pressure_endpoint = (
-            "/bloodpressure-service/bloodpressure/range"
-        )
-
-        self.garmin_connect_set_blood_pressure_endpoint = (
-            "/bloodpressure-service/bloodpressure"
-        )
-
-        self.garmin_connect_endurance_score_url = (
-            "/metrics-service/metrics/endurancescore"
-        )
-        self.garmin_connect_menstrual_calendar_url = (
-            "/periodichealth-service/menstrualcycle/calendar"
-        )
-
-        self.garmin_connect_menstrual_dayview_url = (
-            "/periodichealth-service/menstrualcycle/dayview"
-        )
-        self.garmin_connect_pregnancy_snapshot_url = (
-            "/periodichealth-service/menstrualcycle/pregnancysnapshot"
-        )
-        self.garmin_connect_goals_url = "/goal-service/goal/goals"
-
-        self.garmin_connect_rhr_url = "/userstats-service/wellness/daily"
-
-        self.garmin_connect_hrv_url = "/hrv-service/hrv"
-
-        self.garmin_connect_training_readiness_url = (
-            "/metrics-service/metrics/trainingreadiness"
-        )
-
-        self.garmin_connect_race_predictor_url = (
-            "/metrics-service/metrics/racepredictions"
-        )
-        self.garmin_connect_training_status_url = (
-            "/metrics-service/metrics/trainingstatus/aggregated"
-        )
-        self.garmin_connect_user_summary_chart = (
-            "/wellness-service/wellness/dailySummaryChart"
-        )
-        self.garmin_connect_floors_chart_daily_url = (
-            "/wellness-service/wellness/floorsChartData/daily"
-        )
-        self.garmin_connect_heartrates_daily_url = (
-            "/wellness-service/wellness/dailyHeartRate"
-        )
-        self.garmin_connect_daily_respiration_url = (
-            "/wellness-service/wellness/daily/respiration"
-        )
-        self.garmin_connect_daily_spo2_url = "/wellness-service/wellness/daily/spo2"
-        self.garmin_connect_daily_intensity_minutes = (
-            "/wellness-service/wellness/daily/im"
-        )
-        self.garmin_daily_events_url = "/wellness-service/wellness/dailyEvents"
-        self.garmin_connect_activities = (
-            "/activitylist-service/activities/search/activities"
-        )
-        self.garmin_connect_activities_count = "/activitylist-service/activities/count"
-        self.garmin_connect_activities_baseurl = "/activitylist-service/activities/"
-        self.garmin_connect_activity = "/activity-service/activity"
-        self.garmin_connect_activity_types = "/activity-service/activity/activityTypes"
-        self.garmin_connect_activity_fordate = "/mobile-gateway/heartRate/forDate"
-        self.garmin_connect_fitnessstats = "/fitnessstats-service/activity"
-        self.garmin_connect_fitnessage = "/fitnessage-service/fitnessage"
-
-        self.garmin_connect_fit_download = "/download-service/files/activity"
-        self.garmin_connect_tcx_download = "/download-service/export/tcx/activity"
-        self.garmin_connect_gpx_download = "/download-service/export/gpx/activity"
-        self.garmin_connect_kml_download = "/download-service/export/kml/activity"
-        self.garmin_connect_csv_download = "/download-service/export/csv/activity"
-
-        self.garmin_connect_upload = "/upload-service/upload"
-
-        self.garmin_connect_gear = "/gear-service/gear/filterGear"
-        self.garmin_connect_gear_baseurl = "/gear-service/gear"
-
-        self.garmin_request_reload_url = "/wellness-service/wellness/epoch/request"
+        # garth and requests are imported with the first client
+        from ._client import ThreadSafeClient
 
-        self.garmin_workouts = "/workout-service"
-
-        self.garmin_workouts_schedule_url = f"{self.garmin_workouts}/schedule"
-
-        self.garmin_connect_delete_activity_url = "/activity-service/activity"
-
-        self.garmin_graphql_endpoint = "graphql-gateway/graphql"
-
-        self.garmin_connect_training_plan_url = "/trainingplan-service/trainingplan"
-
-        self.garmin_connect_daily_lifestyle_logging_url = (
-            "/lifestylelogging-service/dailyLog"
-        )
-
-        self.garth = garth.Client(
+        self.garth = ThreadSafeClient(
             domain="garmin.cn" if is_cn else "garmin.com",
             pool_connections=20,
             pool_maxsize=20,
         )
 
-        self.display_name = None
-        self.full_name = None
-        self.unit_system = None
+        self._display_name: str | None = None
+        self._full_name: str | None = None
+        self._unit_system: str | None = None
+        self._profile_pending = False
+        self._profile_lock = threading.Lock()
+        self._tokenstore: TokenStore | None = None
+
+    def _url(self, endpoint: str, **values: Any) -> str:
+        """Build the path of a registered endpoint (see endpoints.ENDPOINTS)."""
+        template = ENDPOINTS[endpoint]
+        if DISPLAY_NAME in template.keyed_by:
+            values["display_name"] = self.display_name
+        return template.path(**values)
+
+    def _connectapi(self, path: str, method: str = "GET", **kwargs: Any) -> Any:
+        resp = self.garth.request(method, "connectapi", path, api=True, **kwargs)
+        if resp.status_code == 204:
+            return None
+        # like garth's connectapi, an empty 200 body is a decode error
+        content = resp.content
+        start = time.perf_counter()
+        if self.lazy_json and len(content) >= MIN_LAZY_BYTES:
+            data = loads_lazy(content)
+        else:
+            data = self.json_decoder.loads(content)
+        self.decode_stats.record(path, len(content), time.perf_counter() - start)
+        return data
 
     def connectapi(self, path: str, **kwargs: Any) -> Any:
         """Wrapper for garth connectapi with error handling."""
+        from garth.exc import GarthHTTPError
+        from requests import HTTPError
+
         try:
-            return self.garth.connectapi(path, **kwargs)
+            return self._connectapi(path, **kwargs)
         except AssertionError as e:
             # Handle Windows-specific OAuth token refresh issue
             # This can occur when garth tries to refresh tokens during API calls
@@ -342,6 +410,9 @@ class Garmin:
 
     def download(self, path: str, **kwargs: Any) -> Any:
         """Wrapper for garth download with error handling."""
+        from garth.exc import GarthHTTPError
+        from requests import HTTPError
+
         try:
             return self.garth.download(path, **kwargs)
         except (HTTPError, GarthHTTPError) as e:
@@ -369,14 +440,34 @@ class Garmin:
             logger.exception("Download failed for path '%s'", path)
             raise GarminConnectConnectionError(f"Download error: {e}") from e
 
-    def login(self, /, tokenstore: str | None = None) -> tuple[str | None, str | None]:
+    def login(
+        self,
+        /,
+        tokenstore: str | TokenStore | None = None,
+        *,
+        lazy_profile: bool = False,
+        profile_ttl: float = DEFAULT_PROFILE_TTL,
+    ) -> tuple[str | None, str | None]:
         """
         Log in using Garth.
 
+        tokenstore is a token directory, a token blob or a TokenStore (see
+        garminconnect.tokenstore). Tokens obtained with credentials are saved
+        back to a TokenStore.
+
+        The profile (display name, full name, unit system) is cached next to
+        the tokens of a directory or TokenStore and reused for profile_ttl
+        seconds, skipping two round trips. With lazy_profile=True it is only
+        fetched when first needed.
+
         Returns:
             Tuple[str | None, str | None]: (access_token, refresh_token) when using credential flow;
             (None, None) when loading from tokenstore.
         """
+        import requests
+        from garth.exc import GarthException
+        from requests import HTTPError
+
         tokenstore = tokenstore or os.getenv("GARMINTOKENS")
 
         try:
@@ -385,7 +476,12 @@ class Garmin:
 
             # Try to load tokens from tokenstore if provided
             tokens_loaded = False
-            if tokenstore:
+            if isinstance(tokenstore, TokenStore):
+                blob = tokenstore.load()
+                if blob:
+                    self.garth.loads(blob)
+                    tokens_loaded = True
+            elif tokenstore:
                 try:
                     if len(tokenstore) > 512:
                         # Token data is provided directly as string (base64 encoded)
@@ -450,40 +546,27 @@ class Garmin:
                         self.password,
                         prompt_mfa=self.prompt_mfa,
                     )
+                    if isinstance(tokenstore, TokenStore):
+                        tokenstore.save(self.garth.dumps())
                     # Continue to load profile/settings below
 
-            # Ensure profile is loaded (tokenstore path may not populate it)
-            if not getattr(self.garth, "profile", None):
-                try:
-                    prof = self.garth.connectapi(
-                        "/userprofile-service/userprofile/profile"
-                    )
-                except Exception as e:
-                    raise GarminConnectAuthenticationError(
-                        "Failed to retrieve profile"
-                    ) from e
-                if not prof or not isinstance(prof, dict) or "displayName" not in prof:
-                    raise GarminConnectAuthenticationError("Invalid profile data found")
-                # Use profile data directly since garth.profile is read-only
-                self.display_name = prof.get("displayName")
-                self.full_name = prof.get("fullName")
-            else:
-                profile = self.garth.profile
-                if isinstance(profile, dict):
-                    self.display_name = profile.get("displayName")
-                    self.full_name = profile.get("fullName")
-
-            settings = self.garth.connectapi(self.garmin_connect_user_settings_url)
-
-            if not settings:
-                raise GarminConnectAuthenticationError(
-                    "Failed to retrieve user settings"
-                )
+            self._tokenstore = store = _as_token_store(tokenstore)
+            if tokens_loaded and store is not None:
+                cached = store.load_profile()
+                if (
+                    cached
+                    and cached.get("token") == self._token_identity()
+                    and time.time() - cached.get("cached_at", 0) < profile_ttl
+                ):
+                    self._apply_profile(cached)
+                    return token1, token2
 
-            if not isinstance(settings, dict) or "userData" not in settings:
-                raise GarminConnectAuthenticationError("Invalid user settings found")
+            if lazy_profile:
+                # fetched by the first access to display_name & co.
+                self._profile_pending = True
+                return token1, token2
 
-            self.unit_system = settings["userData"].get("measurementSystem")
+            self._load_profile()
 
             return token1, token2
 
@@ -531,6 +614,116 @@ class Garmin:
             logger.exception("Login failed")
             raise GarminConnectConnectionError(f"Login failed: {e}") from e
 
+    def _token_identity(self) -> str | None:
+        """Hash of the OAuth1 token, which identifies the logged-in account."""
+        token = getattr(self.garth, "oauth1_token", None)
+        if token is None:
+            return None
+        raw = f"{token.oauth_token}:{token.oauth_token_secret}:{token.domain}"
+        return hashlib.sha256(raw.encode()).hexdigest()
+
+    def _ensure_profile(self) -> None:
+        """Run a pending lazy profile load once, however many threads ask."""
+        if self._profile_pending:
+            with self._profile_lock:
+                if self._profile_pending:
+                    self._load_profile()
+
+    def _load_profile(self) -> None:
+        """Fetch display name, full name and unit system (two round trips)."""
+        # Ensure profile is loaded (tokenstore path may not populate it)
+        if not getattr(self.garth, "profile", None):
+            try:
+                prof = self.garth.connectapi("/userprofile-service/userprofile/profile")
+            except Exception as e:
+                raise GarminConnectAuthenticationError(
+                    "Failed to retrieve profile"
+                ) from e
+            if not prof or not isinstance(prof, dict) or "displayName" not in prof:
+                raise GarminConnectAuthenticationError("Invalid profile data found")
+            # Use profile data directly since garth.profile is read-only
+            self._display_name = prof.get("displayName")
+            self._full_name = prof.get("fullName")
+        else:
+            profile = self.garth.profile
+            if isinstance(profile, dict):
+                self._display_name = profile.get("displayName")
+                self._full_name = profile.get("fullName")
+
+        settings = self.garth.connectapi(self.garmin_connect_user_settings_url)
+
+        if not settings:
+            raise GarminConnectAuthenticationError("Failed to retrieve user settings")
+
+        if not isinstance(settings, dict) or "userData" not in settings:
+            raise GarminConnectAuthenticationError("Invalid user settings found")
+
+        self._unit_system = settings["userData"].get("measurementSystem")
+        self._profile_pending = False
+
+        if self._tokenstore is not None:
+            try:
+                self._tokenstore.save_profile(
+                    {
+                        "display_name": self._display_name,
+                        "full_name": self._full_name,
+                        "unit_system": self._unit_system,
+                        "token": self._token_identity(),
+                        "cached_at": time.time(),
+                    }
+                )
+            except Exception as e:
+                # the cache only saves requests on the next login
+                logger.warning("Could not cache the profile: %s", e)
+
+    def start_token_refresher(
+        self,
+        store: TokenStore | None = None,
+        margin: float = DEFAULT_REFRESH_MARGIN,
+        interval: float = 60.0,
+    ) -> TokenRefresher:
+        """
+        Renew the OAuth2 token in a daemon thread 'margin' seconds before it
+        expires, saving it to 'store' (defaults to the store used to log in).
+        Call stop() on the returned refresher to end it.
+        """
+
+        store = store if store is not None else self._tokenstore
+        return TokenRefresher(self.garth, store, margin, interval).start()
+
+    def _apply_profile(self, profile: dict[str, Any]) -> None:
+        self._display_name = profile.get("display_name")
+        self._full_name = profile.get("full_name")
+        self._unit_system = profile.get("unit_system")
+        self._profile_pending = False
+
+    @property
+    def display_name(self) -> str | None:
+        self._ensure_profile()
+        return self._display_name
+
+    @display_name.setter
+    def display_name(self, value: str | None) -> None:
+        self._display_name = value
+
+    @property
+    def full_name(self) -> str | None:
+        self._ensure_profile()
+        return self._full_name
+
+    @full_name.setter
+    def full_name(self, value: str | None) -> None:
+        self._full_name = value
+
+    @property
+    def unit_system(self) -> str | None:
+        self._ensure_profile()
+        return self._unit_system
+
+    @unit_system.setter
+    def unit_system(self, value: str | None) -> None:
+        self._unit_system = value
+
     def resume_login(
         self, client_state: dict[str, Any], mfa_code: str
     ) -> tuple[Any, Any]:
@@ -573,7 +766,7 @@ class Garmin:
         # Validate input
         cdate = _validate_date_format(cdate, "cdate")
 
-        url = f"{self.garmin_connect_daily_summary_url}/{self.display_name}"
+        url = self._url("get_user_summary")
         params = {"calendarDate": cdate}
         logger.debug("Requesting user summary")
 
@@ -593,7 +786,7 @@ class Garmin:
         # Validate input
         cdate = _validate_date_format(cdate, "cdate")
 
-        url = f"{self.garmin_connect_user_summary_chart}/{self.display_name}"
+        url = self._url("get_steps_data")
         params = {"date": cdate}
         logger.debug("Requesting steps data")
 
@@ -611,7 +804,7 @@ class Garmin:
         # Validate input
         cdate = _validate_date_format(cdate, "cdate")
 
-        url = f"{self.garmin_connect_floors_chart_daily_url}/{cdate}"
+        url = self._url("get_floors", cdate=cdate)
         logger.debug("Requesting floors data")
 
         response = self.connectapi(url)
@@ -645,7 +838,7 @@ class Garmin:
 
         # If range is 28 days or less, make single request
         if days_diff <= 28:
-            url = f"{self.garmin_connect_daily_stats_steps_url}/{start}/{end}"
+            url = self._url("get_daily_steps", start=start, end=end)
             logger.debug("Requesting daily steps data")
             return self.connectapi(url)
 
@@ -662,10 +855,7 @@ class Garmin:
             chunk_start_str = current_start.isoformat()
             chunk_end_str = chunk_end.isoformat()
 
-            url = (
-                f"{self.garmin_connect_daily_stats_steps_url}/"
-                f"{chunk_start_str}/{chunk_end_str}"
-            )
+            url = self._url("get_daily_steps", start=chunk_start_str, end=chunk_end_str)
             logger.debug(
                 f"Requesting daily steps data for chunk: "
                 f"{chunk_start_str} to {chunk_end_str}"
@@ -680,14 +870,24 @@ class Garmin:
 
         return all_results
 
-    def get_heart_rates(self, cdate: str) -> dict[str, Any]:
+    @overload
+    def get_heart_rates(self, cdate: str, fields: None = None) -> dict[str, Any]: ...
+
+    @overload
+    def get_heart_rates(self, cdate: str, fields: Fields | Projection) -> Projected: ...
+
+    def get_heart_rates(
+        self, cdate: str, fields: Fields | Projection | None = None
+    ) -> dict[str, Any] | Projected:
         """Fetch available heart rates data 'cDate' format 'YYYY-MM-DD'.
 
         Args:
             cdate: Date string in format 'YYYY-MM-DD'
+            fields: Optional dotted paths to project the response onto
 
         Returns:
             Dictionary containing heart rate data for the specified date
+            (the projected values when ``fields`` is given)
 
         Raises:
             ValueError: If cdate format is invalid
@@ -698,7 +898,7 @@ class Garmin:
         # Validate input
         cdate = _validate_date_format(cdate, "cdate")
 
-        url = f"{self.garmin_connect_heartrates_daily_url}/{self.display_name}"
+        url = self._url("get_heart_rates")
         params = {"date": cdate}
         logger.debug("Requesting heart rates")
 
@@ -707,7 +907,25 @@ class Garmin:
         if response is None:
             raise GarminConnectConnectionError("No heart rate data received")
 
-        return response
+        return project(response, fields)
+
+    def get_heart_rate_series(
+        self, startdate: str, enddate: str | None = None
+    ) -> HeartRateSeries:
+        """
+        Return all-day heart rate for 'startdate' through 'enddate' (format
+        'YYYY-MM-DD') as compact arrays: epoch-ms int64 timestamps, uint8 bpm
+        and a missing-value mask. Requires the optional numpy dependency.
+        """
+
+        from .series import HeartRateSeries
+
+        return HeartRateSeries.concat(
+            [
+                HeartRateSeries.from_response(self.get_heart_rates(cdate))
+                for cdate in _date_range(startdate, enddate)
+            ]
+        )
 
     def get_stats_and_body(self, cdate: str) -> dict[str, Any]:
         """Return activity data and body composition (compat for garminconnect)."""
@@ -715,7 +933,7 @@ class Garmin:
         stats = self.get_stats(cdate)
         body = self.get_body_composition(cdate)
         body_avg = body.get("totalAverage") or {}
-        if not isinstance(body_avg, dict):
+        if not isinstance(body_avg, Mapping):
             body_avg = {}
         return {**stats, **body_avg}
 
@@ -736,7 +954,7 @@ class Garmin:
             > datetime.strptime(enddate, DATE_FORMAT_STR).date()
         ):
             raise ValueError("startdate cannot be after enddate")
-        url = f"{self.garmin_connect_weight_url}/weight/dateRange"
+        url = self._url("get_body_composition")
         params = {"startDate": str(startdate), "endDate": str(enddate)}
         logger.debug("Requesting body composition")
 
@@ -760,6 +978,8 @@ class Garmin:
     ) -> dict[str, Any]:
         weight = _validate_positive_number(weight, "weight")
         dt = datetime.fromisoformat(timestamp) if timestamp else datetime.now()
+        from .fit import FitEncoderWeight  # type: ignore
+
         fitEncoder = FitEncoderWeight()
         fitEncoder.write_file_info()
         fitEncoder.write_file_creator()
@@ -867,7 +1087,7 @@ class Garmin:
 
         startdate = _validate_date_format(startdate, "startdate")
         enddate = _validate_date_format(enddate, "enddate")
-        url = f"{self.garmin_connect_weight_url}/weight/range/{startdate}/{enddate}"
+        url = self._url("get_weigh_ins", startdate=startdate, enddate=enddate)
         params = {"includeAll": True}
         logger.debug("Requesting weigh-ins")
 
@@ -877,7 +1097,7 @@ class Garmin:
         """Get weigh-ins for 'cdate' format 'YYYY-MM-DD'."""
 
         cdate = _validate_date_format(cdate, "cdate")
-        url = f"{self.garmin_connect_weight_url}/weight/dayview/{cdate}"
+        url = self._url("get_daily_weigh_ins", cdate=cdate)
         params = {"includeAll": True}
         logger.debug("Requesting weigh-ins")
 
@@ -921,11 +1141,15 @@ class Garmin:
         return len(weigh_ins)
 
     def get_body_battery(
-        self, startdate: str, enddate: str | None = None
-    ) -> list[dict[str, Any]]:
+        self,
+        startdate: str,
+        enddate: str | None = None,
+        fields: Fields | Projection | None = None,
+    ) -> list[dict[str, Any]] | list[Projected]:
         """
         Return body battery values by day for 'startdate' format
-        'YYYY-MM-DD' through enddate 'YYYY-MM-DD'
+        'YYYY-MM-DD' through enddate 'YYYY-MM-DD'. With ``fields`` each day
+        is projected onto those dotted paths.
         """
 
         startdate = _validate_date_format(startdate, "startdate")
@@ -933,11 +1157,14 @@ class Garmin:
             enddate = startdate
         else:
             enddate = _validate_date_format(enddate, "enddate")
-        url = self.garmin_connect_daily_body_battery_url
+        url = self._url("get_body_battery")
         params = {"startDate": str(startdate), "endDate": str(enddate)}
         logger.debug("Requesting body battery data")
 
-        return self.connectapi(url, params=params)
+        response = self.connectapi(url, params=params)
+        if fields is None:
+            return response
+        return compile_projection(fields).extract_many(response or [])
 
     def get_body_battery_events(self, cdate: str) -> list[dict[str, Any]]:
         """
@@ -947,7 +1174,7 @@ class Garmin:
         """
 
         cdate = _validate_date_format(cdate, "cdate")
-        url = f"{self.garmin_connect_body_battery_events_url}/{cdate}"
+        url = self._url("get_body_battery_events", cdate=cdate)
         logger.debug("Requesting body battery event data")
 
         return self.connectapi(url)
@@ -1001,7 +1228,7 @@ class Garmin:
             enddate = startdate
         else:
             enddate = _validate_date_format(enddate, "enddate")
-        url = f"{self.garmin_connect_blood_pressure_endpoint}/{startdate}/{enddate}"
+        url = self._url("get_blood_pressure", startdate=startdate, enddate=enddate)
         params = {"includeAll": True}
         logger.debug("Requesting blood pressure data")
 
@@ -1023,7 +1250,7 @@ class Garmin:
         """Return available max metric data for 'cdate' format 'YYYY-MM-DD'."""
 
         cdate = _validate_date_format(cdate, "cdate")
-        url = f"{self.garmin_connect_metrics_url}/{cdate}/{cdate}"
+        url = self._url("get_max_metrics", cdate=cdate)
         logger.debug("Requesting max metrics")
 
         return self.connectapi(url)
@@ -1052,9 +1279,9 @@ class Garmin:
             power_url = f"{self.garmin_connect_biometric_url}/powerToWeight/latest/{date.today()}?sport=Running"
 
             power = self.connectapi(power_url)
-            if isinstance(power, list) and power:
+            if isinstance(power, (list, LazyArray)) and power:
                 power_dict = power[0]
-            elif isinstance(power, dict):
+            elif isinstance(power, Mapping):
                 power_dict = power
             else:
                 power_dict = {}
@@ -1212,7 +1439,7 @@ class Garmin:
         """Return available hydration data 'cdate' format 'YYYY-MM-DD'."""
 
         cdate = _validate_date_format(cdate, "cdate")
-        url = f"{self.garmin_connect_daily_hydration_url}/{cdate}"
+        url = self._url("get_hydration_data", cdate=cdate)
         logger.debug("Requesting hydration data")
 
         return self.connectapi(url)
@@ -1221,7 +1448,7 @@ class Garmin:
         """Return available respiration data 'cdate' format 'YYYY-MM-DD'."""
 
         cdate = _validate_date_format(cdate, "cdate")
-        url = f"{self.garmin_connect_daily_respiration_url}/{cdate}"
+        url = self._url("get_respiration_data", cdate=cdate)
         logger.debug("Requesting respiration data")
 
         return self.connectapi(url)
@@ -1230,7 +1457,7 @@ class Garmin:
         """Return available SpO2 data 'cdate' format 'YYYY-MM-DD'."""
 
         cdate = _validate_date_format(cdate, "cdate")
-        url = f"{self.garmin_connect_daily_spo2_url}/{cdate}"
+        url = self._url("get_spo2_data", cdate=cdate)
         logger.debug("Requesting SpO2 data")
 
         return self.connectapi(url)
@@ -1239,7 +1466,7 @@ class Garmin:
         """Return available Intensity Minutes data 'cdate' format 'YYYY-MM-DD'."""
 
         cdate = _validate_date_format(cdate, "cdate")
-        url = f"{self.garmin_connect_daily_intensity_minutes}/{cdate}"
+        url = self._url("get_intensity_minutes_data", cdate=cdate)
         logger.debug("Requesting Intensity Minutes data")
 
         return self.connectapi(url)
@@ -1248,7 +1475,7 @@ class Garmin:
         """Return available all day stress data 'cdate' format 'YYYY-MM-DD'."""
 
         cdate = _validate_date_format(cdate, "cdate")
-        url = f"{self.garmin_connect_daily_stress_url}/{cdate}"
+        url = self._url("get_all_day_stress", cdate=cdate)
         logger.debug("Requesting all day stress data")
 
         return self.connectapi(url)
@@ -1260,7 +1487,7 @@ class Garmin:
         """
 
         cdate = _validate_date_format(cdate, "cdate")
-        url = f"{self.garmin_daily_events_url}?calendarDate={cdate}"
+        url = self._url("get_all_day_events", cdate=cdate)
         logger.debug("Requesting all day events data")
 
         return self.connectapi(url)
@@ -1268,7 +1495,7 @@ class Garmin:
     def get_personal_record(self) -> dict[str, Any]:
         """Return personal records for current user."""
 
-        url = f"{self.garmin_connect_personal_record_url}/{self.display_name}"
+        url = self._url("get_personal_record")
         logger.debug("Requesting personal records for user")
 
         return self.connectapi(url)
@@ -1276,7 +1503,7 @@ class Garmin:
     def get_earned_badges(self) -> list[dict[str, Any]]:
         """Return earned badges for current user."""
 
-        url = self.garmin_connect_earned_badges_url
+        url = self._url("get_earned_badges")
         logger.debug("Requesting earned badges for user")
 
         return self.connectapi(url)
@@ -1284,7 +1511,7 @@ class Garmin:
     def get_available_badges(self) -> list[dict[str, Any]]:
         """Return available badges for current user."""
 
-        url = self.garmin_connect_available_badges_url
+        url = self._url("get_available_badges")
         logger.debug("Requesting available badges for user")
 
         return self.connectapi(url, params={"showExclusiveBadge": "true"})
@@ -1380,30 +1607,107 @@ class Garmin:
 
         return self.connectapi(url, params=params)
 
-    def get_sleep_data(self, cdate: str) -> dict[str, Any]:
-        """Return sleep data for current user."""
+    @overload
+    def get_sleep_data(self, cdate: str, fields: None = None) -> dict[str, Any]: ...
+
+    @overload
+    def get_sleep_data(self, cdate: str, fields: Fields | Projection) -> Projected: ...
+
+    def get_sleep_data(
+        self, cdate: str, fields: Fields | Projection | None = None
+    ) -> dict[str, Any] | Projected:
+        """Return sleep data for current user.
+
+        Pass ``fields`` (dotted paths, or ``{name: path}``) to get only those
+        values as a tuple (or dict) instead of the full response.
+        """
 
         cdate = _validate_date_format(cdate, "cdate")
-        url = f"{self.garmin_connect_daily_sleep_url}/{self.display_name}"
+        url = self._url("get_sleep_data")
         params = {"date": cdate, "nonSleepBufferMinutes": 60}
         logger.debug("Requesting sleep data")
 
-        return self.connectapi(url, params=params)
+        return project(self.connectapi(url, params=params), fields)
+
+    def get_sleep_series(
+        self, startdate: str, enddate: str | None = None
+    ) -> SleepSeries:
+        """
+        Return sleep stages for the nights 'startdate' through 'enddate'
+        (format 'YYYY-MM-DD') as run-length encoded arrays. Each response is
+        decoded as soon as it arrives, so only the compact arrays are kept.
+        Requires the optional numpy dependency.
+        """
 
-    def get_stress_data(self, cdate: str) -> dict[str, Any]:
-        """Return stress data for current user."""
+        from .sleep import SleepSeries
+
+        return SleepSeries.concat(
+            [
+                SleepSeries.from_responses([self.get_sleep_data(cdate)])
+                for cdate in _date_range(startdate, enddate)
+            ]
+        )
+
+    @overload
+    def get_stress_data(self, cdate: str, fields: None = None) -> dict[str, Any]: ...
+
+    @overload
+    def get_stress_data(self, cdate: str, fields: Fields | Projection) -> Projected: ...
+
+    def get_stress_data(
+        self, cdate: str, fields: Fields | Projection | None = None
+    ) -> dict[str, Any] | Projected:
+        """Return stress data for current user.
+
+        Pass ``fields`` (dotted paths, or ``{name: path}``) to get only those
+        values as a tuple (or dict) instead of the full response.
+        """
 
         cdate = _validate_date_format(cdate, "cdate")
-        url = f"{self.garmin_connect_daily_stress_url}/{cdate}"
+        url = self._url("get_stress_data", cdate=cdate)
         logger.debug("Requesting stress data")
 
-        return self.connectapi(url)
+        return project(self.connectapi(url), fields)
+
+    def get_stress_series(
+        self, startdate: str, enddate: str | None = None
+    ) -> StressSeries:
+        """
+        Return all-day stress levels for 'startdate' through 'enddate' (format
+        'YYYY-MM-DD') as compact arrays. Requires the optional numpy dependency.
+        """
+
+        from .series import StressSeries
+
+        return StressSeries.concat(
+            [
+                StressSeries.from_response(self.get_stress_data(cdate))
+                for cdate in _date_range(startdate, enddate)
+            ]
+        )
+
+    def get_body_battery_series(
+        self, startdate: str, enddate: str | None = None
+    ) -> BodyBatterySeries:
+        """
+        Return body battery levels for 'startdate' through 'enddate' (format
+        'YYYY-MM-DD') as compact arrays. Requires the optional numpy dependency.
+        """
+
+        from .series import BodyBatterySeries
+
+        return BodyBatterySeries.concat(
+            [
+                BodyBatterySeries.from_response(self.get_stress_data(cdate))
+                for cdate in _date_range(startdate, enddate)
+            ]
+        )
 
     def get_lifestyle_logging_data(self, cdate: str) -> dict[str, Any]:
         """Return lifestyle logging data for current user."""
 
         cdate = _validate_date_format(cdate, "cdate")
-        url = f"{self.garmin_connect_daily_lifestyle_logging_url}/{cdate}"
+        url = self._url("get_lifestyle_logging_data", cdate=cdate)
         logger.debug("Requesting lifestyle logging data")
 
         return self.connectapi(url)
@@ -1412,7 +1716,7 @@ class Garmin:
         """Return resting heartrate data for current user."""
 
         cdate = _validate_date_format(cdate, "cdate")
-        url = f"{self.garmin_connect_rhr_url}/{self.display_name}"
+        url = self._url("get_rhr_day")
         params = {
             "fromDate": cdate,
             "untilDate": cdate,
@@ -1422,23 +1726,53 @@ class Garmin:
 
         return self.connectapi(url, params=params)
 
-    def get_hrv_data(self, cdate: str) -> dict[str, Any] | None:
-        """Return Heart Rate Variability (hrv) data for current user."""
+    @overload
+    def get_hrv_data(
+        self, cdate: str, fields: None = None
+    ) -> dict[str, Any] | None: ...
+
+    @overload
+    def get_hrv_data(self, cdate: str, fields: Fields | Projection) -> Projected: ...
+
+    def get_hrv_data(
+        self, cdate: str, fields: Fields | Projection | None = None
+    ) -> dict[str, Any] | None | Projected:
+        """Return Heart Rate Variability (hrv) data for current user.
+
+        Pass ``fields`` (dotted paths, or ``{name: path}``) to get only those
+        values as a tuple (or dict) instead of the full response.
+        """
 
         cdate = _validate_date_format(cdate, "cdate")
-        url = f"{self.garmin_connect_hrv_url}/{cdate}"
+        url = self._url("get_hrv_data", cdate=cdate)
         logger.debug("Requesting Heart Rate Variability (hrv) data")
 
-        return self.connectapi(url)
+        return project(self.connectapi(url), fields)
+
+    @overload
+    def get_training_readiness(
+        self, cdate: str, fields: None = None
+    ) -> dict[str, Any]: ...
 
-    def get_training_readiness(self, cdate: str) -> dict[str, Any]:
-        """Return training readiness data for current user."""
+    @overload
+    def get_training_readiness(
+        self, cdate: str, fields: Fields | Projection
+    ) -> Projected: ...
+
+    def get_training_readiness(
+        self, cdate: str, fields: Fields | Projection | None = None
+    ) -> dict[str, Any] | Projected:
+        """Return training readiness data for current user.
+
+        Pass ``fields`` (dotted paths, or ``{name: path}``) to get only those
+        values as a tuple (or dict) instead of the full response.
+        """
 
         cdate = _validate_date_format(cdate, "cdate")
-        url = f"{self.garmin_connect_training_readiness_url}/{cdate}"
+        url = self._url("get_training_readiness", cdate=cdate)
         logger.debug("Requesting training readiness data")
 
-        return self.connectapi(url)
+        return project(self.connectapi(url), fields)
 
     def get_endurance_score(
         self, startdate: str, enddate: str | None = None
@@ -1518,20 +1852,71 @@ class Garmin:
         else:
             raise ValueError("you must either provide all parameters or no parameters")
 
-    def get_training_status(self, cdate: str) -> dict[str, Any]:
-        """Return training status data for current user."""
+    @overload
+    def get_training_status(
+        self, cdate: str, fields: None = None
+    ) -> dict[str, Any]: ...
+
+    @overload
+    def get_training_status(
+        self, cdate: str, fields: Fields | Projection
+    ) -> Projected: ...
+
+    def get_training_status(
+        self, cdate: str, fields: Fields | Projection | None = None
+    ) -> dict[str, Any] | Projected:
+        """Return training status data for current user.
+
+        Pass ``fields`` (dotted paths, or ``{name: path}``) to get only those
+        values as a tuple (or dict) instead of the full response.
+        """
 
         cdate = _validate_date_format(cdate, "cdate")
-        url = f"{self.garmin_connect_training_status_url}/{cdate}"
+        url = self._url("get_training_status", cdate=cdate)
         logger.debug("Requesting training status data")
 
-        return self.connectapi(url)
+        return project(self.connectapi(url), fields)
+
+    _DAILY_FIELD_ENDPOINTS = frozenset(
+        {
+            "get_heart_rates",
+            "get_hrv_data",
+            "get_sleep_data",
+            "get_stress_data",
+            "get_training_readiness",
+            "get_training_status",
+        }
+    )
+
+    def get_daily_fields(
+        self,
+        endpoint: str,
+        fields: Fields | Projection,
+        startdate: str,
+        enddate: str | None = None,
+    ) -> list[Projected]:
+        """
+        Call the per-day method 'endpoint' (e.g. 'get_sleep_data') for
+        'startdate' through 'enddate' (format 'YYYY-MM-DD') and return one
+        projected row per day. The projection is compiled once and every
+        response is dropped as soon as its values are extracted.
+        """
+
+        if endpoint not in self._DAILY_FIELD_ENDPOINTS:
+            raise ValueError(
+                f"endpoint must be one of {sorted(self._DAILY_FIELD_ENDPOINTS)}"
+            )
+        fetch = getattr(self, endpoint)
+        projection = compile_projection(fields)
+        return [
+            fetch(cdate, fields=projection) for cdate in _date_range(startdate, enddate)
+        ]
 
     def get_fitnessage_data(self, cdate: str) -> dict[str, Any]:
         """Return Fitness Age data for current user."""
 
         cdate = _validate_date_format(cdate, "cdate")
-        url = f"{self.garmin_connect_fitnessage}/{cdate}"
+        url = self._url("get_fitnessage_data", cdate=cdate)
         logger.debug("Requesting Fitness Age data")
 
         return self.connectapi(url)
@@ -1568,7 +1953,7 @@ class Garmin:
     def get_devices(self) -> list[dict[str, Any]]:
         """Return available devices for the current user account."""
 
-        url = self.garmin_connect_devices_url
+        url = self._url("get_devices")
         logger.debug("Requesting devices")
 
         return self.connectapi(url)
@@ -1761,10 +2146,16 @@ class Garmin:
         """Return last activity."""
 
         activities = self.get_activities(0, 1)
-        if activities and isinstance(activities, list) and len(activities) > 0:
+        if (
+            activities
+            and isinstance(activities, (list, LazyArray))
+            and len(activities) > 0
+        ):
             return activities[-1]
         elif (
-            activities and isinstance(activities, dict) and "activityList" in activities
+            activities
+            and isinstance(activities, Mapping)
+            and "activityList" in activities
         ):
             activity_list = activities["activityList"]
             if activity_list and len(activity_list) > 0:
@@ -1858,7 +2249,22 @@ class Garmin:
         :return: list of JSON activities
         """
 
-        activities = []
+        return list(
+            self.iter_activities_by_date(startdate, enddate, activitytype, sortorder)
+        )
+
+    def iter_activities_by_date(
+        self,
+        startdate: str,
+        enddate: str | None = None,
+        activitytype: str | None = None,
+        sortorder: str | None = None,
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Like `get_activities_by_date`, but yield the activities page by page
+        as they are fetched instead of collecting them in a list.
+        """
+
         start = 0
         limit = 20
         # mimicking the behavior of the web interface that fetches
@@ -1885,13 +2291,10 @@ class Garmin:
             params["start"] = str(start)
             logger.debug("Requesting activities %d to %d", start, start + limit)
             act = self.connectapi(url, params=params)
-            if act:
-                activities.extend(act)
-                start = start + limit
-            else:
+            if not act:
                 break
-
-        return activities
+            yield from act
+            start = start + limit
 
     def get_progress_summary_between_dates(
         self,
@@ -1985,6 +2388,8 @@ class Garmin:
         url = f"{self.garmin_connect_gear_baseurl}/stats/{gearUUID}"
         logger.debug("Requesting gear stats for gearUUID %s", gearUUID)
 
+        from garth.exc import GarthHTTPError
+
         try:
             return self.connectapi(url)
         except GarthHTTPError as e:
@@ -2015,6 +2420,8 @@ class Garmin:
             f"activityType/{activityType}{defaultGearString}"
         )
 
+        from garth.exc import GarthHTTPError
+
         try:
             return self.garth.request(method_override, "connectapi", url, api=True)
         except GarthHTTPError as e:
@@ -2065,6 +2472,27 @@ class Garmin:
 
         return self.download(url)
 
+    def download_activity_fit(self, activity_id: str) -> bytes:
+        """
+        Download the ORIGINAL activity file and return the contained FIT file
+        bytes. The zip archive is unpacked in memory, no temporary files are
+        written. Use `garminconnect.fit.FitDecoder` to decode the result.
+        """
+
+        content = self.download_activity(
+            activity_id, dl_fmt=Garmin.ActivityDownloadFormat.ORIGINAL
+        )
+        import zipfile
+
+        from .archive import extract_fit
+
+        try:
+            return extract_fit(content)
+        except (ValueError, zipfile.BadZipFile) as e:
+            raise GarminConnectInvalidFileFormatError(
+                f"No FIT file in download for activity {activity_id}: {e}"
+            ) from e
+
     def get_activity_splits(self, activity_id: str) -> dict[str, Any]:
         """Return activity splits."""
 
@@ -2134,6 +2562,20 @@ class Garmin:
 
         return self.connectapi(url, params=params)
 
+    def get_activity_details_arrays(
+        self, activity_id: str, maxchart: int = 2000, maxpoly: int = 4000
+    ) -> ActivityDetails:
+        """
+        Return activity details decoded into NumPy arrays, one per metric key.
+        Requires the optional numpy dependency.
+        """
+
+        from .series import decode_activity_details
+
+        return decode_activity_details(
+            self.get_activity_details(activity_id, maxchart, maxpoly) or {}
+        )
+
     def get_activity_exercise_sets(self, activity_id: int | str) -> dict[str, Any]:
         """Return activity exercise sets."""
 
@@ -2170,6 +2612,8 @@ class Garmin:
         url = f"{self.garmin_connect_activities_baseurl}{gearUUID}/gear?start=0&limit={limit}"
         logger.debug("Requesting activities for gearUUID %s", gearUUID)
 
+        from garth.exc import GarthHTTPError
+
         try:
             return self.connectapi(url)
         except GarthHTTPError as e:
@@ -2204,6 +2648,8 @@ class Garmin:
         )
         logger.debug("Linking gear %s to activity %s", gearUUID, activity_id)
 
+        from garth.exc import GarthHTTPError
+
         try:
             return self.garth.put("connectapi", url).json()
         except GarthHTTPError as e:
@@ -2234,6 +2680,8 @@ class Garmin:
         url = f"{self.garmin_connect_gear_baseurl}/unlink/{gearUUID}/activity/{activity_id}"
         logger.debug("Unlinking gear %s from activity %s", gearUUID, activity_id)
 
+        from garth.exc import GarthHTTPError
+
         try:
             return self.garth.put("connectapi", url).json()
         except GarthHTTPError as e:
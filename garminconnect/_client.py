@@ -0,0 +1,74 @@
+"""garth client used by :class:`~garminconnect.Garmin`.
+
+Kept in its own module so that ``import garminconnect`` does not import garth.
+"""
+
+from __future__ import annotations
+
+import threading
+from typing import Any
+
+import garth
+import requests
+from garth.auth_tokens import OAuth2Token
+from requests.adapters import HTTPAdapter
+
+
+class ThreadSafeClient(garth.Client):
+    """garth client that can be shared between threads.
+
+    OAuth2 refreshes are single-flight: threads that find the token expired
+    wait for the refresh already in progress instead of starting their own.
+    Every request gets its own headers dict (garth's default argument is a
+    shared dict that would leak the Authorization header between clients).
+    A ``shared_adapter`` stays mounted across :meth:`configure`, which
+    otherwise mounts a private adapter (e.g. when tokens are loaded).
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        self.refresh_lock = threading.Lock()
+        self.shared_adapter: HTTPAdapter | None = None
+        super().__init__(*args, **kwargs)
+
+    def configure(self, *args: Any, **kwargs: Any) -> None:
+        super().configure(*args, **kwargs)
+        if self.shared_adapter is not None:
+            self.sess.mount("https://", self.shared_adapter)
+
+    def share_adapter(self, adapter: HTTPAdapter) -> None:
+        """Route all requests through ``adapter``, also after reconfiguring."""
+        self.shared_adapter = adapter
+        self.sess.mount("https://", adapter)
+
+    def refresh_oauth2(self) -> None:
+        seen = self.oauth2_token
+        with self.refresh_lock:
+            current = self.oauth2_token
+            if (
+                current is not seen
+                and isinstance(current, OAuth2Token)
+                and not current.expired
+            ):
+                return
+            super().refresh_oauth2()
+
+    def request(
+        self,
+        method: str,
+        subdomain: str,
+        path: str,
+        /,
+        api: bool = False,
+        referrer: str | bool = False,
+        headers: dict[str, str] | None = None,
+        **kwargs: Any,
+    ) -> requests.Response:
+        return super().request(
+            method,
+            subdomain,
+            path,
+            api=api,
+            referrer=referrer,
+            headers=dict(headers or {}),
+            **kwargs,
+        )
@@ -0,0 +1,515 @@
+"""Local columnar index of the activity list for instant queries.
+
+:class:`ActivityIndex` keeps one NumPy array per field, sorted by start
+time, plus secondary indexes: postings per activity type and gear, value
+sorted permutations of duration and distance and an inverted index of the
+words in ``activityName``. Queries combine them and return an
+:class:`ActivitySet` for aggregation::
+
+    index = ActivityIndex.from_api(api, "2020-01-01")
+    index.save("activities.npz")
+
+    tennis = index.query(
+        type="tennis",
+        start="2025-01-01",
+        end="2025-12-31",
+        duration=(3600, None),
+        average_hr=(150, None),
+    )
+    len(tennis), tennis.sum("duration") / 3600, tennis.rows()
+    index.query(text="track intervals").group_by("month", "distance")
+
+Range filters are closed intervals ``(min, max)``; ``None`` leaves a side
+open. Gear is not part of the activity list: pass ``{activity_id: gear}``
+from :func:`gear_by_activity`, which needs one request per gear. NumPy is an
+optional dependency - install it with: pip install numpy or:
+pip install garminconnect[analysis]
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from collections.abc import Callable, Iterable, Mapping
+from datetime import date, timedelta
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from .lazyjson import json_default
+from .projection import Projection
+from .series import _require_numpy
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from . import Garmin
+else:
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+
+# numeric columns: {column: dotted path in an activity list entry}
+NUMERIC_FIELDS = Projection(
+    {
+        "duration": "duration",
+        "moving_duration": "movingDuration",
+        "distance": "distance",
+        "elevation_gain": "elevationGain",
+        "calories": "calories",
+        "average_hr": "averageHR",
+        "max_hr": "maxHR",
+        "average_speed": "averageSpeed",
+        "aerobic_training_effect": "aerobicTrainingEffect",
+        "anaerobic_training_effect": "anaerobicTrainingEffect",
+        "training_load": "activityTrainingLoad",
+    }
+)
+SORTED_COLUMNS = ("duration", "distance")  # range lookups by binary search
+GROUP_KEYS = ("type", "gear", "year", "month", "week")
+AGGREGATES = ("count", "sum", "mean", "min", "max")
+
+_SAVED_EXTRAS = ("types", "gears", "activities", "gear_by_id")
+_WORD = re.compile(r"\w+")
+
+
+def _words(text: str | None) -> set[str]:
+    return set(_WORD.findall(text.lower())) if text else set()
+
+
+def _day(value: date | str) -> np.datetime64:
+    return np.datetime64(str(value)[:10], "D")
+
+
+def _codes(values: list[str | None]) -> tuple[np.ndarray, list[str]]:
+    """Encode ``values`` as positions in a sorted vocabulary, -1 for None."""
+    vocabulary = sorted({v for v in values if v is not None})
+    lookup = {value: code for code, value in enumerate(vocabulary)}
+    codes = np.array([-1 if v is None else lookup[v] for v in values], dtype=np.int32)
+    return codes, vocabulary
+
+
+def _postings(codes: np.ndarray, size: int) -> list[np.ndarray]:
+    """Sorted row positions of every code."""
+    order = np.argsort(codes, kind="stable")
+    bounds = np.searchsorted(codes[order], np.arange(size + 1))
+    return [order[bounds[c] : bounds[c + 1]] for c in range(size)]
+
+
+def _between(values: np.ndarray, low: float | None, high: float | None) -> np.ndarray:
+    keep = ~np.isnan(values)
+    if low is not None:
+        keep &= values >= low
+    if high is not None:
+        keep &= values <= high
+    return keep
+
+
+def _npz_path(path: str | Path) -> Path:
+    # np.savez appends .npz to other names; load the file it actually wrote
+    path = Path(path)
+    return path if path.suffix == ".npz" else path.with_name(path.name + ".npz")
+
+
+class _Filter(NamedTuple):
+    size: int  # number of candidate rows
+    rows: Callable[[], np.ndarray]  # candidate rows in ascending order
+    test: Callable[[np.ndarray], np.ndarray]  # mask of the given rows that match
+
+
+def gear_by_activity(api: Garmin, gear_uuids: Iterable[str]) -> dict[int, str]:
+    """Map activity ids to gear with one ``get_gear_activities`` per gear."""
+    gear = {}
+    for uuid in gear_uuids:
+        for activity in api.get_gear_activities(uuid) or []:
+            gear[activity["activityId"]] = uuid
+    return gear
+
+
+class ActivityIndex:
+    """Columnar activity list with secondary indexes, see the module docs.
+
+    ``columns`` maps ``activity_id`` (int64), ``start`` (local start time,
+    ``datetime64[s]``), ``type`` and ``gear`` (int32 codes into ``types``
+    and ``gears``, -1 if unknown), ``name`` and the :data:`NUMERIC_FIELDS`
+    (float64, NaN if missing) to arrays in start time order.
+    """
+
+    def __init__(
+        self,
+        activities: Iterable[dict[str, Any]] = (),
+        gear: Mapping[int, str] | None = None,
+    ) -> None:
+        _require_numpy()
+        self._activities: dict[int, dict[str, Any]] = {}
+        self._gear: dict[int, str] = {}
+        self.types: list[str] = []
+        self.gears: list[str] = []
+        self.columns: dict[str, np.ndarray] = {}
+        self.add(activities, gear)
+
+    def __len__(self) -> int:
+        return len(self.columns["activity_id"])
+
+    def add(
+        self,
+        activities: Iterable[dict[str, Any]],
+        gear: Mapping[int, str] | None = None,
+    ) -> int:
+        """Add or replace activities (by ``activityId``) and reindex.
+
+        Returns the number of activities passed.
+        """
+        added = 0
+        for activity in activities:
+            self._activities[activity["activityId"]] = activity
+            added += 1
+        self._gear.update(gear or {})
+        self._build()
+        return added
+
+    def _build(self) -> None:
+        entries = sorted(
+            self._activities.values(),
+            # activities without a start time sort last, like NaT
+            key=lambda a: (
+                a.get("startTimeLocal") is None,
+                a.get("startTimeLocal") or "",
+                a["activityId"],
+            ),
+        )
+        ids = [a["activityId"] for a in entries]
+        columns: dict[str, np.ndarray] = {
+            "activity_id": np.array(ids, dtype=np.int64),
+            "start": np.array(
+                [(a.get("startTimeLocal") or "NaT").replace(" ", "T") for a in entries],
+                dtype="datetime64[s]",
+            ),
+            "name": np.array([a.get("activityName") or "" for a in entries], dtype=str),
+        }
+        numeric = NUMERIC_FIELDS.columns(entries)
+        for name, values in numeric.items():
+            columns[name] = np.array(
+                [np.nan if v is None else v for v in values], dtype=np.float64
+            )
+        columns["type"], self.types = _codes(
+            [(a.get("activityType") or {}).get("typeKey") for a in entries]
+        )
+        columns["gear"], self.gears = _codes([self._gear.get(i) for i in ids])
+        self.columns = columns
+        self._index()
+
+    def _index(self) -> None:
+        columns = self.columns
+        self._days = columns["start"].astype("datetime64[D]")
+        self._by_type = _postings(columns["type"], len(self.types))
+        self._by_gear = _postings(columns["gear"], len(self.gears))
+        self._sorted = {}
+        for name in SORTED_COLUMNS:
+            values = columns[name]
+            order = np.argsort(values, kind="stable")  # NaN last
+            self._sorted[name] = (order, values[order])
+        words: dict[str, list[int]] = {}
+        for row, name in enumerate(columns["name"].tolist()):
+            for word in _words(name):
+                words.setdefault(word, []).append(row)
+        self._words = {w: np.array(rows, dtype=np.int64) for w, rows in words.items()}
+
+    @classmethod
+    def from_api(
+        cls,
+        api: Garmin,
+        startdate: str,
+        enddate: str | None = None,
+        gear: Mapping[int, str] | None = None,
+    ) -> ActivityIndex:
+        """Index the activities of ``startdate..enddate``."""
+        return cls(api.iter_activities_by_date(startdate, enddate), gear)
+
+    def update_from_api(self, api: Garmin, days: int = 7) -> int:
+        """Add the activities of the last ``days`` before the newest indexed.
+
+        The overlap picks up activities edited or uploaded late.
+        """
+        known = self._days[~np.isnat(self._days)]
+        if not len(known):
+            raise ValueError("the index is empty, use from_api")
+        start = known.max().item() - timedelta(days=days)
+        return self.add(api.iter_activities_by_date(start.isoformat()))
+
+    def _time_filter(self, start: date | str | None, end: date | str | None) -> _Filter:
+        times = self.columns["start"]
+        low = 0 if start is None else int(np.searchsorted(times, _day(start)))
+        high = (
+            len(self)
+            if end is None
+            else int(np.searchsorted(times, _day(end) + np.timedelta64(1, "D")))
+        )
+        return _Filter(
+            high - low,
+            lambda: np.arange(low, high),
+            lambda rows: (rows >= low) & (rows < high),
+        )
+
+    def _code_filter(
+        self,
+        column: str,
+        wanted: str | Iterable[str],
+        vocabulary: list[str],
+        postings: list[np.ndarray],
+    ) -> _Filter:
+        names = [wanted] if isinstance(wanted, str) else list(wanted)
+        codes = [vocabulary.index(n) for n in names if n in vocabulary]
+        size = sum(len(postings[c]) for c in codes)
+        return _Filter(
+            size,
+            lambda: np.sort(
+                np.concatenate([postings[c] for c in codes] or [np.empty(0, np.int64)])
+            ),
+            lambda rows: np.isin(self.columns[column][rows], codes),
+        )
+
+    def _text_filter(self, text: str) -> _Filter:
+        matches: np.ndarray | None = None
+        for word in _words(text):
+            rows = self._words.get(word, np.empty(0, dtype=np.int64))
+            matches = (
+                rows
+                if matches is None
+                else np.intersect1d(matches, rows, assume_unique=True)
+            )
+        if matches is None:
+            matches = np.arange(len(self))
+        found = matches
+        return _Filter(len(found), lambda: found, lambda rows: np.isin(rows, found))
+
+    def _range_filter(
+        self, name: str, low: float | None, high: float | None
+    ) -> _Filter:
+        values = self.columns[name]
+
+        def test(rows: np.ndarray) -> np.ndarray:
+            return _between(values[rows], low, high)
+
+        if name not in self._sorted:
+            return _Filter(
+                len(self), lambda: np.flatnonzero(_between(values, low, high)), test
+            )
+        order, ordered = self._sorted[name]
+        first = 0 if low is None else int(np.searchsorted(ordered, low, "left"))
+        last = int(np.searchsorted(ordered, np.inf if high is None else high, "right"))
+        return _Filter(last - first, lambda: np.sort(order[first:last]), test)
+
+    def query(
+        self,
+        start: date | str | None = None,
+        end: date | str | None = None,
+        type: str | Iterable[str] | None = None,
+        gear: str | Iterable[str] | None = None,
+        text: str | None = None,
+        **ranges: tuple[float | None, float | None],
+    ) -> ActivitySet:
+        """Select activities matching every given filter.
+
+        The candidates of the most selective index are read and the other
+        filters are checked on them only.
+
+        :param start: First local start date (inclusive)
+        :param end: Last local start date (inclusive)
+        :param type: Activity type key(s), e.g. ``"running"``
+        :param gear: Gear value(s) as passed to the index
+        :param text: Words that must all occur in the activity name
+        :param ranges: ``column=(min, max)`` for numeric columns
+        """
+        filters = []
+        if start is not None or end is not None:
+            filters.append(self._time_filter(start, end))
+        if type is not None:
+            filters.append(self._code_filter("type", type, self.types, self._by_type))
+        if gear is not None:
+            filters.append(self._code_filter("gear", gear, self.gears, self._by_gear))
+        if text:
+            filters.append(self._text_filter(text))
+        for name, (minimum, maximum) in ranges.items():
+            if name not in NUMERIC_FIELDS.names:
+                raise ValueError(f"unknown column: {name!r}")
+            filters.append(self._range_filter(name, minimum, maximum))
+        if not filters:
+            return ActivitySet(self, np.arange(len(self)))
+        filters.sort(key=lambda f: f.size)
+        rows = filters[0].rows().astype(np.int64)
+        for other in filters[1:]:
+            if not len(rows):
+                break
+            rows = rows[other.test(rows)]
+        return ActivitySet(self, rows)
+
+    def get(self, activity_id: int) -> dict[str, Any]:
+        """Return the indexed activity list entry."""
+        return self._activities[activity_id]
+
+    def save(self, path: str | Path) -> None:
+        """Write the columns and the activities to a ``.npz`` file.
+
+        ``.npz`` is appended to ``path`` unless it already ends with it.
+        """
+        arrays: dict[str, Any] = {
+            "types": np.array(self.types, dtype=str),
+            "gears": np.array(self.gears, dtype=str),
+            # the entries themselves, for get() and later add() calls
+            "activities": np.array(
+                json.dumps(list(self._activities.values()), default=json_default)
+            ),
+            "gear_by_id": np.array(json.dumps(list(self._gear.items()))),
+            **self.columns,
+        }
+        np.savez(_npz_path(path), **arrays)
+
+    @classmethod
+    def load(cls, path: str | Path) -> ActivityIndex:
+        """Read an index written by :meth:`save` without rebuilding it.
+
+        ``path`` is completed with ``.npz`` like in :meth:`save`.
+        """
+        index = cls()
+        with np.load(_npz_path(path), allow_pickle=False) as data:
+            index.types = data["types"].tolist()
+            index.gears = data["gears"].tolist()
+            index._activities = {
+                a["activityId"]: a for a in json.loads(str(data["activities"]))
+            }
+            index._gear = dict(json.loads(str(data["gear_by_id"])))
+            index.columns = {
+                name: data[name] for name in data.files if name not in _SAVED_EXTRAS
+            }
+        index._index()
+        return index
+
+
+class ActivitySet:
+    """Rows of an :class:`ActivityIndex` selected by a query."""
+
+    def __init__(self, index: ActivityIndex, rows: np.ndarray) -> None:
+        self.index = index
+        self.positions = rows
+
+    def __len__(self) -> int:
+        return len(self.positions)
+
+    @property
+    def ids(self) -> list[int]:
+        return self.index.columns["activity_id"][self.positions].tolist()
+
+    def column(self, name: str) -> np.ndarray:
+        """Return the values of one column for the selected rows."""
+        return self.index.columns[name][self.positions]
+
+    def rows(self) -> list[dict[str, Any]]:
+        """Return the selected rows as dicts of plain Python values."""
+        index = self.index
+        result = []
+        for row in self.positions.tolist():
+            columns = index.columns
+            values = {
+                "activity_id": int(columns["activity_id"][row]),
+                "start": columns["start"][row].item(),
+                "type": _decode(columns["type"][row], index.types),
+                "gear": _decode(columns["gear"][row], index.gears),
+                "name": str(columns["name"][row]),
+            }
+            for name in NUMERIC_FIELDS.names:
+                value = float(columns[name][row])
+                values[name] = None if np.isnan(value) else value
+            result.append(values)
+        return result
+
+    def aggregate(self, name: str, how: str) -> float | int | None:
+        """Return ``count``/``sum``/``mean``/``min``/``max`` ignoring NaN."""
+        if how not in AGGREGATES:
+            raise ValueError(f"unknown aggregate: {how!r}")
+        values = self.column(name)
+        values = values[~np.isnan(values)]
+        if how == "count":
+            return len(values)
+        if not len(values):
+            return 0.0 if how == "sum" else None
+        return float(getattr(np, how)(values))
+
+    def sum(self, name: str) -> float:
+        return self.aggregate(name, "sum") or 0.0
+
+    def mean(self, name: str) -> float | None:
+        return self.aggregate(name, "mean")
+
+    def min(self, name: str) -> float | None:
+        return self.aggregate(name, "min")
+
+    def max(self, name: str) -> float | None:
+        return self.aggregate(name, "max")
+
+    def group_by(
+        self, key: str, name: str | None = None, how: str = "sum"
+    ) -> dict[Any, float | int]:
+        """Aggregate ``name`` per ``type``/``gear``/``year``/``month``/``week``.
+
+        Without ``name`` the activities are counted. Months and weeks are
+        keyed by their first day (weeks start on Monday).
+        """
+        if key not in GROUP_KEYS:
+            raise ValueError(f"unknown group key: {key!r}")
+        if how not in AGGREGATES:
+            raise ValueError(f"unknown aggregate: {how!r}")
+        labels, keys = self._group_keys(key)
+        if name is None:
+            counts = np.bincount(keys, minlength=len(labels))
+            return {labels[i]: int(c) for i, c in enumerate(counts) if c}
+        values = self.column(name)
+        valid = ~np.isnan(values)
+        keys, values = keys[valid], values[valid]
+        counts = np.bincount(keys, minlength=len(labels))
+        if how == "count":
+            return {labels[i]: int(c) for i, c in enumerate(counts) if c}
+        if how in ("sum", "mean"):
+            sums = np.bincount(keys, weights=values, minlength=len(labels))
+            totals = sums if how == "sum" else sums / np.maximum(counts, 1)
+        else:
+            fill = np.inf if how == "min" else -np.inf
+            totals = np.full(len(labels), fill)
+            getattr(np, "minimum" if how == "min" else "maximum").at(
+                totals, keys, values
+            )
+        return {labels[i]: float(totals[i]) for i in range(len(labels)) if counts[i]}
+
+    def _group_keys(self, key: str) -> tuple[list[Any], np.ndarray]:
+        index = self.index
+        if key in ("type", "gear"):
+            vocabulary = index.types if key == "type" else index.gears
+            codes = self.column(key)
+            # unknown (-1) sorts to the last label
+            return [*vocabulary, None], np.where(codes < 0, len(vocabulary), codes)
+        days = index._days[self.positions]
+        known = ~np.isnat(days)
+        if key == "week":
+            # weeks since Monday 1969-12-29 (1970-01-01 was a Thursday)
+            periods = (days.astype(np.int64) + 3) // 7
+        else:
+            unit = "datetime64[Y]" if key == "year" else "datetime64[M]"
+            periods = days.astype(unit).astype(np.int64)
+        first = int(periods[known].min()) if known.any() else 0
+        span = int(periods[known].max()) - first + 1 if known.any() else 0
+        # activities without a start time get the last label
+        keys = np.where(known, periods - first, span)
+        return [*(_period(key, first + i) for i in range(span)), None], keys
+
+
+def _period(key: str, number: int) -> date | int:
+    """Label of the ``number``-th year/month/week since 1970."""
+    if key == "year":
+        return 1970 + number
+    if key == "month":
+        return date(1970 + number // 12, number % 12 + 1, 1)
+    return date(1969, 12, 29) + timedelta(weeks=number)
+
+
+def _decode(code: int, vocabulary: list[str]) -> str | None:
+    return vocabulary[code] if code >= 0 else None
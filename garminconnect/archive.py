@@ -0,0 +1,126 @@
+"""In-memory extraction of ORIGINAL activity downloads.
+
+``Garmin.download_activity(..., ORIGINAL)`` returns a zip archive holding the
+FIT file recorded by the device. The helpers in this module open that archive
+in memory and hand the contained files out as buffers (or straight to
+:class:`~garminconnect.fit.FitDecoder`) without touching the filesystem.
+"""
+
+from __future__ import annotations
+
+import zipfile
+from collections.abc import Iterable, Iterator
+from io import BytesIO
+from typing import IO, Any
+
+from .fit import FitDecoder  # type: ignore
+
+DEFAULT_CHUNK_SIZE = 1 << 20  # 1 MiB
+
+
+class ArchiveMemberTooLargeError(Exception):
+    """Raised when an archive member exceeds the configured size limit."""
+
+
+def _open_zip(source: bytes | bytearray | memoryview | IO[bytes]) -> zipfile.ZipFile:
+    if isinstance(source, (bytes, bytearray, memoryview)):
+        # BytesIO shares the buffer of an immutable bytes object, no copy
+        fh: IO[bytes] = BytesIO(source)
+    elif hasattr(source, "seekable") and source.seekable():
+        fh = source
+    else:
+        # zipfile needs random access to read the central directory
+        fh = BytesIO(source.read())
+    return zipfile.ZipFile(fh)
+
+
+def _matches(name: str, suffixes: Iterable[str] | None) -> bool:
+    if name.endswith("/"):
+        return False
+    if suffixes is None:
+        return True
+    lowered = name.lower()
+    return any(lowered.endswith(s.lower()) for s in suffixes)
+
+
+def _check_size(info: zipfile.ZipInfo, max_member_size: int | None) -> None:
+    if max_member_size is not None and info.file_size > max_member_size:
+        raise ArchiveMemberTooLargeError(
+            f"{info.filename} is {info.file_size} bytes, "
+            f"limit is {max_member_size} bytes"
+        )
+
+
+def iter_archive(
+    source: bytes | bytearray | memoryview | IO[bytes],
+    suffixes: Iterable[str] | None = (".fit",),
+    max_member_size: int | None = None,
+) -> Iterator[tuple[str, bytes]]:
+    """Yield ``(name, content)`` for every matching member of a zip archive.
+
+    :param source: Raw zip bytes as returned by ``download_activity`` or a
+        binary stream
+    :param suffixes: File extensions to yield (case-insensitive); ``None``
+        yields every member
+    :param max_member_size: (Optional) Refuse members whose uncompressed size
+        exceeds this many bytes
+    """
+
+    with _open_zip(source) as zf:
+        for info in zf.infolist():
+            if not _matches(info.filename, suffixes):
+                continue
+            _check_size(info, max_member_size)
+            yield info.filename, zf.read(info)
+
+
+def iter_archive_chunks(
+    source: bytes | bytearray | memoryview | IO[bytes],
+    suffixes: Iterable[str] | None = (".fit",),
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_member_size: int | None = None,
+) -> Iterator[tuple[str, Iterator[bytes]]]:
+    """Bounded-memory variant of :func:`iter_archive`.
+
+    Each member is yielded as an iterator of decompressed chunks of at most
+    ``chunk_size`` bytes, so very large archives can be processed while only
+    one chunk is held in memory. Each chunk iterator must be consumed before
+    advancing to the next member.
+    """
+
+    if chunk_size <= 0:
+        raise ValueError("chunk_size must be positive")
+
+    def _chunks(zf: zipfile.ZipFile, info: zipfile.ZipInfo) -> Iterator[bytes]:
+        with zf.open(info) as member:
+            while chunk := member.read(chunk_size):
+                yield chunk
+
+    with _open_zip(source) as zf:
+        for info in zf.infolist():
+            if not _matches(info.filename, suffixes):
+                continue
+            _check_size(info, max_member_size)
+            yield info.filename, _chunks(zf, info)
+
+
+def extract_fit(
+    source: bytes | bytearray | memoryview | IO[bytes],
+    max_member_size: int | None = None,
+) -> bytes:
+    """Return the first FIT file contained in an ORIGINAL download."""
+
+    for _name, content in iter_archive(source, max_member_size=max_member_size):
+        return content
+    raise ValueError("archive does not contain a FIT file")
+
+
+def decode_original(
+    source: bytes | bytearray | memoryview | IO[bytes],
+    max_member_size: int | None = None,
+    check_crc: bool = False,
+) -> Iterator[tuple[str, Any]]:
+    """Yield ``(name, FitDecoder)`` for each FIT file in an ORIGINAL download."""
+
+    for name, content in iter_archive(source, max_member_size=max_member_size):
+        yield name, FitDecoder(content, check_crc=check_crc)
@@ -0,0 +1,127 @@
+"""Declarative table of the read endpoints used by :class:`~garminconnect.Garmin`.
+
+Each entry is keyed by the ``Garmin`` method that calls it and records the
+path template, the HTTP method and what the request is keyed by: a single
+calendar date, a date range and/or the user's display name. Callers that work
+on many days (range chunking, caching, sync, instrumentation) can look up an
+endpoint's keys here instead of special casing method names.
+"""
+
+from __future__ import annotations
+
+from typing import Any, NamedTuple
+
+DATE = "date"
+RANGE = "range"
+DISPLAY_NAME = "display_name"
+
+
+class Endpoint(NamedTuple):
+    """Path template (``str.format`` style), HTTP method and request keys."""
+
+    template: str
+    method: str = "GET"
+    keyed_by: tuple[str, ...] = ()
+
+    def path(self, **values: Any) -> str:
+        """Fill in the template; unused values are ignored."""
+        return self.template.format(**values)
+
+
+_WELLNESS = "/wellness-service/wellness"
+_METRICS = "/metrics-service/metrics"
+
+ENDPOINTS: dict[str, Endpoint] = {
+    "get_user_summary": Endpoint(
+        "/usersummary-service/usersummary/daily/{display_name}",
+        keyed_by=(DISPLAY_NAME, DATE),
+    ),
+    "get_steps_data": Endpoint(
+        _WELLNESS + "/dailySummaryChart/{display_name}",
+        keyed_by=(DISPLAY_NAME, DATE),
+    ),
+    "get_floors": Endpoint(
+        _WELLNESS + "/floorsChartData/daily/{cdate}", keyed_by=(DATE,)
+    ),
+    "get_daily_steps": Endpoint(
+        "/usersummary-service/stats/steps/daily/{start}/{end}", keyed_by=(RANGE,)
+    ),
+    "get_heart_rates": Endpoint(
+        _WELLNESS + "/dailyHeartRate/{display_name}", keyed_by=(DISPLAY_NAME, DATE)
+    ),
+    "get_body_composition": Endpoint(
+        "/weight-service/weight/dateRange", keyed_by=(RANGE,)
+    ),
+    "get_weigh_ins": Endpoint(
+        "/weight-service/weight/range/{startdate}/{enddate}", keyed_by=(RANGE,)
+    ),
+    "get_daily_weigh_ins": Endpoint(
+        "/weight-service/weight/dayview/{cdate}", keyed_by=(DATE,)
+    ),
+    "get_body_battery": Endpoint(
+        _WELLNESS + "/bodyBattery/reports/daily", keyed_by=(RANGE,)
+    ),
+    "get_body_battery_events": Endpoint(
+        _WELLNESS + "/bodyBattery/events/{cdate}", keyed_by=(DATE,)
+    ),
+    "get_blood_pressure": Endpoint(
+        "/bloodpressure-service/bloodpressure/range/{startdate}/{enddate}",
+        keyed_by=(RANGE,),
+    ),
+    "get_max_metrics": Endpoint(
+        _METRICS + "/maxmet/daily/{cdate}/{cdate}", keyed_by=(DATE,)
+    ),
+    "get_hydration_data": Endpoint(
+        "/usersummary-service/usersummary/hydration/daily/{cdate}", keyed_by=(DATE,)
+    ),
+    "get_respiration_data": Endpoint(
+        _WELLNESS + "/daily/respiration/{cdate}", keyed_by=(DATE,)
+    ),
+    "get_spo2_data": Endpoint(_WELLNESS + "/daily/spo2/{cdate}", keyed_by=(DATE,)),
+    "get_intensity_minutes_data": Endpoint(
+        _WELLNESS + "/daily/im/{cdate}", keyed_by=(DATE,)
+    ),
+    "get_all_day_stress": Endpoint(
+        _WELLNESS + "/dailyStress/{cdate}", keyed_by=(DATE,)
+    ),
+    "get_all_day_events": Endpoint(
+        _WELLNESS + "/dailyEvents?calendarDate={cdate}", keyed_by=(DATE,)
+    ),
+    "get_sleep_data": Endpoint(
+        _WELLNESS + "/dailySleepData/{display_name}", keyed_by=(DISPLAY_NAME, DATE)
+    ),
+    "get_stress_data": Endpoint(_WELLNESS + "/dailyStress/{cdate}", keyed_by=(DATE,)),
+    "get_lifestyle_logging_data": Endpoint(
+        "/lifestylelogging-service/dailyLog/{cdate}", keyed_by=(DATE,)
+    ),
+    "get_rhr_day": Endpoint(
+        "/userstats-service/wellness/daily/{display_name}",
+        keyed_by=(DISPLAY_NAME, DATE),
+    ),
+    "get_hrv_data": Endpoint("/hrv-service/hrv/{cdate}", keyed_by=(DATE,)),
+    "get_training_readiness": Endpoint(
+        _METRICS + "/trainingreadiness/{cdate}", keyed_by=(DATE,)
+    ),
+    "get_training_status": Endpoint(
+        _METRICS + "/trainingstatus/aggregated/{cdate}", keyed_by=(DATE,)
+    ),
+    "get_fitnessage_data": Endpoint(
+        "/fitnessage-service/fitnessage/{cdate}", keyed_by=(DATE,)
+    ),
+    "get_personal_record": Endpoint(
+        "/personalrecord-service/personalrecord/prs/{display_name}",
+        keyed_by=(DISPLAY_NAME,),
+    ),
+    "get_devices": Endpoint("/device-service/deviceregistration/devices"),
+    "get_earned_badges": Endpoint("/badge-service/badge/earned"),
+    "get_available_badges": Endpoint("/badge-service/badge/available"),
+}
+
+
+def endpoints_keyed_by(*keys: str) -> frozenset[str]:
+    """Return the names of the endpoints keyed by exactly ``keys`` (any order)."""
+
+    wanted = set(keys)
+    return frozenset(
+        name for name, endpoint in ENDPOINTS.items() if set(endpoint.keyed_by) == wanted
+    )
@@ -0,0 +1,490 @@
+"""Columnar export of activities and daily metrics to Parquet and Arrow.
+
+Each dataset has a fixed :class:`ExportSchema`: a column name, the dotted
+path read from the API response (see :mod:`garminconnect.projection`) and
+an Arrow type, so files written months apart can be read as one dataset.
+:class:`ParquetExporter` streams records into Hive-style partitions::
+
+    <root>/<dataset>/account=<account>/year=<YYYY>/month=<MM>/part-0.parquet
+
+buffering at most ``row_group_size`` rows per partition before writing a
+row group, so exporting years of activities needs little memory::
+
+    export_activities(api, "export", "2020-01-01", "2024-12-31", account="me")
+    export_daily(api.get_sleep_data, "export", "sleep", "2024-01-01", "2024-12-31")
+    table = read_dataset("export", "activities")
+    df = table.to_pandas()  # or polars.from_arrow(table)
+
+Requires pyarrow (``pip install garminconnect[export]``).
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from collections.abc import Callable, Iterable, Iterator
+from datetime import date, datetime, timedelta, timezone
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from .projection import Projection
+
+if TYPE_CHECKING:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    from . import Garmin
+else:
+    try:
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+    except ImportError:  # pragma: no cover - optional dependency
+        pa = pq = None
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_ROW_GROUP_SIZE = 10_000
+_PART = "part-0.parquet"
+
+
+def _require_pyarrow() -> None:
+    if pa is None:
+        raise ImportError(
+            "pyarrow is required for Parquet/Arrow export - install it with: "
+            "pip install pyarrow or pip install garminconnect[export]"
+        )
+
+
+def _to_date(value: Any) -> date | None:
+    if value is None or isinstance(value, date):
+        return value
+    return date.fromisoformat(str(value)[:10])
+
+
+def _to_timestamp(value: Any) -> datetime | None:
+    if value is None or isinstance(value, datetime):
+        return value
+    if isinstance(value, int | float):  # epoch milliseconds
+        return datetime.fromtimestamp(value / 1000, timezone.utc).replace(tzinfo=None)
+    return datetime.fromisoformat(str(value).replace("T", " ").removesuffix(".0"))
+
+
+# Arrow type per schema type name and the conversion applied to each value
+_TYPES: dict[str, tuple[Callable[[], Any], Callable[[Any], Any] | None]] = {
+    "int64": (lambda: pa.int64(), int),
+    "float64": (lambda: pa.float64(), None),
+    "string": (lambda: pa.string(), None),
+    "bool": (lambda: pa.bool_(), None),
+    "date": (lambda: pa.date32(), _to_date),
+    "timestamp": (lambda: pa.timestamp("s"), _to_timestamp),
+}
+
+
+class Column(NamedTuple):
+    """Column name, dotted source path and type name (a key of ``_TYPES``)."""
+
+    name: str
+    path: str
+    type: str = "float64"
+
+
+class ExportSchema:
+    """Stable column layout of one dataset.
+
+    :param date_column: Column whose value picks the year/month partition
+    """
+
+    def __init__(self, name: str, columns: Iterable[Column], date_column: str) -> None:
+        self.name = name
+        self.columns = tuple(columns)
+        unknown = {c.type for c in self.columns} - set(_TYPES)
+        if unknown:
+            raise ValueError(f"unknown column types: {sorted(unknown)}")
+        self.date_column = date_column
+        self.projection = Projection({c.name: c.path for c in self.columns})
+        self._date_index = self.projection.names.index(date_column)
+        self._arrow_schema: pa.Schema | None = None
+
+    @property
+    def names(self) -> tuple[str, ...]:
+        return self.projection.names
+
+    def arrow_schema(self) -> pa.Schema:
+        _require_pyarrow()
+        if self._arrow_schema is None:
+            self._arrow_schema = pa.schema(
+                [(c.name, _TYPES[c.type][0]()) for c in self.columns]
+            )
+        return self._arrow_schema
+
+    def row(self, record: Any) -> tuple[Any, ...]:
+        """Project one API record to a tuple of converted column values."""
+        values = self.projection.values(record)
+        return tuple(
+            convert(value) if convert is not None and value is not None else value
+            for value, convert in zip(
+                values, (_TYPES[c.type][1] for c in self.columns), strict=True
+            )
+        )
+
+    def day(self, row: tuple[Any, ...]) -> date | None:
+        """Return the day of a row's date column, or None without a date."""
+        value = row[self._date_index]
+        return value.date() if isinstance(value, datetime) else value
+
+    def partition(self, row: tuple[Any, ...]) -> tuple[int, int] | None:
+        """Return the (year, month) of a row, or None without a date."""
+        day = row[self._date_index]
+        return (day.year, day.month) if day is not None else None
+
+    def to_arrow(self, rows: list[tuple[Any, ...]]) -> pa.Table:
+        """Build a table from projected rows, one contiguous array per column."""
+        schema = self.arrow_schema()
+        columns = list(zip(*rows, strict=True)) if rows else [()] * len(self.columns)
+        arrays = [
+            pa.array(values, type=field.type)
+            for values, field in zip(columns, schema, strict=True)
+        ]
+        return pa.Table.from_arrays(arrays, schema=schema)
+
+
+ACTIVITIES = ExportSchema(
+    "activities",
+    [
+        Column("activity_id", "activityId", "int64"),
+        Column("activity_name", "activityName", "string"),
+        Column("activity_type", "activityType.typeKey", "string"),
+        Column("start_time_local", "startTimeLocal", "timestamp"),
+        Column("start_time_gmt", "startTimeGMT", "timestamp"),
+        Column("duration", "duration"),
+        Column("moving_duration", "movingDuration"),
+        Column("distance", "distance"),
+        Column("elevation_gain", "elevationGain"),
+        Column("calories", "calories"),
+        Column("average_hr", "averageHR"),
+        Column("max_hr", "maxHR"),
+        Column("average_speed", "averageSpeed"),
+        Column("aerobic_training_effect", "aerobicTrainingEffect"),
+        Column("anaerobic_training_effect", "anaerobicTrainingEffect"),
+        Column("training_load", "activityTrainingLoad"),
+        Column("steps", "steps", "int64"),
+        Column("device_id", "deviceId", "int64"),
+    ],
+    date_column="start_time_local",
+)
+
+DAILY_SUMMARY = ExportSchema(
+    "daily_summary",
+    [
+        Column("calendar_date", "calendarDate", "date"),
+        Column("total_steps", "totalSteps", "int64"),
+        Column("total_distance_meters", "totalDistanceMeters"),
+        Column("total_kilocalories", "totalKilocalories"),
+        Column("active_kilocalories", "activeKilocalories"),
+        Column("floors_ascended", "floorsAscended"),
+        Column("resting_heart_rate", "restingHeartRate", "int64"),
+        Column("min_heart_rate", "minHeartRate", "int64"),
+        Column("max_heart_rate", "maxHeartRate", "int64"),
+        Column("average_stress_level", "averageStressLevel", "int64"),
+        Column("max_stress_level", "maxStressLevel", "int64"),
+        Column("body_battery_highest", "bodyBatteryHighestValue", "int64"),
+        Column("body_battery_lowest", "bodyBatteryLowestValue", "int64"),
+        Column("moderate_intensity_minutes", "moderateIntensityMinutes", "int64"),
+        Column("vigorous_intensity_minutes", "vigorousIntensityMinutes", "int64"),
+    ],
+    date_column="calendar_date",
+)
+
+SLEEP = ExportSchema(
+    "sleep",
+    [
+        Column("calendar_date", "dailySleepDTO.calendarDate", "date"),
+        Column("sleep_start", "dailySleepDTO.sleepStartTimestampLocal", "timestamp"),
+        Column("sleep_end", "dailySleepDTO.sleepEndTimestampLocal", "timestamp"),
+        Column("sleep_seconds", "dailySleepDTO.sleepTimeSeconds", "int64"),
+        Column("deep_sleep_seconds", "dailySleepDTO.deepSleepSeconds", "int64"),
+        Column("light_sleep_seconds", "dailySleepDTO.lightSleepSeconds", "int64"),
+        Column("rem_sleep_seconds", "dailySleepDTO.remSleepSeconds", "int64"),
+        Column("awake_seconds", "dailySleepDTO.awakeSleepSeconds", "int64"),
+        Column("sleep_score", "sleepScores.overall.value", "int64"),
+        Column("avg_sleep_stress", "dailySleepDTO.avgSleepStress"),
+        Column("avg_overnight_hrv", "avgOvernightHrv"),
+        Column("resting_heart_rate", "restingHeartRate", "int64"),
+    ],
+    date_column="calendar_date",
+)
+
+HRV = ExportSchema(
+    "hrv",
+    [
+        Column("calendar_date", "hrvSummary.calendarDate", "date"),
+        Column("last_night_avg", "hrvSummary.lastNightAvg"),
+        Column("last_night_5min_high", "hrvSummary.lastNight5MinHigh"),
+        Column("weekly_avg", "hrvSummary.weeklyAvg"),
+        Column("baseline_low", "hrvSummary.baseline.balancedLow"),
+        Column("baseline_upper", "hrvSummary.baseline.balancedUpper"),
+        Column("status", "hrvSummary.status", "string"),
+    ],
+    date_column="calendar_date",
+)
+
+SCHEMAS = {s.name: s for s in (ACTIVITIES, DAILY_SUMMARY, SLEEP, HRV)}
+
+
+class ParquetExporter:
+    """Stream records of one dataset into partitioned Parquet files.
+
+    Rows are buffered per (year, month) partition and written as a row group
+    once ``row_group_size`` rows are pending, into a hidden temporary file.
+    :meth:`close` then merges each partition with its existing files: stored
+    rows inside the exported range are replaced, the others are kept, and
+    the result becomes the partition's ``part-0.parquet``. The range is
+    ``start..end`` (either end open when None) when given, otherwise the days
+    of the written records. Records without a date are skipped. Leaving the
+    ``with`` block on an exception calls :meth:`abort` instead, so a failed
+    export leaves the stored files untouched.
+    """
+
+    def __init__(
+        self,
+        root: str | os.PathLike[str],
+        schema: ExportSchema | str,
+        account: str = "default",
+        row_group_size: int = DEFAULT_ROW_GROUP_SIZE,
+        compression: str = "zstd",
+        start: date | str | None = None,
+        end: date | str | None = None,
+    ) -> None:
+        _require_pyarrow()
+        if row_group_size < 1:
+            raise ValueError("row_group_size must be at least 1")
+        self.schema = SCHEMAS[schema] if isinstance(schema, str) else schema
+        self.root = Path(root).expanduser()
+        self.account = account
+        self.row_group_size = row_group_size
+        self.compression = compression
+        self.start = _to_date(start)
+        self.end = _to_date(end)
+        self.rows_written = 0
+        self.rows_kept = 0
+        self.skipped = 0
+        self._pending: dict[tuple[int, int], list[tuple[Any, ...]]] = {}
+        self._writers: dict[tuple[int, int], pq.ParquetWriter] = {}
+        self._days: dict[tuple[int, int], set[date]] = {}
+
+    def __enter__(self) -> ParquetExporter:
+        return self
+
+    def __exit__(self, exc_type: object, *exc: object) -> None:
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def partition_dir(self, year: int, month: int) -> Path:
+        return (
+            self.root
+            / self.schema.name
+            / f"account={self.account}"
+            / f"year={year}"
+            / f"month={month:02d}"
+        )
+
+    def write(self, records: Iterable[Any]) -> int:
+        """Project and buffer ``records``; return how many were accepted."""
+        accepted = 0
+        for record in records:
+            if record is None:
+                continue
+            row = self.schema.row(record)
+            day = self.schema.day(row)
+            if day is None:
+                self.skipped += 1
+                continue
+            key = (day.year, day.month)
+            pending = self._pending.setdefault(key, [])
+            pending.append(row)
+            if self.start is None and self.end is None:
+                self._days.setdefault(key, set()).add(day)
+            accepted += 1
+            if len(pending) >= self.row_group_size:
+                self._flush(key)
+        return accepted
+
+    def _flush(self, key: tuple[int, int]) -> None:
+        rows = self._pending.pop(key, None)
+        if not rows:
+            return
+        self._writer(key).write_table(self.schema.to_arrow(rows))
+        self.rows_written += len(rows)
+
+    def _writer(self, key: tuple[int, int]) -> pq.ParquetWriter:
+        writer = self._writers.get(key)
+        if writer is None:
+            directory = self.partition_dir(*key)
+            directory.mkdir(parents=True, exist_ok=True)
+            # the leading dot hides the file from read_dataset until close()
+            writer = pq.ParquetWriter(
+                directory / f".{_PART}.tmp",
+                self.schema.arrow_schema(),
+                compression=self.compression,
+            )
+            self._writers[key] = writer
+        return writer
+
+    def _stored_in_range(self) -> list[tuple[int, int]]:
+        """Existing partitions overlapping an explicit ``start..end``."""
+        if self.start is None and self.end is None:
+            return []
+        keys = []
+        account = self.root / self.schema.name / f"account={self.account}"
+        for directory in account.glob("year=*/month=*"):
+            first = date(int(directory.parent.name[5:]), int(directory.name[6:]), 1)
+            last = (first + timedelta(days=31)).replace(day=1) - timedelta(days=1)
+            if (self.start is None or last >= self.start) and (
+                self.end is None or first <= self.end
+            ):
+                keys.append((first.year, first.month))
+        return keys
+
+    def _replaced(self, key: tuple[int, int], days: pa.Array) -> pa.Array:
+        """Mask of the stored ``days`` that the export replaces."""
+        import pyarrow.compute as pc
+
+        if self.start is None and self.end is None:
+            exported = pa.array(sorted(self._days.get(key, ())), pa.date32())
+            return pc.is_in(days, value_set=exported)
+        mask = pc.is_valid(days)
+        if self.start is not None:
+            mask = pc.and_kleene(mask, pc.greater_equal(days, pa.scalar(self.start)))
+        if self.end is not None:
+            mask = pc.and_kleene(mask, pc.less_equal(days, pa.scalar(self.end)))
+        return mask
+
+    def _finish(self, key: tuple[int, int], writer: pq.ParquetWriter) -> None:
+        import pyarrow.compute as pc
+
+        directory = self.partition_dir(*key)
+        old = sorted(directory.glob("*.parquet"))
+        schema = self.schema.arrow_schema()
+        for path in old:
+            stored = pq.read_table(path, schema=schema)
+            days = pc.cast(stored.column(self.schema.date_column), pa.date32())
+            kept = stored.filter(pc.invert(self._replaced(key, days)))
+            if kept.num_rows:
+                writer.write_table(kept)
+                self.rows_kept += kept.num_rows
+        writer.close()
+        (directory / f".{_PART}.tmp").replace(directory / _PART)
+        for path in old:
+            if path.name != _PART:
+                path.unlink()
+
+    def close(self) -> None:
+        """Write the buffered rows and merge every partition with its files."""
+        for key in list(self._pending):
+            self._flush(key)
+        # drops rows of the range from partitions without any new record
+        for key in self._stored_in_range():
+            self._writer(key)
+        for key, writer in self._writers.items():
+            self._finish(key, writer)
+        self._writers.clear()
+        self._days.clear()
+
+    def abort(self) -> None:
+        """Drop the buffered and written rows; the stored files are kept."""
+        for key, writer in self._writers.items():
+            writer.close()
+            (self.partition_dir(*key) / f".{_PART}.tmp").unlink(missing_ok=True)
+        self._writers.clear()
+        self._pending.clear()
+        self._days.clear()
+
+
+def to_arrow(records: Iterable[Any], schema: ExportSchema | str) -> pa.Table:
+    """Project records into one Arrow table without writing files.
+
+    ``table.to_pandas()`` and ``polars.from_arrow(table)`` reuse the column
+    buffers for numeric columns without nulls.
+    """
+    _require_pyarrow()
+    schema = SCHEMAS[schema] if isinstance(schema, str) else schema
+    return schema.to_arrow([schema.row(r) for r in records if r is not None])
+
+
+def read_dataset(
+    root: str | os.PathLike[str], dataset: str, account: str | None = None
+) -> pa.Table:
+    """Read an exported dataset (optionally one account) as an Arrow table."""
+    _require_pyarrow()
+    import pyarrow.dataset as ds
+
+    schema = SCHEMAS[dataset].arrow_schema()
+    partitioning = ds.partitioning(
+        pa.schema(
+            [("account", pa.string()), ("year", pa.int32()), ("month", pa.int32())]
+        ),
+        flavor="hive",
+    )
+    data = ds.dataset(
+        Path(root).expanduser() / dataset,
+        format="parquet",
+        partitioning=partitioning,
+        schema=pa.unify_schemas([schema, partitioning.schema]),
+    )
+    filter_ = ds.field("account") == account if account is not None else None
+    return data.to_table(filter=filter_)
+
+
+def iter_days(
+    fetch: Callable[[str], Any], startdate: str | date, enddate: str | date
+) -> Iterator[Any]:
+    """Yield ``fetch(cdate)`` for every day from ``startdate`` to ``enddate``.
+
+    ``fetch`` is a per-day getter such as ``api.get_sleep_data`` or a reader
+    over a local store.
+    """
+    start = date.fromisoformat(str(startdate)[:10])
+    end = date.fromisoformat(str(enddate)[:10])
+    for offset in range((end - start).days + 1):
+        yield fetch((start + timedelta(days=offset)).isoformat())
+
+
+def export_activities(
+    api: Garmin,
+    root: str | os.PathLike[str],
+    startdate: str,
+    enddate: str | None = None,
+    account: str = "default",
+    **kwargs: Any,
+) -> int:
+    """Export the activity list of a date range; return the rows written.
+
+    Stored activities of the range that no longer exist are dropped, those
+    outside it are kept.
+    """
+    kwargs.setdefault("start", startdate)
+    kwargs.setdefault("end", enddate)
+    with ParquetExporter(root, ACTIVITIES, account, **kwargs) as exporter:
+        exporter.write(api.iter_activities_by_date(startdate, enddate))
+    logger.debug("Exported %d activities", exporter.rows_written)
+    return exporter.rows_written
+
+
+def export_daily(
+    fetch: Callable[[str], Any],
+    root: str | os.PathLike[str],
+    dataset: str,
+    startdate: str | date,
+    enddate: str | date,
+    account: str = "default",
+    **kwargs: Any,
+) -> int:
+    """Export one per-day endpoint (``daily_summary``, ``sleep``, ``hrv``)."""
+    kwargs.setdefault("start", startdate)
+    kwargs.setdefault("end", enddate)
+    with ParquetExporter(root, dataset, account, **kwargs) as exporter:
+        exporter.write(iter_days(fetch, startdate, enddate))
+    logger.debug("Exported %d %s rows", exporter.rows_written, dataset)
+    return exporter.rows_written
@@ -1,9 +1,14 @@
 # type: ignore  # Complex binary data handling - mypy errors expected
+import mmap
 import time
+from array import array
+from collections.abc import Iterator
+from contextlib import contextmanager
 from datetime import datetime
 from io import BytesIO
-from struct import pack, unpack
-from typing import Any
+from pathlib import Path
+from struct import Struct, pack, unpack, unpack_from
+from typing import Any, NamedTuple
 
 
 def _calcCRC(crc: int, byte: int) -> int:
@@ -515,3 +520,360 @@ class FitEncoderWeight(FitEncoder):
 
         header = self.record_header(lmsg_type=self.LMSG_TYPE_WEIGHT_SCALE)
         self.buf.write(header + values)
+
+
+# FIT decoding
+
+FIT_EPOCH_OFFSET = 631065600  # seconds between UNIX epoch and Dec 31 1989 UTC
+
+_HEADER_TIMESTAMP_MASK = 0x1F
+_FIELD_TIMESTAMP = 253
+
+# base type number -> (struct code, size, invalid value)
+_BASE_TYPES = {
+    0x00: ("B", 1, 0xFF),
+    0x01: ("b", 1, 0x7F),
+    0x02: ("B", 1, 0xFF),
+    0x83: ("h", 2, 0x7FFF),
+    0x84: ("H", 2, 0xFFFF),
+    0x85: ("i", 4, 0x7FFFFFFF),
+    0x86: ("I", 4, 0xFFFFFFFF),
+    0x07: ("s", 1, ""),
+    0x88: ("f", 4, None),
+    0x89: ("d", 8, None),
+    0x0A: ("B", 1, 0x00),
+    0x8B: ("H", 2, 0x0000),
+    0x8C: ("I", 4, 0x00000000),
+    0x0D: ("s", 1, None),
+    0x8E: ("q", 8, 0x7FFFFFFFFFFFFFFF),
+    0x8F: ("Q", 8, 0xFFFFFFFFFFFFFFFF),
+    0x90: ("Q", 8, 0x0000000000000000),
+}
+
+_SEMICIRCLES_TO_DEGREES = 180.0 / 2**31
+
+
+class FitDecodeError(Exception):
+    """Raised when a FIT file cannot be decoded."""
+
+
+class FitDefinition(NamedTuple):
+    """Decoded definition message.
+
+    ``fields`` holds ``(field_num, size, base_type)`` tuples and
+    ``developer_fields`` holds ``(field_num, size, developer_data_index)``.
+    """
+
+    local_type: int
+    global_num: int
+    big_endian: bool
+    fields: tuple[tuple[int, int, int], ...]
+    developer_fields: tuple[tuple[int, int, int], ...]
+
+
+class FitDataMessage(NamedTuple):
+    """Decoded data message.
+
+    ``fields`` maps field numbers to raw (unscaled) values; invalid values
+    are ``None``. ``developer_fields`` is keyed by the developer field name
+    when a matching ``field_description`` message was seen, otherwise by
+    ``(developer_data_index, field_num)``. ``timestamp`` is the UNIX time of
+    the message, either from field 253 or a compressed timestamp header.
+    """
+
+    local_type: int
+    global_num: int
+    timestamp: int | None
+    fields: dict[int, Any]
+    developer_fields: dict[Any, Any]
+
+
+class _Layout:
+    """Compiled struct layout for one local message type."""
+
+    __slots__ = ("definition", "struct", "slices", "dev_slices")
+
+    def __init__(self, definition: FitDefinition, dev_types: dict) -> None:
+        self.definition = definition
+        fmt = [">" if definition.big_endian else "<"]
+        self.slices = []
+        self.dev_slices = []
+        pos = 0
+        for num, size, base_type in definition.fields:
+            code, width, invalid = _BASE_TYPES.get(base_type, ("s", 1, None))
+            pos = self._add(fmt, num, size, code, width, invalid, pos, self.slices)
+        for num, size, dev_index in definition.developer_fields:
+            code, width, invalid = _BASE_TYPES.get(
+                dev_types.get((dev_index, num), 0x0D), ("s", 1, None)
+            )
+            pos = self._add(
+                fmt, (dev_index, num), size, code, width, invalid, pos, self.dev_slices
+            )
+        self.struct = Struct("".join(fmt))
+
+    @staticmethod
+    def _add(
+        fmt: list,
+        key: Any,
+        size: int,
+        code: str,
+        width: int,
+        invalid: Any,
+        pos: int,
+        out: list,
+    ) -> int:
+        if code == "s" or size % width:
+            # strings, byte arrays and malformed sizes are kept as raw bytes
+            fmt.append(f"{size}s")
+            out.append((key, pos, 0, invalid == ""))
+            return pos + 1
+        count = size // width
+        fmt.append(f"{count}{code}")
+        out.append((key, pos, count, invalid))
+        return pos + count
+
+    def unpack(self, buf: Any, offset: int) -> tuple[dict, dict]:
+        values = self.struct.unpack_from(buf, offset)
+        return _pick(values, self.slices), _pick(values, self.dev_slices)
+
+
+def _pick(values: tuple, slices: list) -> dict:
+    out = {}
+    for key, pos, count, invalid in slices:
+        if count == 1:
+            value = values[pos]
+            if value == invalid or value != value:  # NaN marks invalid floats
+                value = None
+        elif count == 0:
+            value = values[pos]
+            if invalid:  # string field
+                value = value.split(b"\x00", 1)[0].decode("utf-8", "replace") or None
+        else:
+            value = values[pos : pos + count]
+            if all(v == invalid for v in value):
+                value = None
+        out[key] = value
+    return out
+
+
+class FitRecords:
+    """Columnar view of the ``record`` messages of an activity.
+
+    Every attribute is an :class:`array.array` of equal length, so the
+    columns can be handed to NumPy with ``numpy.frombuffer`` without a copy.
+    Integer columns keep the FIT invalid value (0xFF for ``heart_rate`` and
+    ``cadence``, 0xFFFF for ``power``); float columns use NaN.
+    """
+
+    __slots__ = (
+        "timestamp",
+        "heart_rate",
+        "cadence",
+        "power",
+        "speed",
+        "distance",
+        "altitude",
+        "latitude",
+        "longitude",
+    )
+
+    def __init__(self) -> None:
+        self.timestamp = array("q")  # UNIX seconds
+        self.heart_rate = array("B")  # bpm
+        self.cadence = array("B")  # rpm / spm
+        self.power = array("H")  # watts
+        self.speed = array("d")  # m/s
+        self.distance = array("d")  # meters
+        self.altitude = array("d")  # meters
+        self.latitude = array("d")  # degrees
+        self.longitude = array("d")  # degrees
+
+    def __len__(self) -> int:
+        return len(self.timestamp)
+
+    def columns(self) -> dict[str, array]:
+        """Return the columns keyed by name."""
+        return {name: getattr(self, name) for name in self.__slots__}
+
+
+class FitDecoder(Fit):
+    """Streaming decoder for FIT files.
+
+    Works directly over any buffer (``bytes``, ``bytearray``, ``memoryview``
+    or ``mmap``); messages are unpacked in place with ``struct.unpack_from``
+    so the file contents are never copied. Chained FIT files are decoded in
+    sequence.
+    """
+
+    GMSG_RECORD = 20
+    GMSG_DEVELOPER_DATA_ID = 207
+    GMSG_FIELD_DESCRIPTION = 206
+
+    def __init__(self, data: Any, check_crc: bool = False) -> None:
+        self.buf = memoryview(data).cast("B")
+        self.check_crc = check_crc
+
+    @classmethod
+    @contextmanager
+    def open(cls, path: str | Path, check_crc: bool = False) -> Iterator["FitDecoder"]:
+        """Memory-map the FIT file at ``path`` and decode it without reading it."""
+        with (
+            open(path, "rb") as fh,
+            mmap.mmap(fh.fileno(), 0, access=mmap.ACCESS_READ) as mm,
+        ):
+            decoder = cls(mm, check_crc=check_crc)
+            try:
+                yield decoder
+            finally:
+                decoder.buf.release()
+
+    def _read_header(self, offset: int) -> tuple[int, int]:
+        buf = self.buf
+        if len(buf) - offset < self.HEADER_SIZE:
+            raise FitDecodeError("truncated FIT header")
+        header_size = buf[offset]
+        if header_size < self.HEADER_SIZE or bytes(buf[offset + 8 : offset + 12]) != (
+            b".FIT"
+        ):
+            raise FitDecodeError("not a FIT file")
+        (data_size,) = unpack_from("<I", buf, offset + 4)
+        end = offset + header_size + data_size
+        if end + 2 > len(buf):
+            raise FitDecodeError("truncated FIT file")
+        if self.check_crc:
+            crc = 0
+            for byte in buf[offset:end]:
+                crc = _calcCRC(crc, byte)
+            if crc != unpack_from("<H", buf, end)[0]:
+                raise FitDecodeError("FIT file CRC mismatch")
+        return offset + header_size, end
+
+    def messages(self) -> Iterator[FitDefinition | FitDataMessage]:
+        """Yield definition and data messages in file order."""
+        buf = self.buf
+        offset = 0
+        while offset < len(buf):
+            pos, end = self._read_header(offset)
+            yield from self._iter_messages(pos, end)
+            offset = end + 2  # skip file CRC
+
+    def _iter_messages(
+        self, pos: int, end: int
+    ) -> Iterator[FitDefinition | FitDataMessage]:
+        buf = self.buf
+        layouts: dict[int, _Layout] = {}
+        dev_types: dict[tuple[int, int], int] = {}
+        dev_names: dict[tuple[int, int], str] = {}
+        last_timestamp = 0
+        while pos < end:
+            header = buf[pos]
+            pos += 1
+            if header & 0x80:
+                # compressed timestamp header
+                local_type = (header >> 5) & 0x03
+                offset = header & _HEADER_TIMESTAMP_MASK
+                timestamp = (last_timestamp & ~_HEADER_TIMESTAMP_MASK) + offset
+                if offset < (last_timestamp & _HEADER_TIMESTAMP_MASK):
+                    timestamp += _HEADER_TIMESTAMP_MASK + 1
+                last_timestamp = timestamp
+            elif header & 0x40:
+                definition, pos = self._read_definition(header, pos)
+                layouts[definition.local_type] = _Layout(definition, dev_types)
+                yield definition
+                continue
+            else:
+                local_type = header & 0x0F
+                timestamp = None
+
+            layout = layouts.get(local_type)
+            if layout is None:
+                raise FitDecodeError(f"missing definition for local type {local_type}")
+            fields, dev_fields = layout.unpack(buf, pos)
+            pos += layout.struct.size
+            if timestamp is None:
+                timestamp = fields.get(_FIELD_TIMESTAMP)
+                if timestamp is not None:
+                    last_timestamp = timestamp
+            elif _FIELD_TIMESTAMP in fields and fields[_FIELD_TIMESTAMP] is not None:
+                last_timestamp = timestamp = fields[_FIELD_TIMESTAMP]
+
+            global_num = layout.definition.global_num
+            if global_num == self.GMSG_FIELD_DESCRIPTION:
+                key = (fields.get(0), fields.get(1))
+                dev_types[key] = fields.get(2) or 0x0D
+                if fields.get(3):
+                    dev_names[key] = fields[3]
+            if dev_fields and dev_names:
+                dev_fields = {dev_names.get(k, k): v for k, v in dev_fields.items()}
+
+            yield FitDataMessage(
+                local_type,
+                global_num,
+                None if timestamp is None else timestamp + FIT_EPOCH_OFFSET,
+                fields,
+                dev_fields,
+            )
+
+    def _read_definition(self, header: int, pos: int) -> tuple[FitDefinition, int]:
+        buf = self.buf
+        big_endian = buf[pos + 1] == 1
+        (global_num,) = unpack_from(">H" if big_endian else "<H", buf, pos + 2)
+        num_fields = buf[pos + 4]
+        pos += 5
+        fields = tuple(
+            (buf[p], buf[p + 1], buf[p + 2])
+            for p in range(pos, pos + 3 * num_fields, 3)
+        )
+        pos += 3 * num_fields
+        dev_fields: tuple[tuple[int, int, int], ...] = ()
+        if header & 0x20:
+            num_dev = buf[pos]
+            pos += 1
+            dev_fields = tuple(
+                (buf[p], buf[p + 1], buf[p + 2])
+                for p in range(pos, pos + 3 * num_dev, 3)
+            )
+            pos += 3 * num_dev
+        definition = FitDefinition(
+            header & 0x0F, global_num, big_endian, fields, dev_fields
+        )
+        return definition, pos
+
+    def records(self) -> FitRecords:
+        """Materialize all ``record`` messages as columnar arrays."""
+        out = FitRecords()
+        nan = float("nan")
+        append_ts = out.timestamp.append
+        append_hr = out.heart_rate.append
+        append_cad = out.cadence.append
+        append_pwr = out.power.append
+        append_spd = out.speed.append
+        append_dist = out.distance.append
+        append_alt = out.altitude.append
+        append_lat = out.latitude.append
+        append_lon = out.longitude.append
+        for msg in self.messages():
+            if (
+                not isinstance(msg, FitDataMessage)
+                or msg.global_num != self.GMSG_RECORD
+            ):
+                continue
+            f = msg.fields
+            append_ts(msg.timestamp if msg.timestamp is not None else -1)
+            hr = f.get(3)
+            append_hr(0xFF if hr is None else hr)
+            cad = f.get(4)
+            append_cad(0xFF if cad is None else cad)
+            pwr = f.get(7)
+            append_pwr(0xFFFF if pwr is None else pwr)
+            spd = f.get(73, f.get(6))
+            append_spd(nan if spd is None else spd / 1000.0)
+            dist = f.get(5)
+            append_dist(nan if dist is None else dist / 100.0)
+            alt = f.get(78, f.get(2))
+            append_alt(nan if alt is None else alt / 5.0 - 500.0)
+            lat = f.get(0)
+            append_lat(nan if lat is None else lat * _SEMICIRCLES_TO_DEGREES)
+            lon = f.get(1)
+            append_lon(nan if lon is None else lon * _SEMICIRCLES_TO_DEGREES)
+        return out
@@ -0,0 +1,440 @@
+"""Time in heart-rate zones, intensity minutes and bouts over date ranges.
+
+A :class:`ZoneModel` turns a heart-rate profile into bpm limits: percent of
+maximum heart rate, percent of heart-rate reserve (Karvonen) or percent of
+the lactate threshold heart rate from ``get_lactate_threshold``.
+:class:`IntensityEngine` evaluates it over the all-day heart rate of many
+days at once::
+
+    model = ZoneModel.percent_reserve(max_hr=190, resting_hr=50)
+    engine = IntensityEngine(model)
+    days = engine.from_api(api, date(2024, 3, 1), date(2024, 3, 31))
+    days[date(2024, 3, 5)].intensity_minutes
+    engine.summary(days.values())["vigorous_minutes"]
+
+The samples of all requested days are concatenated and classified with
+NumPy in one pass: time per zone, moderate and vigorous time and bouts
+(contiguous runs at moderate intensity or above, split at gaps and at
+midnight). Results are cached per day, in memory and optionally in a
+:class:`~garminconnect.sync.Sink`, so a range only computes (and fetches)
+the days it has not seen. NumPy is an optional dependency - install it
+with: pip install numpy or: pip install garminconnect[analysis]
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Iterable, Mapping
+from datetime import date, timedelta
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from . import GarminConnectConnectionError
+from .series import HeartRateSeries, _require_numpy
+
+if TYPE_CHECKING:
+    import numpy as np
+
+    from . import Garmin
+    from .sync import Sink
+else:
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+
+logger = logging.getLogger(__name__)
+
+CACHE = "intensity:daily"
+HEART_RATE_ENDPOINT = "get_heart_rates"
+MS_PER_MINUTE = 60_000
+
+NONE, MODERATE, VIGOROUS = range(3)
+
+# lower limits of zones 1-5 as fractions of the reference heart rate
+DEFAULT_ZONES = (0.5, 0.6, 0.7, 0.8, 0.9)
+LTHR_ZONES = (0.65, 0.85, 0.9, 0.95, 1.0)
+
+
+def _bpm(base: float, fraction: float, scale: float = 1.0) -> int:
+    return round(base + fraction * scale)
+
+
+class ZoneModel(NamedTuple):
+    """Heart-rate zones and intensity thresholds in bpm.
+
+    ``zones`` are the ascending lower limits of zones 1..n; time below the
+    first one counts as zone 0. A sample is vigorous from ``vigorous`` and
+    moderate from ``moderate`` up to ``moderate_max`` (exclusive, defaults
+    to ``vigorous``).
+    """
+
+    zones: tuple[int, ...]
+    moderate: int
+    vigorous: int
+    moderate_max: int | None = None
+
+    @classmethod
+    def create(
+        cls,
+        zones: Iterable[int],
+        moderate: int,
+        vigorous: int,
+        moderate_max: int | None = None,
+    ) -> ZoneModel:
+        """Validate the limits and build the model."""
+        zones = tuple(zones)
+        if list(zones) != sorted(zones):
+            raise ValueError("zone limits must be ascending")
+        if moderate > vigorous:
+            raise ValueError("moderate must not exceed vigorous")
+        if moderate_max is not None and moderate_max < moderate:
+            raise ValueError("moderate_max must not be below moderate")
+        return cls(zones, moderate, vigorous, moderate_max)
+
+    @classmethod
+    def percent_max(
+        cls,
+        max_hr: int,
+        zones: Iterable[float] = DEFAULT_ZONES,
+        moderate: float = 0.64,
+        vigorous: float = 0.77,
+    ) -> ZoneModel:
+        """Limits as fractions of the maximum heart rate (ACSM intensities)."""
+        return cls.create(
+            (_bpm(0, z, max_hr) for z in zones),
+            _bpm(0, moderate, max_hr),
+            _bpm(0, vigorous, max_hr),
+        )
+
+    @classmethod
+    def percent_reserve(
+        cls,
+        max_hr: int,
+        resting_hr: int,
+        zones: Iterable[float] = DEFAULT_ZONES,
+        moderate: float = 0.40,
+        vigorous: float = 0.60,
+    ) -> ZoneModel:
+        """Limits as fractions of the heart-rate reserve above ``resting_hr``."""
+        reserve = max_hr - resting_hr
+        return cls.create(
+            (_bpm(resting_hr, z, reserve) for z in zones),
+            _bpm(resting_hr, moderate, reserve),
+            _bpm(resting_hr, vigorous, reserve),
+        )
+
+    @classmethod
+    def lactate_threshold(
+        cls,
+        lthr: int,
+        zones: Iterable[float] = LTHR_ZONES,
+        moderate: float = 0.71,
+        vigorous: float = 0.86,
+    ) -> ZoneModel:
+        """Limits as fractions of the lactate threshold heart rate.
+
+        The intensity defaults correspond to 64% and 77% of a maximum heart
+        rate about 11% above the threshold.
+        """
+        return cls.create(
+            (_bpm(0, z, lthr) for z in zones),
+            _bpm(0, moderate, lthr),
+            _bpm(0, vigorous, lthr),
+        )
+
+    @classmethod
+    def from_lactate_threshold(
+        cls, response: Mapping[str, Any], **kwargs: Any
+    ) -> ZoneModel:
+        """Build :meth:`lactate_threshold` from a ``get_lactate_threshold``
+        (``latest=True``) response."""
+        lthr = (response.get("speed_and_heart_rate") or {}).get("heartRate")
+        if not lthr:
+            raise ValueError("the response holds no lactate threshold heart rate")
+        return cls.lactate_threshold(int(lthr), **kwargs)
+
+
+class Bout(NamedTuple):
+    """Contiguous period at moderate intensity or above."""
+
+    start_ms: int
+    end_ms: int
+    moderate_ms: int
+    vigorous_ms: int
+    avg_hr: float
+    max_hr: int
+
+
+class DayIntensity(NamedTuple):
+    """Intensity of one day; ``zones_ms`` starts with time below zone 1.
+
+    ``moderate_ms`` and ``vigorous_ms`` only count bouts of at least the
+    engine's ``min_bout_ms``; ``bouts`` lists all of them.
+    """
+
+    day: date
+    zones_ms: tuple[int, ...]
+    moderate_ms: int
+    vigorous_ms: int
+    bouts: tuple[Bout, ...]
+
+    @property
+    def moderate_minutes(self) -> int:
+        return round(self.moderate_ms / MS_PER_MINUTE)
+
+    @property
+    def vigorous_minutes(self) -> int:
+        return round(self.vigorous_ms / MS_PER_MINUTE)
+
+    @property
+    def intensity_minutes(self) -> int:
+        """Moderate minutes plus vigorous minutes counted twice, like Garmin."""
+        return self.moderate_minutes + 2 * self.vigorous_minutes
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "zones_ms": list(self.zones_ms),
+            "moderate_ms": self.moderate_ms,
+            "vigorous_ms": self.vigorous_ms,
+            "bouts": [list(b) for b in self.bouts],
+        }
+
+    @classmethod
+    def from_dict(cls, day: date, data: Mapping[str, Any]) -> DayIntensity:
+        return cls(
+            day,
+            tuple(data["zones_ms"]),
+            data["moderate_ms"],
+            data["vigorous_ms"],
+            tuple(Bout(*b) for b in data["bouts"]),
+        )
+
+
+def _runs(starts: np.ndarray) -> np.ndarray:
+    """Run id of every element given a boolean array of run starts."""
+    return np.cumsum(starts) - 1
+
+
+class IntensityEngine:
+    """Vectorized zone and intensity-minute evaluation with a per-day cache.
+
+    :param min_bout_ms: Only bouts at least this long count towards the
+        moderate/vigorous time (Garmin has used 10 minutes); 0 counts all
+    :param max_gap_ms: Longest gap between samples that is still covered,
+        see :meth:`~garminconnect.series.SampledSeries.durations`
+    :param sink: (Optional) Store that keeps the daily results across runs
+    :param today: Days from this one on are never cached (they still change)
+    """
+
+    def __init__(
+        self,
+        model: ZoneModel,
+        min_bout_ms: int = 0,
+        max_gap_ms: int | None = None,
+        sink: Sink | None = None,
+        account: str = "default",
+        today: date | None = None,
+    ) -> None:
+        self.model = model
+        self.min_bout_ms = min_bout_ms
+        self.max_gap_ms = (
+            HeartRateSeries.DEFAULT_MAX_GAP_MS if max_gap_ms is None else max_gap_ms
+        )
+        self.sink = sink
+        self.account = account
+        self._today = today
+        self._cache: dict[date, DayIntensity] = {}
+        self.computed = 0
+
+    @property
+    def today(self) -> date:
+        return self._today or date.today()
+
+    def _key(self) -> list[Any]:
+        # cached results are only valid for the same parameters
+        zones, *limits = self.model
+        return [list(zones), *limits, self.min_bout_ms, self.max_gap_ms]
+
+    def compute(
+        self, series: Mapping[date, HeartRateSeries | None]
+    ) -> dict[date, DayIntensity]:
+        """Evaluate the heart rate of each day, without using the cache."""
+        _require_numpy()
+        days = sorted(series)
+        parts = [series[day] or HeartRateSeries.empty() for day in days]
+        self.computed += len(days)
+        model = self.model
+        count = len(days)
+        zone_count = len(model.zones) + 1
+        if count == 0:
+            return {}
+
+        timestamps = np.concatenate([p.timestamps for p in parts])
+        bpm = np.concatenate([p.values for p in parts]).astype(np.int16)
+        valid = ~np.concatenate([p.mask for p in parts])
+        durations = np.concatenate([p.durations(self.max_gap_ms) for p in parts])
+        durations = np.where(valid, durations, 0)
+        day_index = np.repeat(np.arange(count), [len(p) for p in parts])
+
+        zone = np.searchsorted(np.asarray(model.zones), bpm, side="right")
+        zones_ms = np.bincount(
+            day_index * zone_count + zone,
+            weights=durations,
+            minlength=count * zone_count,
+        ).reshape(count, zone_count)
+
+        moderate_max = (
+            model.vigorous if model.moderate_max is None else model.moderate_max
+        )
+        level = np.where(
+            valid & (bpm >= model.vigorous),
+            VIGOROUS,
+            np.where(
+                valid & (bpm >= model.moderate) & (bpm < moderate_max), MODERATE, NONE
+            ),
+        )
+
+        # bouts: runs of active samples on one day without a long gap
+        active = level != NONE
+        joined = np.zeros(len(level), dtype=bool)
+        joined[1:] = (
+            active[1:]
+            & active[:-1]
+            & (np.diff(timestamps) <= self.max_gap_ms)
+            & (day_index[1:] == day_index[:-1])
+        )
+        starts = active & ~joined
+        ends = active & ~np.append(joined[1:], False)
+        run = _runs(starts)[active]
+        bouts = int(starts.sum())
+        active_ms = durations[active]
+        bout_ms = np.bincount(run, weights=active_ms, minlength=bouts)
+        vigorous_ms = np.bincount(
+            run,
+            weights=np.where(level[active] == VIGOROUS, active_ms, 0),
+            minlength=bouts,
+        )
+        weighted_hr = np.bincount(run, weights=bpm[active] * active_ms, minlength=bouts)
+        avg_hr = np.divide(weighted_hr, bout_ms, out=np.zeros(bouts), where=bout_ms > 0)
+        first = np.flatnonzero(starts)
+        last = np.flatnonzero(ends)
+        max_hr = (
+            np.maximum.reduceat(bpm[active], np.flatnonzero(np.diff(run, prepend=-1)))
+            if bouts
+            else np.empty(0, dtype=np.int16)
+        )
+        bout_day = day_index[first]
+        counted = bout_ms >= self.min_bout_ms
+        moderate_day = np.bincount(
+            bout_day[counted],
+            weights=(bout_ms - vigorous_ms)[counted],
+            minlength=count,
+        )
+        vigorous_day = np.bincount(
+            bout_day[counted], weights=vigorous_ms[counted], minlength=count
+        )
+
+        day_bouts: list[list[Bout]] = [[] for _ in days]
+        for i in range(bouts):
+            day_bouts[bout_day[i]].append(
+                Bout(
+                    int(timestamps[first[i]]),
+                    int(timestamps[last[i]] + durations[last[i]]),
+                    int(bout_ms[i] - vigorous_ms[i]),
+                    int(vigorous_ms[i]),
+                    round(float(avg_hr[i]), 1),
+                    int(max_hr[i]),
+                )
+            )
+        return {
+            day: DayIntensity(
+                day,
+                tuple(int(ms) for ms in zones_ms[i]),
+                int(moderate_day[i]),
+                int(vigorous_day[i]),
+                tuple(day_bouts[i]),
+            )
+            for i, day in enumerate(days)
+        }
+
+    def cached(self, days: Iterable[date]) -> dict[date, DayIntensity]:
+        """Return the results of ``days`` that are cached."""
+        wanted = [day for day in days if day < self.today]
+        found = {day: self._cache[day] for day in wanted if day in self._cache}
+        missing = [day for day in wanted if day not in found]
+        if missing and self.sink is not None:
+            stored = self.sink.read(self.account, CACHE, min(missing), max(missing))
+            key = self._key()
+            for day in missing:
+                data = stored.get(day)
+                if data is not None and data.get("key") == key:
+                    found[day] = self._cache[day] = DayIntensity.from_dict(day, data)
+        return found
+
+    def days(
+        self, series: Mapping[date, HeartRateSeries | None]
+    ) -> dict[date, DayIntensity]:
+        """Evaluate the heart rate of each day, reusing cached results."""
+        results = self.cached(series)
+        fresh = self.compute({d: s for d, s in series.items() if d not in results})
+        self._store(fresh)
+        results.update(fresh)
+        return dict(sorted(results.items()))
+
+    def from_api(self, api: Garmin, start: date, end: date) -> dict[date, DayIntensity]:
+        """Evaluate ``start..end``, fetching the heart rate of uncached days.
+
+        Days whose request fails are left out.
+        """
+        days = [start + timedelta(days=i) for i in range((end - start).days + 1)]
+        results = self.cached(days)
+        series: dict[date, HeartRateSeries | None] = {}
+        for day in days:
+            if day in results:
+                continue
+            try:
+                response = api.get_heart_rates(day.isoformat())
+            except GarminConnectConnectionError as e:
+                logger.warning("Could not fetch the heart rate of %s: %s", day, e)
+                continue
+            series[day] = HeartRateSeries.from_response(response)
+        fresh = self.compute(series)
+        self._store(fresh)
+        results.update(fresh)
+        return dict(sorted(results.items()))
+
+    def _store(self, results: Mapping[date, DayIntensity]) -> None:
+        settled = [(d, r) for d, r in results.items() if d < self.today]
+        self._cache.update(settled)
+        if self.sink is not None and settled:
+            key = self._key()
+            self.sink.write(
+                self.account,
+                CACHE,
+                [(day, {"key": key, **r.to_dict()}) for day, r in settled],
+            )
+
+    def invalidate(self, account: str, endpoint: str, days: list[date]) -> None:
+        """Drop cached results of re-synced heart rate (a sync listener)."""
+        if account != self.account or endpoint != HEART_RATE_ENDPOINT or not days:
+            return
+        for day in days:
+            self._cache.pop(day, None)
+        if self.sink is not None:
+            self.sink.delete(self.account, CACHE, days)
+
+    @staticmethod
+    def summary(results: Iterable[DayIntensity]) -> dict[str, Any]:
+        """Add up several days: zone time, intensity minutes and bouts."""
+        results = list(results)
+        zones = [sum(z) for z in zip(*(r.zones_ms for r in results), strict=True)]
+        moderate = sum(r.moderate_minutes for r in results)
+        vigorous = sum(r.vigorous_minutes for r in results)
+        return {
+            "days": len(results),
+            "zones_ms": zones,
+            "moderate_minutes": moderate,
+            "vigorous_minutes": vigorous,
+            "intensity_minutes": moderate + 2 * vigorous,
+            "bouts": sum(len(r.bouts) for r in results),
+        }
@@ -0,0 +1,283 @@
+"""Lazy JSON proxies that parse subtrees on first access.
+
+:func:`loads_lazy` wraps the raw response bytes in a read-only
+:class:`LazyObject` (a ``Mapping``) or :class:`LazyArray` (a ``Sequence``).
+Only the member boundaries of a container are located when it is first
+accessed; values are decoded with the standard ``json`` module when they are
+read, and nested containers become lazy proxies themselves. Callers that only
+read a handful of fields from a large response never build the rest of the
+tree in memory.
+
+This is a memory optimization only; it never saves CPU time. Skipping a subtree still scans its bytes
+(strings and text inside the C regex engine, one Python step per bracket),
+so even a single lazy read costs more than ``json.loads`` of the whole
+document: about 1.5x for arrays of numbers (activity details), several
+times for many small objects of strings (sleep, activity lists). In
+exchange the peak memory stays close to the size of the raw bytes instead
+of the ~6x a parsed tree of numbers takes, which is why
+``Garmin(lazy_json=True)`` only wraps responses of at least
+:data:`MIN_LAZY_BYTES`.
+
+The proxies are not ``dict``/``list`` instances. Use :meth:`to_python` (or
+:func:`materialize`) before handing them to code that checks for those, and
+``json.dumps(value, default=json_default)`` to serialize them.
+"""
+
+from __future__ import annotations
+
+import json
+import re
+from collections.abc import Iterator, Mapping, Sequence
+from typing import Any, overload
+
+_WS = re.compile(rb"[ \t\n\r]*")
+_STRING_PATTERN = rb'"[^"\\]*(?:\\.[^"\\]*)*"'
+_SCALAR_PATTERN = rb"[^,\]}\s]+"
+_STRING = re.compile(_STRING_PATTERN, re.DOTALL)
+_SCALAR = re.compile(_SCALAR_PATTERN)
+_OPEN = frozenset(b"[{")
+# smaller responses gain little memory and are decoded eagerly
+MIN_LAZY_BYTES = 64 * 1024
+# Everything up to and including the next bracket outside a string. Text and
+# strings are skipped inside the C regex engine, so finding the end of a
+# container costs one Python step per bracket rather than per token.
+_NEXT_BRACKET = re.compile(
+    rb'[^"\[\]{}]*(?:' + _STRING_PATTERN + rb'[^"\[\]{}]*)*[\[\]{}]', re.DOTALL
+)
+# one object member or array element with a scalar or string value,
+# including the whitespace around it
+_SIMPLE_VALUE = rb"(" + _STRING_PATTERN + rb'|[^,\[\]{}"\s]+)[ \t\n\r]*'
+_SIMPLE_MEMBER = re.compile(
+    rb"[ \t\n\r]*(" + _STRING_PATTERN + rb")[ \t\n\r]*:[ \t\n\r]*" + _SIMPLE_VALUE,
+    re.DOTALL,
+)
+_SIMPLE_ELEMENT = re.compile(rb"[ \t\n\r]*" + _SIMPLE_VALUE, re.DOTALL)
+
+
+class LazyJSONError(ValueError):
+    """Raised when the raw JSON is malformed."""
+
+
+def _skip_ws(buf: bytes, pos: int) -> int:
+    match = _WS.match(buf, pos)
+    return match.end() if match else pos
+
+
+def _value_end(buf: bytes, pos: int) -> int:
+    """Return the end offset of the JSON value starting at ``pos``."""
+    first = buf[pos]
+    if first in _OPEN:
+        depth = 0
+        for match in _NEXT_BRACKET.finditer(buf, pos):
+            end = match.end()
+            if buf[end - 1] in _OPEN:
+                depth += 1
+            else:
+                depth -= 1
+                if depth == 0:
+                    return end
+        raise LazyJSONError(f"unterminated container at offset {pos}")
+    scalar = (_STRING if first == 0x22 else _SCALAR).match(buf, pos)
+    if scalar is None:
+        raise LazyJSONError(f"invalid value at offset {pos}")
+    return scalar.end()
+
+
+def _decode_key(buf: bytes, start: int, end: int) -> str:
+    key = buf[start + 1 : end - 1]
+    if 0x5C in key:  # backslash escapes
+        return str(json.loads(buf[start:end]))
+    return key.decode()
+
+
+def _materialize(buf: bytes, start: int, end: int) -> Any:
+    first = buf[start]
+    if first == 0x7B:
+        return LazyObject(buf, start, end)
+    if first == 0x5B:
+        return LazyArray(buf, start, end)
+    return json.loads(buf[start:end])
+
+
+class _LazyContainer:
+    __slots__ = ("_buf", "_start", "_end", "_cache")
+
+    def __init__(self, buf: bytes, start: int, end: int) -> None:
+        self._buf = buf
+        self._start = start
+        self._end = end
+        self._cache: dict[Any, Any] = {}
+
+    def to_python(self) -> Any:
+        """Parse the whole subtree into plain dicts and lists."""
+        return json.loads(self._buf[self._start : self._end])
+
+    def raw(self) -> bytes:
+        """Return the raw JSON bytes of this subtree."""
+        return self._buf[self._start : self._end]
+
+    def _members(self, close: int) -> Iterator[tuple[int, int, int, int]]:
+        """Yield ``(key_start, key_end, value_start, value_end)`` per member.
+
+        Array elements have an empty key span. Members with a scalar or string
+        value are matched by a single regex call.
+        """
+        buf = self._buf
+        pos = _skip_ws(buf, self._start + 1)
+        if buf[pos] == close:
+            return
+        is_object = close == 0x7D
+        member = _SIMPLE_MEMBER if is_object else _SIMPLE_ELEMENT
+        while True:
+            match = member.match(buf, pos)
+            if match is not None:
+                if is_object:
+                    key_start, key_end = match.span(1)
+                    value_start, value_end = match.span(2)
+                else:
+                    key_start = key_end = pos
+                    value_start, value_end = match.span(1)
+                pos = match.end()
+            else:
+                key_start, key_end, value_start, value_end = self._member(
+                    pos, is_object
+                )
+                pos = _skip_ws(buf, value_end)
+            yield key_start, key_end, value_start, value_end
+            if buf[pos] == close:
+                return
+            if buf[pos] != 0x2C:  # ','
+                raise LazyJSONError(f"expected ',' at offset {pos}")
+            pos += 1
+
+    def _member(self, pos: int, is_object: bool) -> tuple[int, int, int, int]:
+        buf = self._buf
+        pos = _skip_ws(buf, pos)
+        key_start = key_end = pos
+        if is_object:
+            match = _STRING.match(buf, pos)
+            if match is None:
+                raise LazyJSONError(f"expected key at offset {pos}")
+            key_end = match.end()
+            pos = _skip_ws(buf, key_end)
+            if buf[pos] != 0x3A:  # ':'
+                raise LazyJSONError(f"expected ':' at offset {pos}")
+            pos = _skip_ws(buf, pos + 1)
+        return key_start, key_end, pos, _value_end(buf, pos)
+
+
+class LazyObject(_LazyContainer, Mapping[str, Any]):
+    """Read-only mapping over a JSON object."""
+
+    __slots__ = ("_index",)
+
+    def __init__(self, buf: bytes, start: int, end: int) -> None:
+        super().__init__(buf, start, end)
+        self._index: dict[str, tuple[int, int]] | None = None
+
+    def _spans(self) -> dict[str, tuple[int, int]]:
+        if self._index is None:
+            buf = self._buf
+            index = {}
+            for key_start, key_end, start, end in self._members(0x7D):
+                index[_decode_key(buf, key_start, key_end)] = (start, end)
+            self._index = index
+        return self._index
+
+    def __getitem__(self, key: str) -> Any:
+        try:
+            return self._cache[key]
+        except KeyError:
+            pass
+        start, end = self._spans()[key]
+        value = self._cache[key] = _materialize(self._buf, start, end)
+        return value
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._spans())
+
+    def __len__(self) -> int:
+        return len(self._spans())
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._spans()
+
+    def __repr__(self) -> str:
+        return f"LazyObject(keys={list(self._spans())!r})"
+
+
+class LazyArray(_LazyContainer, Sequence[Any]):
+    """Read-only sequence over a JSON array."""
+
+    __slots__ = ("_index",)
+
+    def __init__(self, buf: bytes, start: int, end: int) -> None:
+        super().__init__(buf, start, end)
+        self._index: list[tuple[int, int]] | None = None
+
+    def _spans(self) -> list[tuple[int, int]]:
+        if self._index is None:
+            self._index = [(s, e) for _, _, s, e in self._members(0x5D)]
+        return self._index
+
+    @overload
+    def __getitem__(self, index: int) -> Any: ...
+
+    @overload
+    def __getitem__(self, index: slice) -> list[Any]: ...
+
+    def __getitem__(self, index: int | slice) -> Any:
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        spans = self._spans()
+        if index < 0:
+            index += len(spans)
+            if index < 0:
+                raise IndexError("lazy array index out of range")
+        try:
+            return self._cache[index]
+        except KeyError:
+            pass
+        start, end = spans[index]
+        value = self._cache[index] = _materialize(self._buf, start, end)
+        return value
+
+    def __len__(self) -> int:
+        return len(self._spans())
+
+    def __repr__(self) -> str:
+        return f"LazyArray(len={len(self)})"
+
+
+def loads_lazy(data: bytes | bytearray | str) -> Any:
+    """Wrap raw JSON in a lazy proxy.
+
+    Objects and arrays become :class:`LazyObject` / :class:`LazyArray`;
+    top-level scalars are returned parsed.
+    """
+
+    if isinstance(data, str):
+        data = data.encode("utf-8")
+    buf = bytes(data)
+    start = _skip_ws(buf, 0)
+    if start >= len(buf):
+        raise LazyJSONError("empty document")
+    return _materialize(buf, start, _value_end(buf, start))
+
+
+def materialize(value: Any) -> Any:
+    """Return ``value`` with lazy proxies parsed into plain dicts and lists."""
+    if isinstance(value, _LazyContainer):
+        return value.to_python()
+    if isinstance(value, list):
+        return [materialize(item) for item in value]
+    if isinstance(value, dict):
+        return {key: materialize(item) for key, item in value.items()}
+    return value
+
+
+def json_default(value: Any) -> Any:
+    """``default=`` hook that lets ``json.dumps`` serialize lazy proxies."""
+    if isinstance(value, _LazyContainer):
+        return value.to_python()
+    raise TypeError(f"Object of type {type(value).__name__} is not JSON serializable")
@@ -0,0 +1,278 @@
+"""Compact typed records for frequently used Garmin Connect responses.
+
+The activity list, daily summary, weigh-in and body battery endpoints return
+dicts with dozens of keys, most of which analytics code never reads. The
+classes in this module keep only the commonly used fields in a single tuple
+behind ``__slots__``, which is roughly an order of magnitude smaller than the
+original dict and gives fast attribute access::
+
+    activities = ActivitySummary.from_list(api.get_activities(0, 100))
+    activities[0].average_hr
+
+Pass ``keep_raw=True`` to keep a reference to the original dict, available as
+``record.raw``.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Mapping
+from operator import itemgetter
+from typing import Any, ClassVar, TypeVar
+
+_M = TypeVar("_M", bound="Record")
+
+
+def _first(obj: Any) -> Any:
+    """Return the first value of a dict or the first item of a list."""
+    if isinstance(obj, Mapping):
+        return next(iter(obj.values()))
+    return obj[0]
+
+
+def compile_path(path: str) -> Callable[[Any], Any]:
+    """Compile a dotted path like ``activityType.typeKey`` into a getter.
+
+    The getter returns ``None`` as soon as a level is missing or not a dict;
+    integer path components index into lists and ``*`` selects the first
+    value of a dict (e.g. the per-device maps of ``get_training_status``).
+    """
+
+    keys: list[Any] = [int(k) if k.isdigit() else k for k in path.split(".")]
+    if len(keys) == 1 and keys[0] != "*":
+        key = keys[0]
+
+        def get_one(obj: Any) -> Any:
+            try:
+                return obj[key]
+            except (KeyError, IndexError, TypeError):
+                return None
+
+        return get_one
+
+    def get_nested(obj: Any) -> Any:
+        for key in keys:
+            try:
+                obj = _first(obj) if key == "*" else obj[key]
+            except (KeyError, IndexError, TypeError, StopIteration):
+                return None
+        return obj
+
+    return get_nested
+
+
+class _Field:
+    """Read-only attribute backed by one position of the record tuple."""
+
+    __slots__ = ("get", "path")
+
+    def __init__(self, index: int, path: str) -> None:
+        self.get = itemgetter(index)
+        self.path = path
+
+    def __get__(self, obj: Record | None, owner: type) -> Any:
+        if obj is None:
+            return self
+        return self.get(obj._values)
+
+
+class Record:
+    """Base class for typed records.
+
+    Subclasses declare ``FIELDS`` mapping attribute names to dotted JSON
+    paths; attributes are generated from it. Each field is also annotated on
+    the subclass with the type of its value (missing values are ``None``).
+    """
+
+    __slots__ = ("_values", "_raw")
+
+    FIELDS: ClassVar[dict[str, str]] = {}
+    _getters: ClassVar[tuple[Callable[[Any], Any], ...]] = ()
+
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        super().__init_subclass__(**kwargs)
+        for index, (name, path) in enumerate(cls.FIELDS.items()):
+            setattr(cls, name, _Field(index, path))
+        cls._getters = tuple(compile_path(path) for path in cls.FIELDS.values())
+
+    def __init__(self, raw: dict[str, Any], keep_raw: bool = False) -> None:
+        self._values = tuple([get(raw) for get in self._getters])
+        self._raw = raw if keep_raw else None
+
+    @classmethod
+    def from_list(
+        cls: type[_M], items: Iterable[dict[str, Any]] | None, keep_raw: bool = False
+    ) -> list[_M]:
+        """Convert a list response into records."""
+        return [cls(item, keep_raw) for item in items or []]
+
+    @property
+    def raw(self) -> dict[str, Any] | None:
+        """The original response dict if the record was built with keep_raw."""
+        return self._raw
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the record fields as a plain dict."""
+        return dict(zip(self.FIELDS, self._values, strict=True))
+
+    def __eq__(self, other: object) -> bool:
+        if type(other) is not type(self):
+            return NotImplemented
+        return self._values == other._values
+
+    def __hash__(self) -> int:
+        return hash(self._values)
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{k}={v!r}" for k, v in self.to_dict().items())
+        return f"{type(self).__name__}({fields})"
+
+
+class ActivitySummary(Record):
+    """Entry of ``get_activities`` / ``get_activities_by_date``."""
+
+    __slots__ = ()
+
+    FIELDS = {
+        "activity_id": "activityId",
+        "name": "activityName",
+        "type_key": "activityType.typeKey",
+        "start_time_local": "startTimeLocal",
+        "start_time_gmt": "startTimeGMT",
+        "duration": "duration",
+        "moving_duration": "movingDuration",
+        "distance": "distance",
+        "elevation_gain": "elevationGain",
+        "average_speed": "averageSpeed",
+        "average_hr": "averageHR",
+        "max_hr": "maxHR",
+        "calories": "calories",
+        "steps": "steps",
+        "training_load": "activityTrainingLoad",
+        "aerobic_training_effect": "aerobicTrainingEffect",
+        "anaerobic_training_effect": "anaerobicTrainingEffect",
+    }
+
+    activity_id: int | None
+    name: str | None
+    type_key: str | None
+    start_time_local: str | None
+    start_time_gmt: str | None
+    duration: float | None
+    moving_duration: float | None
+    distance: float | None
+    elevation_gain: float | None
+    average_speed: float | None
+    average_hr: float | None
+    max_hr: float | None
+    calories: float | None
+    steps: int | None
+    training_load: float | None
+    aerobic_training_effect: float | None
+    anaerobic_training_effect: float | None
+
+
+class UserSummary(Record):
+    """Response of ``get_user_summary`` / ``get_stats``."""
+
+    __slots__ = ()
+
+    FIELDS = {
+        "calendar_date": "calendarDate",
+        "total_steps": "totalSteps",
+        "total_distance_meters": "totalDistanceMeters",
+        "total_kilocalories": "totalKilocalories",
+        "active_kilocalories": "activeKilocalories",
+        "resting_heart_rate": "restingHeartRate",
+        "min_heart_rate": "minHeartRate",
+        "max_heart_rate": "maxHeartRate",
+        "average_stress_level": "averageStressLevel",
+        "max_stress_level": "maxStressLevel",
+        "body_battery_charged": "bodyBatteryChargedValue",
+        "body_battery_drained": "bodyBatteryDrainedValue",
+        "body_battery_highest": "bodyBatteryHighestValue",
+        "body_battery_lowest": "bodyBatteryLowestValue",
+        "moderate_intensity_minutes": "moderateIntensityMinutes",
+        "vigorous_intensity_minutes": "vigorousIntensityMinutes",
+        "floors_ascended": "floorsAscended",
+        "sleeping_seconds": "sleepingSeconds",
+    }
+
+    calendar_date: str | None
+    total_steps: int | None
+    total_distance_meters: int | None
+    total_kilocalories: float | None
+    active_kilocalories: float | None
+    resting_heart_rate: int | None
+    min_heart_rate: int | None
+    max_heart_rate: int | None
+    average_stress_level: int | None
+    max_stress_level: int | None
+    body_battery_charged: int | None
+    body_battery_drained: int | None
+    body_battery_highest: int | None
+    body_battery_lowest: int | None
+    moderate_intensity_minutes: int | None
+    vigorous_intensity_minutes: int | None
+    floors_ascended: float | None
+    sleeping_seconds: int | None
+
+
+class WeighIn(Record):
+    """Single weight measurement from ``get_weigh_ins`` (weights in grams)."""
+
+    __slots__ = ()
+
+    FIELDS = {
+        "sample_pk": "samplePk",
+        "calendar_date": "calendarDate",
+        "timestamp": "date",
+        "weight": "weight",
+        "bmi": "bmi",
+        "body_fat": "bodyFat",
+        "body_water": "bodyWater",
+        "bone_mass": "boneMass",
+        "muscle_mass": "muscleMass",
+        "source_type": "sourceType",
+    }
+
+    sample_pk: int | None
+    calendar_date: str | None
+    timestamp: int | None
+    weight: float | None
+    bmi: float | None
+    body_fat: float | None
+    body_water: float | None
+    bone_mass: float | None
+    muscle_mass: float | None
+    source_type: str | None
+
+    @classmethod
+    def from_response(
+        cls, response: dict[str, Any] | None, keep_raw: bool = False
+    ) -> list[WeighIn]:
+        """Flatten the ``dailyWeightSummaries`` of a ``get_weigh_ins`` response."""
+        return [
+            cls(metric, keep_raw)
+            for summary in (response or {}).get("dailyWeightSummaries") or []
+            for metric in summary.get("allWeightMetrics") or []
+        ]
+
+
+class BodyBatteryDay(Record):
+    """Entry of ``get_body_battery``."""
+
+    __slots__ = ()
+
+    FIELDS = {
+        "date": "date",
+        "charged": "charged",
+        "drained": "drained",
+        "start_timestamp_gmt": "startTimestampGMT",
+        "end_timestamp_gmt": "endTimestampGMT",
+    }
+
+    date: str | None
+    charged: int | None
+    drained: int | None
+    start_timestamp_gmt: str | None
+    end_timestamp_gmt: str | None
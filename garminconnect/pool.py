@@ -0,0 +1,351 @@
+"""Run requests for many Garmin Connect accounts in one process.
+
+Every :class:`~garminconnect.Garmin` instance normally owns a
+``requests`` connection pool of its own. :class:`GarminPool` instead mounts
+one shared ``HTTPAdapter`` per domain (``garmin.com`` / ``garmin.cn``) into
+the sessions of all its accounts, so the number of open sockets is bounded by
+the number of worker threads rather than the number of accounts. Cookies and
+OAuth tokens stay per account.
+
+Work is queued per account and handed to a fixed set of worker threads in
+round-robin order. Each account runs at most one request at a time and is
+throttled by its own token bucket::
+
+    with GarminPool(max_workers=8, rate=0.5, burst=3) as pool:
+        for name, tokens in accounts.items():
+            pool.add_account(name, tokenstore=tokens)
+        futures = {
+            name: pool.submit(name, "get_sleep_data", "2024-01-01")
+            for name in accounts
+        }
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Callable, Iterator
+from concurrent.futures import Future
+from typing import Any
+
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
+
+from . import Garmin
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_RATE = 1.0  # requests per second per account
+DEFAULT_BURST = 5
+
+
+class TokenBucket:
+    """Token bucket refilled at ``rate`` tokens per second up to ``capacity``."""
+
+    __slots__ = ("rate", "capacity", "tokens", "updated")
+
+    def __init__(self, rate: float, capacity: float, now: float) -> None:
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        if capacity < 1:
+            raise ValueError("capacity must be at least 1")
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated = now
+
+    def delay(self, now: float) -> float:
+        """Return the seconds until a token is available (0 if one is)."""
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        if self.tokens >= 1:
+            return 0.0
+        return (1 - self.tokens) / self.rate
+
+    def take(self) -> None:
+        self.tokens -= 1
+
+
+class RateLimiter:
+    """Thread-safe blocking token bucket shared by several threads.
+
+    ``acquire`` waits until a token is free and takes it, so threads calling
+    it together make at most ``rate`` requests per second after an initial
+    burst of ``burst``.
+    """
+
+    def __init__(
+        self,
+        rate: float = DEFAULT_RATE,
+        burst: float = DEFAULT_BURST,
+        clock: Callable[[], float] = time.monotonic,
+        sleep: Callable[[float], None] = time.sleep,
+    ) -> None:
+        self._clock = clock
+        self._sleep = sleep
+        self._bucket = TokenBucket(rate, burst, clock())
+        self._lock = threading.Lock()
+
+    def acquire(self) -> float:
+        """Take a token, blocking while none is available; return the wait."""
+        waited = 0.0
+        while True:
+            with self._lock:
+                delay = self._bucket.delay(self._clock())
+                if delay == 0:
+                    self._bucket.take()
+                    return waited
+            self._sleep(delay)
+            waited += delay
+
+
+class PoolAccount:
+    """Per-account state: the client, its rate limit and queued work."""
+
+    __slots__ = ("key", "api", "bucket", "queue", "busy", "completed")
+
+    def __init__(self, key: str, api: Garmin, bucket: TokenBucket) -> None:
+        self.key = key
+        self.api = api
+        self.bucket = bucket
+        self.queue: deque[tuple[Future[Any], Callable[..., Any], tuple, dict]] = deque()
+        self.busy = False
+        self.completed = 0
+
+
+class GarminPool:
+    """Fair, rate limited scheduler over many accounts sharing connections.
+
+    :param max_workers: Number of worker threads, which also bounds the
+        number of connections per host
+    :param rate: Default requests per second per account
+    :param burst: Default token bucket capacity per account
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 8,
+        rate: float = DEFAULT_RATE,
+        burst: float = DEFAULT_BURST,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.max_workers = max_workers
+        self.rate = rate
+        self.burst = burst
+        self._clock = clock
+        self._accounts: dict[str, PoolAccount] = {}
+        self._ready: deque[str] = deque()
+        self._adapters: dict[str, HTTPAdapter] = {}
+        self._cond = threading.Condition()
+        self._workers: list[threading.Thread] = []
+        self._closed = False
+
+    def __enter__(self) -> GarminPool:
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def __len__(self) -> int:
+        return len(self._accounts)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(list(self._accounts))
+
+    def adapter(self, domain: str, api: Garmin | None = None) -> HTTPAdapter:
+        """Return the shared HTTP adapter (connection pool) for ``domain``."""
+        adapter = self._adapters.get(domain)
+        if adapter is None:
+            client = api.garth if api is not None else None
+            retry = Retry(
+                total=getattr(client, "retries", 3),
+                status_forcelist=getattr(client, "status_forcelist", (408, 500)),
+                backoff_factor=getattr(client, "backoff_factor", 0.5),
+            )
+            adapter = HTTPAdapter(
+                max_retries=retry,
+                pool_connections=4,
+                pool_maxsize=self.max_workers,
+            )
+            self._adapters[domain] = adapter
+        return adapter
+
+    def add_account(
+        self,
+        key: str,
+        email: str | None = None,
+        password: str | None = None,
+        tokenstore: str | None = None,
+        is_cn: bool = False,
+        rate: float | None = None,
+        burst: float | None = None,
+        login: bool = True,
+        lazy_profile: bool = False,
+        **garmin_kwargs: Any,
+    ) -> Garmin:
+        """Register an account and return its :class:`Garmin` client.
+
+        The client's session uses the pool's shared connection pool, also
+        after tokens are loaded or the client is reconfigured. With
+        ``login=True`` (the default) :meth:`Garmin.login` is called with
+        ``tokenstore`` and ``lazy_profile``.
+        """
+
+        if key in self._accounts:
+            raise ValueError(f"account {key!r} is already registered")
+        api = Garmin(email, password, is_cn=is_cn, **garmin_kwargs)
+        domain = api.garth.domain
+        # garth.Client mounts a private adapter on every configure() (token
+        # loads included); the shared one is mounted again after each
+        api.garth.share_adapter(self.adapter(domain, api))
+        if login:
+            api.login(tokenstore, lazy_profile=lazy_profile)
+        bucket = TokenBucket(
+            self.rate if rate is None else rate,
+            self.burst if burst is None else burst,
+            self._clock(),
+        )
+        with self._cond:
+            self._accounts[key] = PoolAccount(key, api, bucket)
+        return api
+
+    def remove_account(self, key: str) -> None:
+        """Drop an account, cancelling its queued work."""
+        with self._cond:
+            account = self._accounts.pop(key)
+            if key in self._ready:
+                self._ready.remove(key)
+            while account.queue:
+                account.queue.popleft()[0].cancel()
+
+    def account(self, key: str) -> Garmin:
+        """Return the client of a registered account."""
+        return self._accounts[key].api
+
+    def submit(
+        self, key: str, method: str | Callable[..., Any], *args: Any, **kwargs: Any
+    ) -> Future[Any]:
+        """Queue ``method`` for account ``key``.
+
+        ``method`` is either the name of a :class:`Garmin` method or a
+        callable receiving the account's client as first argument.
+        """
+
+        if isinstance(method, str):
+            name = method
+
+            def method(api: Garmin, *a: Any, **kw: Any) -> Any:
+                return getattr(api, name)(*a, **kw)
+
+        future: Future[Any] = Future()
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("pool is closed")
+            account = self._accounts[key]
+            account.queue.append((future, method, args, kwargs))
+            if not account.busy and key not in self._ready:
+                self._ready.append(key)
+            self._start_workers()
+            self._cond.notify()
+        return future
+
+    def map(
+        self, method: str | Callable[..., Any], *args: Any, **kwargs: Any
+    ) -> dict[str, Future[Any]]:
+        """Submit the same call for every account."""
+        return {key: self.submit(key, method, *args, **kwargs) for key in self}
+
+    def _start_workers(self) -> None:
+        while len(self._workers) < self.max_workers:
+            worker = threading.Thread(
+                target=self._work,
+                name=f"GarminPool-{len(self._workers)}",
+                daemon=True,
+            )
+            self._workers.append(worker)
+            worker.start()
+
+    def _next_job(
+        self, now: float
+    ) -> (
+        tuple[PoolAccount, tuple[Future[Any], Callable[..., Any], tuple, dict]]
+        | float
+        | None
+    ):
+        """Pick the next job in round-robin order (caller holds the lock).
+
+        Returns the account and job, the seconds until some account's rate
+        limit allows a request, or ``None`` when nothing is queued.
+        """
+        wait: float | None = None
+        for _ in range(len(self._ready)):
+            key = self._ready.popleft()
+            account = self._accounts[key]
+            delay = account.bucket.delay(now)
+            if delay:
+                self._ready.append(key)
+                wait = delay if wait is None else min(wait, delay)
+                continue
+            job = account.queue.popleft()
+            if job[0].set_running_or_notify_cancel():
+                account.bucket.take()
+                account.busy = True
+                return account, job
+            # cancelled before it started; keep the account in rotation
+            if account.queue:
+                self._ready.appendleft(key)
+        return wait
+
+    def _work(self) -> None:
+        while True:
+            with self._cond:
+                while True:
+                    if self._closed and not self._ready:
+                        return
+                    picked = self._next_job(self._clock())
+                    if isinstance(picked, tuple):
+                        break
+                    self._cond.wait(picked)
+            account, (future, method, args, kwargs) = picked
+            try:
+                result = method(account.api, *args, **kwargs)
+            except BaseException as e:
+                future.set_exception(e)
+            else:
+                future.set_result(result)
+            with self._cond:
+                account.busy = False
+                account.completed += 1
+                if account.queue and account.key in self._accounts:
+                    self._ready.append(account.key)
+                    self._cond.notify()
+
+    def close(self, wait: bool = True) -> None:
+        """Stop accepting work; with ``wait`` finish queued jobs first."""
+        with self._cond:
+            self._closed = True
+            if not wait:
+                for account in self._accounts.values():
+                    while account.queue:
+                        account.queue.popleft()[0].cancel()
+                self._ready.clear()
+            self._cond.notify_all()
+        if wait:
+            for worker in self._workers:
+                worker.join()
+
+    def stats(self) -> dict[str, dict[str, Any]]:
+        """Return queued and completed request counts per account."""
+        with self._cond:
+            return {
+                key: {
+                    "queued": len(account.queue),
+                    "completed": account.completed,
+                    "busy": account.busy,
+                }
+                for key, account in self._accounts.items()
+            }
@@ -0,0 +1,101 @@
+"""Field projection for endpoint responses.
+
+Most callers only read a few scalars from the large daily responses. A
+:class:`Projection` compiles a set of dotted paths (see
+:func:`~garminconnect.models.compile_path`) once and turns a response into a
+flat tuple, or a dict when the fields are given as ``{name: path}``::
+
+    sleep = api.get_sleep_data(
+        "2024-01-01",
+        fields={
+            "deep": "dailySleepDTO.deepSleepSeconds",
+            "score": "sleepScores.overall.value",
+        },
+    )
+
+The endpoint methods that accept ``fields=`` drop the parsed response as soon
+as the projected values are extracted.
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterable, Mapping, Sequence
+from functools import lru_cache
+from typing import Any
+
+from .models import compile_path
+
+Fields = Sequence[str] | Mapping[str, str]
+Projected = tuple[Any, ...] | dict[str, Any]
+
+
+class Projection:
+    """Compiled extractor for a fixed set of dotted paths."""
+
+    __slots__ = ("names", "paths", "as_dict", "_getters")
+
+    def __init__(self, fields: Fields) -> None:
+        if isinstance(fields, str):
+            raise TypeError("fields must be a sequence or mapping of paths")
+        if isinstance(fields, Mapping):
+            self.names = tuple(fields)
+            self.paths = tuple(fields.values())
+            self.as_dict = True
+        else:
+            self.paths = self.names = tuple(fields)
+            self.as_dict = False
+        if not self.paths:
+            raise ValueError("fields must not be empty")
+        self._getters = tuple(compile_path(path) for path in self.paths)
+
+    def values(self, obj: Any) -> tuple[Any, ...]:
+        """Return the projected values of ``obj`` as a tuple."""
+        return tuple([get(obj) for get in self._getters])
+
+    def __call__(self, obj: Any) -> Projected:
+        values = self.values(obj)
+        if self.as_dict:
+            return dict(zip(self.names, values, strict=True))
+        return values
+
+    def extract_many(self, objs: Iterable[Any]) -> list[Projected]:
+        """Project every item of ``objs``, e.g. one response per day."""
+        return [self(obj) for obj in objs]
+
+    def columns(self, objs: Iterable[Any]) -> dict[str, list[Any]]:
+        """Project ``objs`` into one list per field."""
+        rows = [self.values(obj) for obj in objs]
+        if not rows:
+            return {name: [] for name in self.names}
+        return {
+            name: list(column)
+            for name, column in zip(self.names, zip(*rows, strict=True), strict=True)
+        }
+
+    def __repr__(self) -> str:
+        return f"Projection({dict(zip(self.names, self.paths, strict=True))!r})"
+
+
+@lru_cache(maxsize=256)
+def _compile(items: tuple[tuple[str, str], ...], as_dict: bool) -> Projection:
+    return Projection(dict(items) if as_dict else [path for _, path in items])
+
+
+def compile_projection(fields: Fields | Projection) -> Projection:
+    """Return a (cached) :class:`Projection` for ``fields``."""
+
+    if isinstance(fields, Projection):
+        return fields
+    if isinstance(fields, Mapping):
+        return _compile(tuple(fields.items()), True)
+    if isinstance(fields, str):
+        raise TypeError("fields must be a sequence or mapping of paths")
+    return _compile(tuple((path, path) for path in fields), False)
+
+
+def project(response: Any, fields: Fields | Projection | None) -> Any:
+    """Return ``response`` unchanged, or projected when ``fields`` is given."""
+
+    if fields is None:
+        return response
+    return compile_projection(fields)(response)
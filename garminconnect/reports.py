@@ -0,0 +1,325 @@
+"""Report data served from the local sync store.
+
+:class:`ReportData` turns the per-day payloads kept in a
+:class:`~garminconnect.sync.Sink` (for example by a
+:class:`~garminconnect.sync.SyncEngine`) into flat daily rows and period
+summaries for reports. Only days missing from the store, and the most
+recent ``hot_days`` days, are requested from the API; without an API client
+it works offline on whatever is stored::
+
+    data = ReportData(SQLiteSink("~/.garminconnect/sync.db"), "alice", api=api)
+    for row in data.daily(date(2024, 3, 1), date(2024, 3, 31)):
+        print(row["date"], row["steps"], row["sleep_hours"])
+    week = data.summary(date(2024, 3, 25), date(2024, 3, 31))
+    week["steps"]["sum"], week["resting_hr"]["mean"]
+
+Daily rows are cached in the sink under ``report:daily`` and calendar week
+(Monday to Sunday) and month summaries under ``report:week`` and
+``report:month``, keyed by the first day of the period. They are rebuilt
+when one of their days is fetched again.
+
+Pass ``endpoints`` to request only the endpoints whose columns a report
+uses; the other columns are filled from the store when present. Rows and
+period summaries are only cached once every endpoint is stored.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections.abc import Callable, Iterable
+from datetime import date, timedelta
+from typing import TYPE_CHECKING, Any
+
+from . import GarminConnectConnectionError
+from .projection import Projection
+from .sync import RANGE_DATE_KEYS, Sink
+
+if TYPE_CHECKING:
+    from . import Garmin
+
+logger = logging.getLogger(__name__)
+
+DAILY = "report:daily"
+WEEK = "report:week"
+MONTH = "report:month"
+DEFAULT_HOT_DAYS = 1  # today is always fetched again
+
+# report columns per endpoint: {column: dotted path}
+REPORT_FIELDS: dict[str, Projection] = {
+    "get_user_summary": Projection(
+        {
+            "steps": "totalSteps",
+            "distance_m": "totalDistanceMeters",
+            "calories": "totalKilocalories",
+            "active_calories": "activeKilocalories",
+            "floors": "floorsAscended",
+            "moderate_minutes": "moderateIntensityMinutes",
+            "vigorous_minutes": "vigorousIntensityMinutes",
+        }
+    ),
+    "get_sleep_data": Projection(
+        {
+            "sleep_seconds": "dailySleepDTO.sleepTimeSeconds",
+            "deep_sleep_seconds": "dailySleepDTO.deepSleepSeconds",
+            "light_sleep_seconds": "dailySleepDTO.lightSleepSeconds",
+            "rem_sleep_seconds": "dailySleepDTO.remSleepSeconds",
+            "awake_seconds": "dailySleepDTO.awakeSleepSeconds",
+            "sleep_score": "sleepScores.overall.value",
+        }
+    ),
+    "get_heart_rates": Projection(
+        {
+            "resting_hr": "restingHeartRate",
+            "min_hr": "minHeartRate",
+            "max_hr": "maxHeartRate",
+        }
+    ),
+    "get_hrv_data": Projection(
+        {
+            "hrv_last_night": "hrvSummary.lastNightAvg",
+            "hrv_weekly_avg": "hrvSummary.weeklyAvg",
+            "hrv_status": "hrvSummary.status",
+        }
+    ),
+    "get_stress_data": Projection(
+        {"avg_stress": "avgStressLevel", "max_stress": "maxStressLevel"}
+    ),
+    "get_body_battery": Projection(
+        {"body_battery_charged": "charged", "body_battery_drained": "drained"}
+    ),
+}
+
+COLUMNS = tuple(name for p in REPORT_FIELDS.values() for name in p.names) + (
+    "sleep_hours",
+    "distance_km",
+    "intensity_minutes",
+)
+
+
+def _days(start: date, end: date) -> list[date]:
+    return [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+
+def week_start(day: date) -> date:
+    return day - timedelta(days=day.weekday())
+
+
+def month_start(day: date) -> date:
+    return day.replace(day=1)
+
+
+def _month_end(day: date) -> date:
+    following = (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return following - timedelta(days=1)
+
+
+def build_row(payloads: dict[str, Any]) -> dict[str, Any]:
+    """Flatten the payloads of one day (keyed by endpoint) to a report row."""
+    row: dict[str, Any] = {}
+    for endpoint, projection in REPORT_FIELDS.items():
+        row.update(projection(payloads.get(endpoint)))
+    seconds = row["sleep_seconds"]
+    row["sleep_hours"] = round(seconds / 3600, 2) if seconds else None
+    distance = row["distance_m"]
+    row["distance_km"] = round(distance / 1000, 2) if distance is not None else None
+    minutes = [row["moderate_minutes"], row["vigorous_minutes"]]
+    row["intensity_minutes"] = (
+        sum(m for m in minutes if m is not None)
+        if any(m is not None for m in minutes)
+        else None
+    )
+    return row
+
+
+def summarize(rows: Iterable[dict[str, Any]]) -> dict[str, Any]:
+    """Return ``count``/``sum``/``mean``/``min``/``max`` of each numeric column.
+
+    Missing values are ignored, so ``mean`` is the average over the days
+    that have the value. ``days`` counts the rows with any value.
+    """
+    values: dict[str, list[float]] = {name: [] for name in COLUMNS}
+    days = 0
+    for row in rows:
+        present = False
+        for name in COLUMNS:
+            value = row.get(name)
+            if isinstance(value, int | float) and not isinstance(value, bool):
+                values[name].append(value)
+                present = True
+        days += present
+    summary: dict[str, Any] = {"days": days}
+    for name, column in values.items():
+        if not column:
+            continue
+        total = sum(column)
+        summary[name] = {
+            "count": len(column),
+            "sum": total,
+            "mean": total / len(column),
+            "min": min(column),
+            "max": max(column),
+        }
+    return summary
+
+
+class ReportData:
+    """Daily rows and period summaries from a sync store, API as fallback.
+
+    Pass :meth:`invalidate` to a :class:`~garminconnect.sync.SyncEngine` as a
+    listener so that cached rows and summaries of re-synced days are rebuilt.
+
+    :param api: (Optional) Client used for days missing from the store;
+        ``None`` works offline
+    :param hot_days: Most recent days that are always fetched from the API
+        (they still change during the day)
+    :param endpoints: (Optional) Keys of :data:`REPORT_FIELDS` to request
+        from the API; defaults to all of them
+    """
+
+    def __init__(
+        self,
+        sink: Sink,
+        account: str = "default",
+        api: Garmin | None = None,
+        hot_days: int = DEFAULT_HOT_DAYS,
+        today: date | None = None,
+        endpoints: Iterable[str] | None = None,
+    ) -> None:
+        if endpoints is None:
+            endpoints = REPORT_FIELDS
+        self.endpoints = frozenset(endpoints)
+        unknown = self.endpoints - REPORT_FIELDS.keys()
+        if unknown:
+            raise ValueError(f"Unknown report endpoints: {sorted(unknown)}")
+        self.sink = sink
+        self.account = account
+        self.api = api
+        self.hot_days = hot_days
+        self._today = today
+        self.requests = 0
+
+    @property
+    def today(self) -> date:
+        return self._today or date.today()
+
+    def _hot_after(self) -> date:
+        return self.today - timedelta(days=self.hot_days)
+
+    def daily(self, start: date, end: date) -> list[dict[str, Any]]:
+        """Return one row per day with data from ``start`` to ``end``."""
+        end = min(end, self.today)
+        if start > end:
+            return []
+        rows = self.sink.read(self.account, DAILY, start, end)
+        hot_after = self._hot_after() if self.api is not None else end
+        stale = [d for d in _days(start, end) if d not in rows or d > hot_after]
+        if stale:
+            rows.update(self._rebuild(stale))
+        return [
+            {"date": day, **rows[day]}
+            for day in sorted(rows)
+            if any(v is not None for v in rows[day].values())
+        ]
+
+    def summary(self, start: date, end: date) -> dict[str, Any]:
+        """Summarize any date range (see :func:`summarize`)."""
+        return {"start": start, "end": end, **summarize(self.daily(start, end))}
+
+    def weekly(self, start: date, end: date) -> list[dict[str, Any]]:
+        """Summaries of the calendar weeks (Monday first) overlapping the range."""
+        return self._periods(WEEK, week_start, start, end)
+
+    def monthly(self, start: date, end: date) -> list[dict[str, Any]]:
+        """Summaries of the calendar months overlapping the range."""
+        return self._periods(MONTH, month_start, start, end)
+
+    def _periods(
+        self, kind: str, period_of: Callable[[date], date], start: date, end: date
+    ) -> list[dict[str, Any]]:
+        end = min(end, self.today)
+        first = period_of(start)
+        starts = sorted({period_of(d) for d in _days(first, end)})
+        stored = self.sink.read(self.account, kind, first, end)
+        result = []
+        for begin in starts:
+            last = begin + timedelta(days=6) if kind == WEEK else _month_end(begin)
+            summary = stored.get(begin)
+            if summary is None:
+                summary = summarize(self.daily(begin, min(last, self.today)))
+                # periods still receiving days are not cached, nor ones with
+                # incomplete rows (only complete rows are cached)
+                if last <= self._hot_after() and self._complete(begin, last):
+                    self.sink.write(self.account, kind, [(begin, summary)])
+            result.append({"start": begin, "end": last, **summary})
+        return result
+
+    def _complete(self, start: date, end: date) -> bool:
+        cached = self.sink.read(self.account, DAILY, start, end)
+        return len(cached) == (end - start).days + 1
+
+    def invalidate(self, account: str, endpoint: str, days: list[date]) -> None:
+        """Drop cached rows and summaries of ``days`` (a sync listener)."""
+        if account != self.account or endpoint not in REPORT_FIELDS or not days:
+            return
+        self.sink.delete(self.account, DAILY, days)
+        self._drop_periods(days)
+
+    def _drop_periods(self, days: Iterable[date]) -> None:
+        for kind, period_of in ((WEEK, week_start), (MONTH, month_start)):
+            self.sink.delete(self.account, kind, {period_of(day) for day in days})
+
+    def _rebuild(self, days: list[date]) -> dict[date, dict[str, Any]]:
+        start, end = days[0], days[-1]
+        hot_after = self._hot_after()
+        payloads: dict[date, dict[str, Any]] = {day: {} for day in days}
+        for endpoint in REPORT_FIELDS:
+            stored = self.sink.read(self.account, endpoint, start, end)
+            if self.api is not None and endpoint in self.endpoints:
+                missing = [d for d in days if d not in stored or d > hot_after]
+                if missing:
+                    fetched = self._fetch(self.api, endpoint, missing)
+                    self.sink.write(self.account, endpoint, fetched.items())
+                    stored.update(fetched)
+            for day in days:
+                if day in stored:
+                    payloads[day][endpoint] = stored[day]
+
+        rows = {day: build_row(payloads[day]) for day in days}
+        # cache only rows built from every endpoint; the rest are rebuilt
+        complete = [
+            (day, rows[day])
+            for day in days
+            if len(payloads[day]) == len(REPORT_FIELDS) and day <= hot_after
+        ]
+        self.sink.write(self.account, DAILY, complete)
+        self._drop_periods([day for day, _ in complete])
+        return rows
+
+    def _fetch(self, api: Garmin, endpoint: str, days: list[date]) -> dict[date, Any]:
+        """Fetch ``days`` of ``endpoint``; days that fail are left out."""
+        fetched: dict[date, Any] = {}
+        if endpoint in RANGE_DATE_KEYS:
+            key = RANGE_DATE_KEYS[endpoint]
+            self.requests += 1
+            try:
+                entries = getattr(api, endpoint)(
+                    days[0].isoformat(), days[-1].isoformat()
+                )
+            except GarminConnectConnectionError as e:
+                logger.warning("Could not fetch %s for the report: %s", endpoint, e)
+                return fetched
+            by_day = {entry.get(key): entry for entry in entries or []}
+            for day in days:
+                fetched[day] = by_day.get(day.isoformat())
+            return fetched
+
+        method = getattr(api, endpoint)
+        for day in days:
+            self.requests += 1
+            try:
+                fetched[day] = method(day.isoformat())
+            except GarminConnectConnectionError as e:
+                logger.warning(
+                    "Could not fetch %s of %s for the report: %s", endpoint, day, e
+                )
+        return fetched
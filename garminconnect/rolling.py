@@ -0,0 +1,326 @@
+"""Incrementally maintained rolling aggregates of daily wellness metrics.
+
+:class:`RollingSeries` keeps 7/28/90-day windows (count, sum, mean, min, max
+and the change against the preceding window of the same length) and
+exponentially weighted moving averages of one daily metric. Appending a day
+costs O(number of windows): running sums are adjusted as values enter and
+leave each window and min/max come from monotonic queues. Revising one of
+the recent days (Garmin's settling window) is also cheap and exact.
+
+:class:`RollingAggregates` holds the series of one account, is persisted in
+a :class:`~garminconnect.sync.Sink` and plugs into
+:class:`~garminconnect.sync.SyncEngine` as a listener::
+
+    rolling = RollingAggregates(sink, "alice")
+    SyncEngine(api, sink, "alice", listeners=[rolling]).sync()
+    rolling.snapshot()["resting_hr"]["windows"][7]["mean"]
+
+Trend queries read the stored state, one record per account, so they cost
+the same however long the history is.
+"""
+
+from __future__ import annotations
+
+import logging
+from collections import deque
+from collections.abc import Iterable, Sequence
+from datetime import date, timedelta
+from typing import Any
+
+from .reports import build_row
+from .sync import Sink
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_WINDOWS = (7, 28, 90)
+STATE = "rolling:state"
+
+# metric -> endpoint it is derived from (see garminconnect.reports.build_row)
+METRIC_SOURCES = {
+    "sleep_hours": "get_sleep_data",
+    "sleep_score": "get_sleep_data",
+    "resting_hr": "get_heart_rates",
+    "steps": "get_user_summary",
+    "intensity_minutes": "get_user_summary",
+    "avg_stress": "get_stress_data",
+    "hrv_last_night": "get_hrv_data",
+}
+
+
+class RollingSeries:
+    """Rolling windows and EWMAs over one value per calendar day.
+
+    Days without a value are gaps: they age the windows but add nothing.
+    The last ``2 * max(windows)`` values are kept so that each window can
+    also report the window before it.
+
+    :param spans: EWMA spans in days (``alpha = 2 / (span + 1)``), defaults
+        to ``windows``
+    """
+
+    def __init__(
+        self,
+        windows: Sequence[int] = DEFAULT_WINDOWS,
+        spans: Sequence[int] | None = None,
+    ) -> None:
+        if not windows or min(windows) < 1:
+            raise ValueError("windows must be positive")
+        self.windows = tuple(sorted(set(windows)))
+        self.spans = tuple(sorted(set(spans or self.windows)))
+        self.capacity = 2 * self.windows[-1]
+        self.last: int | None = None  # ordinal of the newest day
+        self.values: deque[float | None] = deque(maxlen=self.capacity)
+        # EWMA after each kept day, so a revised day can be replayed exactly
+        self.history: deque[tuple[float | None, ...]] = deque(maxlen=self.capacity)
+        self._reset()
+
+    def _reset(self) -> None:
+        # per window: [sum, count] of the window and of the window before it
+        self._sums = {w: [0.0, 0, 0.0, 0] for w in self.windows}
+        self._min: dict[int, deque[tuple[int, float]]] = {
+            w: deque() for w in self.windows
+        }
+        self._max: dict[int, deque[tuple[int, float]]] = {
+            w: deque() for w in self.windows
+        }
+
+    def _at(self, age: int) -> float | None:
+        """Value of the day ``age`` days before the newest one."""
+        return self.values[-age - 1] if age < len(self.values) else None
+
+    def _ewma(self) -> tuple[float | None, ...]:
+        return self.history[-1] if self.history else (None,) * len(self.spans)
+
+    def push(self, day: date, value: float | None) -> bool:
+        """Add or revise the value of ``day``; False if it is too old to keep."""
+        ordinal = day.toordinal()
+        if self.last is None:
+            self.last = ordinal - 1
+        if ordinal <= self.last:
+            return self._revise(self.last, self.last - ordinal, value)
+        gap = min(ordinal - self.last - 1, self.capacity)
+        for index in range(ordinal - gap, ordinal):
+            self._append(index, None)
+        self._append(ordinal, value)
+        return True
+
+    def _append(self, index: int, value: float | None) -> None:
+        for w in self.windows:
+            sums = self._sums[w]
+            leaving = self._at(w - 1)  # moves into the previous window
+            dropped = self._at(2 * w - 1)  # leaves the previous window
+            if leaving is not None:
+                sums[0] -= leaving
+                sums[1] -= 1
+                sums[2] += leaving
+                sums[3] += 1
+            if dropped is not None:
+                sums[2] -= dropped
+                sums[3] -= 1
+            if value is not None:
+                sums[0] += value
+                sums[1] += 1
+            self._push_extremes(w, index, value)
+        self.values.append(value)
+        self.history.append(self._step(self._ewma(), value))
+        self.last = index
+
+    def _push_extremes(self, w: int, index: int, value: float | None) -> None:
+        lows, highs = self._min[w], self._max[w]
+        if value is not None:
+            while lows and lows[-1][1] >= value:
+                lows.pop()
+            lows.append((index, value))
+            while highs and highs[-1][1] <= value:
+                highs.pop()
+            highs.append((index, value))
+        while lows and lows[0][0] <= index - w:
+            lows.popleft()
+        while highs and highs[0][0] <= index - w:
+            highs.popleft()
+
+    def _step(
+        self, previous: tuple[float | None, ...], value: float | None
+    ) -> tuple[float | None, ...]:
+        if value is None:
+            return previous
+        return tuple(
+            value if e is None else e + 2 / (span + 1) * (value - e)
+            for e, span in zip(previous, self.spans, strict=True)
+        )
+
+    def _revise(self, newest: int, age: int, value: float | None) -> bool:
+        # age: days between the revised day and the newest one
+        if age >= len(self.values):
+            return False
+        old = self._at(age)
+        if old == value:
+            return True
+        self.values[-age - 1] = value
+        for w in self.windows:
+            if age < 2 * w:
+                offset = 0 if age < w else 2
+                sums = self._sums[w]
+                sums[offset] += (value or 0.0) - (old or 0.0)
+                sums[offset + 1] += (value is not None) - (old is not None)
+        self._rebuild_extremes(newest)
+        # replay the EWMAs from the day before the revised one
+        ewma = self.history[-age - 2] if age + 1 < len(self.history) else None
+        ewma = ewma or (None,) * len(self.spans)
+        for a in range(age, -1, -1):
+            ewma = self._step(ewma, self._at(a))
+            self.history[-a - 1] = ewma
+        return True
+
+    def _rebuild_extremes(self, newest: int) -> None:
+        first = newest - len(self.values) + 1
+        for w in self.windows:
+            self._min[w].clear()
+            self._max[w].clear()
+        for offset, value in enumerate(self.values):
+            for w in self.windows:
+                self._push_extremes(w, first + offset, value)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the current windows and EWMAs."""
+        windows = {}
+        for w in self.windows:
+            total, count, prev_total, prev_count = self._sums[w]
+            mean = total / count if count else None
+            prev_mean = prev_total / prev_count if prev_count else None
+            windows[w] = {
+                "count": count,
+                "sum": total,
+                "mean": mean,
+                "min": self._min[w][0][1] if self._min[w] else None,
+                "max": self._max[w][0][1] if self._max[w] else None,
+                "previous_mean": prev_mean,
+                "change": (
+                    mean - prev_mean
+                    if mean is not None and prev_mean is not None
+                    else None
+                ),
+            }
+        return {
+            "last": date.fromordinal(self.last) if self.last else None,
+            "windows": windows,
+            "ewma": dict(zip(self.spans, self._ewma(), strict=True)),
+        }
+
+    def to_dict(self) -> dict[str, Any]:
+        return {
+            "windows": list(self.windows),
+            "spans": list(self.spans),
+            "last": self.last,
+            "values": list(self.values),
+            "history": [list(e) for e in self.history],
+        }
+
+    @classmethod
+    def from_dict(cls, state: dict[str, Any]) -> RollingSeries:
+        series = cls(state["windows"], state["spans"])
+        series.last = state["last"]
+        series.values.extend(state["values"])
+        series.history.extend(tuple(e) for e in state["history"])
+        if series.last is not None:
+            # recompute the running sums from the kept values
+            for age in range(len(series.values)):
+                value = series._at(age)
+                if value is None:
+                    continue
+                for w in series.windows:
+                    if age < 2 * w:
+                        offset = 0 if age < w else 2
+                        series._sums[w][offset] += value
+                        series._sums[w][offset + 1] += 1
+            series._rebuild_extremes(series.last)
+        return series
+
+
+class RollingAggregates:
+    """Rolling series of one account, persisted in ``sink``.
+
+    Call it as a :class:`~garminconnect.sync.SyncEngine` listener, or feed
+    stored history with :meth:`ingest`.
+    """
+
+    def __init__(
+        self,
+        sink: Sink,
+        account: str = "default",
+        metrics: Iterable[str] = METRIC_SOURCES,
+        windows: Sequence[int] = DEFAULT_WINDOWS,
+    ) -> None:
+        self.sink = sink
+        self.account = account
+        self.metrics = tuple(metrics)
+        unknown = set(self.metrics) - set(METRIC_SOURCES)
+        if unknown:
+            raise ValueError(f"unknown metrics: {sorted(unknown)}")
+        self.windows = tuple(windows)
+        self._series: dict[str, RollingSeries] | None = None
+        self._saved_on: date | None = None
+
+    @property
+    def series(self) -> dict[str, RollingSeries]:
+        if self._series is None:
+            self._series = self._load()
+        return self._series
+
+    def _load(self) -> dict[str, RollingSeries]:
+        stored = self.sink.read(self.account, STATE, date.min, date.max)
+        series = {}
+        if stored:
+            self._saved_on, state = max(stored.items())
+            for name, data in state.items():
+                if name in self.metrics:
+                    series[name] = RollingSeries.from_dict(data)
+        for name in self.metrics:
+            series.setdefault(name, RollingSeries(self.windows))
+        return series
+
+    def save(self) -> None:
+        """Persist the state, keyed by the newest day it covers."""
+        newest = max(
+            (s.last for s in self.series.values() if s.last is not None), default=None
+        )
+        if newest is None:
+            return
+        day = date.fromordinal(newest)
+        if self._saved_on is not None and self._saved_on != day:
+            self.sink.delete(self.account, STATE, [self._saved_on])
+        state = {name: s.to_dict() for name, s in self.series.items()}
+        self.sink.write(self.account, STATE, [(day, state)])
+        self._saved_on = day
+
+    def ingest(self, endpoint: str, payloads: dict[date, Any]) -> int:
+        """Update the metrics derived from ``endpoint`` with payloads by day."""
+        names = [m for m in self.metrics if METRIC_SOURCES[m] == endpoint]
+        if not names:
+            return 0
+        updated = 0
+        for day in sorted(payloads):
+            row = build_row({endpoint: payloads[day]})
+            for name in names:
+                updated += self.series[name].push(day, row[name])
+        return updated
+
+    def __call__(self, account: str, endpoint: str, days: list[date]) -> None:
+        if account != self.account or not days:
+            return
+        payloads = self.sink.read(account, endpoint, min(days), max(days))
+        wanted = set(days)
+        if self.ingest(endpoint, {d: p for d, p in payloads.items() if d in wanted}):
+            self.save()
+
+    def rebuild(self, start: date, end: date) -> None:
+        """Recompute the state from the payloads stored for ``start..end``."""
+        self._series = {name: RollingSeries(self.windows) for name in self.metrics}
+        start = max(start, end - timedelta(days=2 * max(self.windows) - 1))
+        for endpoint in sorted({METRIC_SOURCES[m] for m in self.metrics}):
+            self.ingest(endpoint, self.sink.read(self.account, endpoint, start, end))
+        self.save()
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Current windows and EWMAs of every metric."""
+        return {name: s.snapshot() for name, s in self.series.items()}
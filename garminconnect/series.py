@@ -0,0 +1,452 @@
+"""Columnar (struct-of-arrays) decoders for Garmin Connect time series.
+
+The JSON responses of the time-series endpoints hold one Python list or dict
+per sample. The decoders in this module convert them in a single pass into
+NumPy arrays so that per-channel statistics can be computed vectorized.
+NumPy is an optional dependency - install it with: pip install numpy
+or: pip install garminconnect[analysis]
+"""
+
+from __future__ import annotations
+
+from collections.abc import Iterator
+from typing import TYPE_CHECKING, Any, TypeVar
+
+if TYPE_CHECKING:
+    import numpy as np
+else:
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+
+
+def _require_numpy() -> None:
+    if np is None:
+        raise ImportError(
+            "NumPy is required for array decoding - install it with: "
+            "pip install numpy or pip install garminconnect[analysis]"
+        )
+
+
+class ActivityDetails:
+    """Struct-of-arrays view of a ``get_activity_details`` response.
+
+    ``metrics`` maps each descriptor ``key`` to a contiguous float64 array
+    (missing samples are NaN), ``time`` holds ``directTimestamp`` as
+    ``datetime64[ms]`` and ``polyline`` is an ``(N, 2)`` float64 array of
+    latitude/longitude pairs.
+    """
+
+    def __init__(
+        self,
+        activity_id: int | None,
+        metrics: dict[str, np.ndarray],
+        units: dict[str, str | None],
+        polyline: np.ndarray,
+    ) -> None:
+        self.activity_id = activity_id
+        self.metrics = metrics
+        self.units = units
+        self.polyline = polyline
+        self.time: np.ndarray = np.empty(0, dtype="datetime64[ms]")
+        timestamps = metrics.get("directTimestamp")
+        if timestamps is not None:
+            # NaN timestamps cannot be cast, map them to NaT
+            valid = ~np.isnan(timestamps)
+            self.time = np.full(
+                timestamps.shape, np.datetime64("NaT"), "datetime64[ms]"
+            )
+            self.time[valid] = timestamps[valid].astype(np.int64)
+
+    def __len__(self) -> int:
+        return len(next(iter(self.metrics.values()), ()))
+
+    def __getitem__(self, key: str) -> np.ndarray:
+        return self.metrics[key]
+
+    def __contains__(self, key: object) -> bool:
+        return key in self.metrics
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self.metrics)
+
+    def keys(self) -> list[str]:
+        """Return the available metric keys."""
+        return list(self.metrics)
+
+    def stats(self, key: str) -> dict[str, float]:
+        """Return count, min, max, mean and std of one channel ignoring gaps."""
+        values = self.metrics[key]
+        valid = values[~np.isnan(values)]
+        if not valid.size:
+            nan = float("nan")
+            return {"count": 0, "min": nan, "max": nan, "mean": nan, "std": nan}
+        return {
+            "count": int(valid.size),
+            "min": float(valid.min()),
+            "max": float(valid.max()),
+            "mean": float(valid.mean()),
+            "std": float(valid.std()),
+        }
+
+
+def decode_activity_details(response: dict[str, Any]) -> ActivityDetails:
+    """Decode a ``get_activity_details`` response into an :class:`ActivityDetails`.
+
+    The nested ``activityDetailMetrics`` rows are converted with one NumPy
+    call; each descriptor's ``metricsIndex`` selects the matching column.
+    """
+
+    _require_numpy()
+    descriptors = response.get("metricDescriptors") or []
+    rows = response.get("activityDetailMetrics") or []
+    width = max((d["metricsIndex"] for d in descriptors), default=-1) + 1
+
+    # None becomes NaN when converting to a float array
+    padding = [None] * width
+    matrix = np.array(
+        [((r.get("metrics") or []) + padding)[:width] for r in rows],
+        dtype=np.float64,
+    ).reshape(len(rows), width)
+
+    metrics: dict[str, np.ndarray] = {}
+    units: dict[str, str | None] = {}
+    for descriptor in descriptors:
+        key = descriptor["key"]
+        metrics[key] = np.ascontiguousarray(matrix[:, descriptor["metricsIndex"]])
+        units[key] = (descriptor.get("unit") or {}).get("key")
+    del matrix
+
+    points = (response.get("geoPolylineDTO") or {}).get("polyline") or []
+    polyline = np.array(
+        [(p.get("lat"), p.get("lon")) for p in points], dtype=np.float64
+    ).reshape(len(points), 2)
+
+    return ActivityDetails(response.get("activityId"), metrics, units, polyline)
+
+
+def _decode_rows(
+    rows: list[list[Any]] | None,
+    value_index: int,
+    dtype: Any,
+    missing: tuple[float, ...] = (),
+) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Split ``[[epoch_ms, ..., value, ...], ...]`` rows into typed arrays.
+
+    Returns timestamps, values and a mask that is True where the value was
+    missing (``None`` or one of the ``missing`` sentinels); masked values are
+    stored as 0.
+    """
+
+    if not rows:
+        return (
+            np.empty(0, dtype=np.int64),
+            np.empty(0, dtype=dtype),
+            np.empty(0, dtype=bool),
+        )
+    raw = np.array(
+        [(r[0], r[value_index] if len(r) > value_index else None) for r in rows],
+        dtype=np.float64,
+    ).reshape(len(rows), 2)
+    values = raw[:, 1]
+    mask = np.isnan(values) | np.isin(values, missing)
+    return (
+        raw[:, 0].astype(np.int64),
+        np.where(mask, 0, values).astype(dtype),
+        mask,
+    )
+
+
+def _descriptor_index(
+    descriptors: list[dict[str, Any]] | None,
+    key: str,
+    default: int,
+    key_field: str = "key",
+    index_field: str = "index",
+) -> int:
+    for descriptor in descriptors or []:
+        if descriptor.get(key_field) == key:
+            return int(descriptor.get(index_field, default))
+    return default
+
+
+def _sample_durations(timestamps: np.ndarray, max_gap_ms: int) -> np.ndarray:
+    """Return the duration in ms each sample stands for.
+
+    A sample covers the time until the next one, capped at ``max_gap_ms`` so
+    that gaps in wear time are not counted; the last sample gets the median
+    sampling interval.
+    """
+
+    if timestamps.size == 0:
+        return np.empty(0, dtype=np.int64)
+    gaps = np.diff(timestamps)
+    last = int(np.median(gaps)) if gaps.size else 0
+    return np.minimum(np.append(gaps, last), max_gap_ms).clip(min=0)
+
+
+class SampledSeries:
+    """Compact time series of small integer samples.
+
+    ``timestamps`` holds epoch milliseconds (int64), ``values`` the samples
+    as uint8 and ``mask`` is True for samples without a reading. Series for
+    several days can be joined with :meth:`concat`.
+    """
+
+    DEFAULT_MAX_GAP_MS = 3 * 60 * 1000
+
+    def __init__(
+        self, timestamps: np.ndarray, values: np.ndarray, mask: np.ndarray
+    ) -> None:
+        self.timestamps = timestamps
+        self.values = values
+        self.mask = mask
+
+    @classmethod
+    def empty(cls: type[_S]) -> _S:
+        """Return a series without samples."""
+        _require_numpy()
+        return cls(*_decode_rows(None, 1, np.uint8))
+
+    @classmethod
+    def concat(cls: type[_S], series: list[_S]) -> _S:
+        """Join several series (e.g. one per day) into one sorted series."""
+        _require_numpy()
+        if not series:
+            return cls.empty()
+        timestamps = np.concatenate([s.timestamps for s in series])
+        order = np.argsort(timestamps, kind="stable")
+        return cls(
+            timestamps[order],
+            np.concatenate([s.values for s in series])[order],
+            np.concatenate([s.mask for s in series])[order],
+        )
+
+    def __len__(self) -> int:
+        return int(self.timestamps.size)
+
+    @property
+    def valid(self) -> np.ndarray:
+        """Boolean array, True where a reading is present."""
+        return ~self.mask
+
+    def max(self) -> int | None:
+        """Return the highest recorded value."""
+        values = self.values[~self.mask]
+        return int(values.max()) if values.size else None
+
+    def min(self) -> int | None:
+        """Return the lowest recorded value."""
+        values = self.values[~self.mask]
+        return int(values.min()) if values.size else None
+
+    def durations(self, max_gap_ms: int | None = None) -> np.ndarray:
+        """Return the duration in ms covered by each sample."""
+        return _sample_durations(
+            self.timestamps,
+            self.DEFAULT_MAX_GAP_MS if max_gap_ms is None else max_gap_ms,
+        )
+
+    def time_in_bins(
+        self, bounds: list[int] | tuple[int, ...], max_gap_ms: int | None = None
+    ) -> np.ndarray:
+        """Return milliseconds spent in each bin.
+
+        ``bounds`` are ascending lower bin limits; the result has
+        ``len(bounds) + 1`` entries, the first being time below ``bounds[0]``.
+        Missing samples are ignored.
+        """
+        bins = np.searchsorted(np.asarray(bounds), self.values, side="right")
+        weights = np.where(self.mask, 0, self.durations(max_gap_ms))
+        return np.bincount(bins, weights=weights, minlength=len(bounds) + 1).astype(
+            np.int64
+        )
+
+    def periods_above(
+        self,
+        threshold: int,
+        min_duration_ms: int = 0,
+        max_gap_ms: int | None = None,
+    ) -> list[tuple[int, int]]:
+        """Return ``(start_ms, end_ms)`` of contiguous periods at or above
+        ``threshold``.
+
+        A period is broken by a sample below the threshold, a missing reading
+        or a gap between samples longer than ``max_gap_ms``.
+        """
+        if max_gap_ms is None:
+            max_gap_ms = self.DEFAULT_MAX_GAP_MS
+        n = len(self)
+        above = (self.values >= threshold) & ~self.mask
+        # a sample continues a period when it and its predecessor are above
+        # the threshold and close enough together
+        cont = np.zeros(n, dtype=bool)
+        cont[1:] = above[1:] & above[:-1] & (np.diff(self.timestamps) <= max_gap_ms)
+        starts = np.flatnonzero(above & ~cont)
+        breaks = np.append(np.flatnonzero(~cont), n)
+        ends = breaks[np.searchsorted(breaks, starts, side="right")]
+        durations = self.durations(max_gap_ms)
+        periods = []
+        for start, end in zip(starts.tolist(), ends.tolist(), strict=False):
+            period_end = int(self.timestamps[end - 1] + durations[end - 1])
+            if period_end - int(self.timestamps[start]) >= min_duration_ms:
+                periods.append((int(self.timestamps[start]), period_end))
+        return periods
+
+    def resample(self: _S, interval_ms: int) -> _S:
+        """Return the series averaged into fixed ``interval_ms`` buckets."""
+        if interval_ms <= 0:
+            raise ValueError("interval_ms must be positive")
+        valid = ~self.mask
+        if not valid.any():
+            return self.empty()
+        ts = self.timestamps[valid]
+        origin = int(ts[0]) - int(ts[0]) % interval_ms
+        buckets = (ts - origin) // interval_ms
+        sums = np.bincount(buckets, weights=self.values[valid])
+        counts = np.bincount(buckets)
+        filled = counts > 0
+        means = np.zeros(counts.size)
+        means[filled] = sums[filled] / counts[filled]
+        return type(self)(
+            origin + np.arange(counts.size, dtype=np.int64) * interval_ms,
+            np.rint(means).astype(self.values.dtype),
+            ~filled,
+        )
+
+    def daily_extremes(
+        self, utc_offset_ms: int = 0
+    ) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Return ``(days, minimum, maximum)`` per calendar day.
+
+        ``days`` is a ``datetime64[D]`` array; ``utc_offset_ms`` shifts the
+        timestamps to local time before splitting into days. Days without a
+        reading are omitted.
+        """
+        valid = ~self.mask
+        ts = self.timestamps[valid] + utc_offset_ms
+        values = self.values[valid]
+        if not ts.size:
+            return (
+                np.empty(0, dtype="datetime64[D]"),
+                np.empty(0, dtype=self.values.dtype),
+                np.empty(0, dtype=self.values.dtype),
+            )
+        day = ts // 86_400_000
+        # samples are sorted, so each day is one contiguous block
+        starts = np.flatnonzero(np.diff(day, prepend=day[0] - 1))
+        return (
+            day[starts].astype("datetime64[D]"),
+            np.minimum.reduceat(values, starts),
+            np.maximum.reduceat(values, starts),
+        )
+
+
+_S = TypeVar("_S", bound=SampledSeries)
+
+
+class HeartRateSeries(SampledSeries):
+    """Heart-rate time series; ``bpm`` is an alias of ``values``."""
+
+    # Garmin reports all-day heart rate every two minutes
+    DEFAULT_MAX_GAP_MS = 2 * 60 * 1000
+
+    @classmethod
+    def from_response(cls, response: dict[str, Any] | None) -> HeartRateSeries:
+        """Decode the ``heartRateValues`` of a ``get_heart_rates`` response."""
+        _require_numpy()
+        rows = (response or {}).get("heartRateValues")
+        return cls(*_decode_rows(rows, 1, np.uint8))
+
+    @property
+    def bpm(self) -> np.ndarray:
+        return self.values
+
+    def time_in_zones(
+        self, bounds: list[int] | tuple[int, ...], max_gap_ms: int | None = None
+    ) -> np.ndarray:
+        """Return milliseconds spent in each heart-rate zone.
+
+        ``bounds`` are ascending lower zone limits in bpm, see
+        :meth:`SampledSeries.time_in_bins`.
+        """
+        return self.time_in_bins(bounds, max_gap_ms)
+
+
+class StressSeries(SampledSeries):
+    """All-day stress level series (0-100).
+
+    Off-wrist (-1) and too-active (-2) readings are masked.
+    """
+
+    # Garmin stress categories, lower bounds of low, medium and high stress
+    CATEGORY_BOUNDS = (26, 51, 76)
+    CATEGORIES = ("rest", "low", "medium", "high")
+
+    @classmethod
+    def from_response(cls, response: dict[str, Any] | None) -> StressSeries:
+        """Decode ``stressValuesArray`` of a ``get_stress_data`` or
+        ``get_all_day_stress`` response."""
+        _require_numpy()
+        response = response or {}
+        index = _descriptor_index(
+            response.get("stressValueDescriptorsDTOList"), "stressLevel", 1
+        )
+        rows = response.get("stressValuesArray")
+        return cls(*_decode_rows(rows, index, np.uint8, missing=(-1, -2)))
+
+    @property
+    def level(self) -> np.ndarray:
+        return self.values
+
+    def time_in_categories(self, max_gap_ms: int | None = None) -> dict[str, int]:
+        """Return milliseconds spent at rest and in low/medium/high stress."""
+        totals = self.time_in_bins(self.CATEGORY_BOUNDS, max_gap_ms)
+        return dict(zip(self.CATEGORIES, totals.tolist(), strict=True))
+
+
+class BodyBatterySeries(SampledSeries):
+    """Body-battery level series (0-100)."""
+
+    @classmethod
+    def from_response(cls, response: dict[str, Any] | None) -> BodyBatterySeries:
+        """Decode ``bodyBatteryValuesArray`` of a ``get_stress_data`` or
+        ``get_all_day_stress`` response."""
+        _require_numpy()
+        response = response or {}
+        index = _descriptor_index(
+            response.get("bodyBatteryValueDescriptorsDTOList"),
+            "bodyBatteryLevel",
+            2,
+            key_field="bodyBatteryValueDescriptorKey",
+            index_field="bodyBatteryValueDescriptorIndex",
+        )
+        rows = response.get("bodyBatteryValuesArray")
+        return cls(*_decode_rows(rows, index, np.uint8))
+
+    @property
+    def level(self) -> np.ndarray:
+        return self.values
+
+    def slopes(self, max_gap_ms: int | None = None) -> np.ndarray:
+        """Return the change in level per hour between consecutive readings.
+
+        The result has one entry per pair of readings; pairs further apart
+        than ``max_gap_ms`` are NaN.
+        """
+        if max_gap_ms is None:
+            max_gap_ms = self.DEFAULT_MAX_GAP_MS
+        valid = ~self.mask
+        ts = self.timestamps[valid]
+        level = self.values[valid].astype(np.float64)
+        gaps = np.diff(ts).astype(np.float64)
+        with np.errstate(divide="ignore", invalid="ignore"):
+            slopes = np.diff(level) / gaps * 3_600_000
+        slopes[(gaps <= 0) | (gaps > max_gap_ms)] = np.nan
+        return slopes
+
+    def charge_drain(self) -> tuple[int, int]:
+        """Return total ``(charged, drained)`` levels over the series."""
+        deltas = np.diff(self.values[~self.mask].astype(np.int16))
+        return int(deltas[deltas > 0].sum()), int(-deltas[deltas < 0].sum())
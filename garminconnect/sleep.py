@@ -0,0 +1,204 @@
+"""Run-length encoded sleep stages and vectorized sleep analytics.
+
+``get_sleep_data`` describes the night as a list of ``sleepLevels`` intervals.
+:class:`SleepSeries` keeps those intervals for many nights in a handful of
+flat NumPy arrays (one entry per stage run) plus an index of where each night
+starts, so years of nights fit in a few hundred kilobytes and the statistics
+below are computed without Python loops over the intervals.
+Requires the optional numpy dependency.
+"""
+
+from __future__ import annotations
+
+from typing import Any
+
+from .series import _require_numpy, np
+
+# activityLevel values used by sleepLevels
+DEEP = 0
+LIGHT = 1
+REM = 2
+AWAKE = 3
+STAGES = ("deep", "light", "rem", "awake")
+
+_MS_PER_DAY = 86_400_000
+_MS_PER_MINUTE = 60_000
+
+
+class SleepSeries:
+    """Sleep stage runs for one or more nights.
+
+    Per run: ``run_start`` (epoch ms, GMT), ``run_seconds`` (int32) and
+    ``run_stage`` (int8, see :data:`STAGES`). Per night: ``dates``
+    (``datetime64[D]`` calendar date), ``start``/``end`` (epoch ms, GMT),
+    ``utc_offset_ms`` and ``offsets`` - night ``i`` owns the runs
+    ``offsets[i]:offsets[i + 1]``.
+    """
+
+    def __init__(
+        self,
+        dates: np.ndarray,
+        start: np.ndarray,
+        end: np.ndarray,
+        utc_offset_ms: np.ndarray,
+        offsets: np.ndarray,
+        run_start: np.ndarray,
+        run_seconds: np.ndarray,
+        run_stage: np.ndarray,
+    ) -> None:
+        self.dates = dates
+        self.start = start
+        self.end = end
+        self.utc_offset_ms = utc_offset_ms
+        self.offsets = offsets
+        self.run_start = run_start
+        self.run_seconds = run_seconds
+        self.run_stage = run_stage
+
+    @classmethod
+    def from_responses(cls, responses: list[dict[str, Any] | None]) -> SleepSeries:
+        """Decode ``get_sleep_data`` responses, one per night.
+
+        Nights without a recorded sleep window are skipped.
+        """
+        _require_numpy()
+        dates, start, end, offset = [], [], [], []
+        runs: list[tuple[str, str, float]] = []
+        counts = [0]
+        for response in responses:
+            dto = (response or {}).get("dailySleepDTO") or {}
+            if not dto.get("sleepStartTimestampGMT") or not dto.get(
+                "sleepEndTimestampGMT"
+            ):
+                continue
+            levels = (response or {}).get("sleepLevels") or []
+            runs.extend(
+                (lvl["startGMT"], lvl["endGMT"], lvl.get("activityLevel", AWAKE))
+                for lvl in levels
+            )
+            counts.append(len(levels))
+            dates.append(dto.get("calendarDate"))
+            start.append(dto["sleepStartTimestampGMT"])
+            end.append(dto["sleepEndTimestampGMT"])
+            local = dto.get("sleepStartTimestampLocal")
+            offset.append(local - dto["sleepStartTimestampGMT"] if local else 0)
+
+        if runs:
+            starts, ends, stages = zip(*runs, strict=True)
+            run_start = np.array(starts, dtype="datetime64[ms]").astype(np.int64)
+            run_end = np.array(ends, dtype="datetime64[ms]").astype(np.int64)
+            run_stage = np.rint(np.array(stages, dtype=np.float64)).astype(np.int8)
+        else:
+            run_start = run_end = np.empty(0, dtype=np.int64)
+            run_stage = np.empty(0, dtype=np.int8)
+
+        return cls(
+            np.array(dates, dtype="datetime64[D]"),
+            np.array(start, dtype=np.int64),
+            np.array(end, dtype=np.int64),
+            np.array(offset, dtype=np.int64),
+            np.cumsum(counts, dtype=np.int64),
+            run_start,
+            ((run_end - run_start) // 1000).astype(np.int32),
+            run_stage,
+        )
+
+    @classmethod
+    def concat(cls, series: list[SleepSeries]) -> SleepSeries:
+        """Join several series in the given order."""
+        _require_numpy()
+        if not series:
+            return cls.from_responses([])
+        run_counts = [s.run_start.size for s in series]
+        bases = np.cumsum([0] + run_counts[:-1])
+        offsets = np.concatenate(
+            [[0]]
+            + [s.offsets[1:] + base for s, base in zip(series, bases, strict=True)]
+        )
+        return cls(
+            np.concatenate([s.dates for s in series]),
+            np.concatenate([s.start for s in series]),
+            np.concatenate([s.end for s in series]),
+            np.concatenate([s.utc_offset_ms for s in series]),
+            offsets.astype(np.int64),
+            np.concatenate([s.run_start for s in series]),
+            np.concatenate([s.run_seconds for s in series]),
+            np.concatenate([s.run_stage for s in series]),
+        )
+
+    def __len__(self) -> int:
+        return int(self.dates.size)
+
+    def _night_of_run(self) -> np.ndarray:
+        return np.repeat(np.arange(len(self)), np.diff(self.offsets))
+
+    def stage_seconds(self) -> np.ndarray:
+        """Return an ``(nights, 4)`` array of seconds per stage (see STAGES)."""
+        index = self._night_of_run() * len(STAGES) + self.run_stage.clip(0, AWAKE)
+        totals = np.bincount(
+            index, weights=self.run_seconds, minlength=len(self) * len(STAGES)
+        )
+        return totals.astype(np.int64).reshape(len(self), len(STAGES))
+
+    def sleep_seconds(self) -> np.ndarray:
+        """Return the time asleep (all stages but awake) per night."""
+        return self.stage_seconds()[:, :AWAKE].sum(axis=1)
+
+    def awakenings(self) -> np.ndarray:
+        """Return the number of awake runs inside each night's sleep window."""
+        awake = self.run_stage == AWAKE
+        inside = (self.run_start > np.repeat(self.start, np.diff(self.offsets))) & (
+            self.run_start < np.repeat(self.end, np.diff(self.offsets))
+        )
+        return np.bincount(
+            self._night_of_run()[awake & inside], minlength=len(self)
+        ).astype(np.int64)
+
+    def fragmentation(self) -> np.ndarray:
+        """Return awakenings per hour of sleep for each night."""
+        hours = self.sleep_seconds() / 3600
+        with np.errstate(divide="ignore", invalid="ignore"):
+            return np.where(hours > 0, self.awakenings() / hours, np.nan)
+
+    def _local_minutes(self, epoch_ms: np.ndarray) -> np.ndarray:
+        """Minutes after local noon, so nights do not wrap at midnight."""
+        local = epoch_ms + self.utc_offset_ms - _MS_PER_DAY // 2
+        return (local % _MS_PER_DAY) / _MS_PER_MINUTE
+
+    def onset_minutes(self) -> np.ndarray:
+        """Return sleep onset per night as minutes after local noon."""
+        return self._local_minutes(self.start)
+
+    def midpoint_minutes(self) -> np.ndarray:
+        """Return the sleep midpoint per night as minutes after local noon."""
+        return self._local_minutes((self.start + self.end) // 2)
+
+    def onset_regularity(self) -> float:
+        """Return the standard deviation of sleep onset in minutes."""
+        onsets = self.onset_minutes()
+        return float(onsets.std()) if onsets.size else float("nan")
+
+    def midpoint_drift(self) -> float:
+        """Return the trend of the sleep midpoint in minutes per day.
+
+        Positive values mean the midpoint moves later over the range.
+        """
+        if len(self) < 2:
+            return float("nan")
+        days = self.dates.astype(np.int64).astype(np.float64)
+        slope, _intercept = np.polyfit(days, self.midpoint_minutes(), 1)
+        return float(slope)
+
+    def summary(self) -> dict[str, float]:
+        """Return mean stage minutes plus regularity statistics over all nights."""
+        if not len(self):
+            return {}
+        means = self.stage_seconds().mean(axis=0) / 60
+        result = {
+            f"{name}_minutes": float(v) for name, v in zip(STAGES, means, strict=True)
+        }
+        result["sleep_hours"] = float(self.sleep_seconds().mean() / 3600)
+        result["fragmentation"] = float(np.nanmean(self.fragmentation()))
+        result["onset_std_minutes"] = self.onset_regularity()
+        result["midpoint_drift_minutes_per_day"] = self.midpoint_drift()
+        return result
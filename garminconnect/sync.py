@@ -0,0 +1,408 @@
+"""Incremental sync of daily endpoints into a local store.
+
+:class:`SyncEngine` keeps a watermark per (account, endpoint): the last day
+whose data is considered final. A sync fetches the days after the watermark
+plus the last ``settle_days`` days, which Garmin may still revise (late
+device uploads, sleep re-scoring), and writes one record per day to a
+:class:`Sink`. After the first run a daily sync therefore costs a constant
+number of requests per endpoint, however long the stored history is::
+
+    sink = SQLiteSink("~/.garminconnect/sync.db")
+    engine = SyncEngine(api, sink, account="alice", settle_days=3)
+    engine.sync()  # first run: the last ``history_days`` days
+    engine.sync()  # later runs: the settling window and any new days
+
+Endpoints are named by their ``Garmin`` method (see
+:mod:`garminconnect.endpoints`). Date-keyed endpoints cost one request per
+day; the range endpoints in :data:`RANGE_DATE_KEYS` fetch the whole window in
+one request and are split into days by their date field. Without an
+explicit list the engine syncs :data:`DEFAULT_ENDPOINTS`.
+
+A day that fails with a connection error is recorded under
+``sync:failures:<endpoint>`` and the remaining days are still fetched. The
+watermark stops before the failed day until it succeeds or has failed
+:data:`MAX_DAY_ATTEMPTS` times; it is then stored as an empty (``None``)
+payload, e.g. a day without floors data.
+
+Sinks: :class:`SQLiteSink` (built in) and :class:`PostgresSink`, which wraps
+an open DB-API connection such as one from ``psycopg2.connect``.
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable, Iterable, Sequence
+from datetime import date, timedelta
+from pathlib import Path
+from typing import Any, NamedTuple
+
+from . import Garmin, GarminConnectConnectionError
+from .endpoints import DATE, DISPLAY_NAME, ENDPOINTS, endpoints_keyed_by
+from .lazyjson import json_default
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_SETTLE_DAYS = 3
+DEFAULT_HISTORY_DAYS = 30
+MAX_DAY_ATTEMPTS = 3  # failed fetches of one day before it is stored empty
+FAILURES = "sync:failures"
+
+# range endpoints that can be split into days: method name -> date field
+RANGE_DATE_KEYS = {
+    "get_body_battery": "date",
+    "get_daily_steps": "calendarDate",
+}
+
+DAILY_ENDPOINTS = endpoints_keyed_by(DATE) | endpoints_keyed_by(DISPLAY_NAME, DATE)
+
+# the daily health metrics most reports use; any DAILY_ENDPOINTS can be synced
+DEFAULT_ENDPOINTS = (
+    "get_user_summary",
+    "get_sleep_data",
+    "get_heart_rates",
+    "get_hrv_data",
+    "get_stress_data",
+    "get_training_readiness",
+    "get_training_status",
+    "get_body_battery",
+)
+
+SyncListener = Callable[[str, str, list[date]], None]
+
+
+def _as_date(value: date | str) -> date:
+    return value if isinstance(value, date) else date.fromisoformat(str(value)[:10])
+
+
+def _days(start: date, end: date) -> list[date]:
+    return [start + timedelta(days=i) for i in range((end - start).days + 1)]
+
+
+class Sink(ABC):
+    """Interface of a sync store; subclasses implement all methods."""
+
+    @abstractmethod
+    def get_watermark(self, account: str, endpoint: str) -> date | None:
+        """Return the last settled day of an endpoint, or ``None``."""
+
+    @abstractmethod
+    def set_watermark(self, account: str, endpoint: str, day: date) -> None:
+        """Record ``day`` as the last settled day of an endpoint."""
+
+    @abstractmethod
+    def write(
+        self, account: str, endpoint: str, records: Iterable[tuple[date, Any]]
+    ) -> int:
+        """Upsert ``(day, payload)`` records and return how many were written."""
+
+    @abstractmethod
+    def read(
+        self, account: str, endpoint: str, start: date, end: date
+    ) -> dict[date, Any]:
+        """Return the stored payloads of ``start`` to ``end`` keyed by day."""
+
+    @abstractmethod
+    def delete(self, account: str, endpoint: str, days: Iterable[date]) -> None:
+        """Remove the records of ``days``."""
+
+
+class SQLSink(Sink):
+    """Sink over a DB-API connection; subclasses set the dialect."""
+
+    PARAM = "?"
+    PAYLOAD_TYPE = "TEXT"
+
+    def __init__(self, conn: Any) -> None:
+        self.conn = conn
+        self._lock = threading.Lock()
+        self._create_tables()
+
+    def _sql(self, statement: str) -> str:
+        return statement.replace("?", self.PARAM)
+
+    def _create_tables(self) -> None:
+        with self._lock:
+            cur = self.conn.cursor()
+            cur.execute(
+                "CREATE TABLE IF NOT EXISTS garmin_sync_state ("
+                "account TEXT NOT NULL, endpoint TEXT NOT NULL, "
+                "watermark DATE NOT NULL, updated_at REAL NOT NULL, "
+                "PRIMARY KEY (account, endpoint))"
+            )
+            cur.execute(
+                "CREATE TABLE IF NOT EXISTS garmin_sync_data ("
+                "account TEXT NOT NULL, endpoint TEXT NOT NULL, day DATE NOT NULL, "
+                f"payload {self.PAYLOAD_TYPE}, fetched_at REAL NOT NULL, "
+                "PRIMARY KEY (account, endpoint, day))"
+            )
+            self.conn.commit()
+
+    def get_watermark(self, account: str, endpoint: str) -> date | None:
+        with self._lock:
+            cur = self.conn.cursor()
+            cur.execute(
+                self._sql(
+                    "SELECT watermark FROM garmin_sync_state "
+                    "WHERE account = ? AND endpoint = ?"
+                ),
+                (account, endpoint),
+            )
+            row = cur.fetchone()
+        return _as_date(row[0]) if row else None
+
+    def set_watermark(self, account: str, endpoint: str, day: date) -> None:
+        with self._lock:
+            self.conn.cursor().execute(
+                self._sql(
+                    "INSERT INTO garmin_sync_state "
+                    "(account, endpoint, watermark, updated_at) VALUES (?, ?, ?, ?) "
+                    "ON CONFLICT (account, endpoint) DO UPDATE SET "
+                    "watermark = excluded.watermark, updated_at = excluded.updated_at"
+                ),
+                (account, endpoint, day.isoformat(), time.time()),
+            )
+            self.conn.commit()
+
+    def write(
+        self, account: str, endpoint: str, records: Iterable[tuple[date, Any]]
+    ) -> int:
+        now = time.time()
+        rows = [
+            (
+                account,
+                endpoint,
+                day.isoformat(),
+                json.dumps(payload, default=json_default),
+                now,
+            )
+            for day, payload in records
+        ]
+        if not rows:
+            return 0
+        with self._lock:
+            self.conn.cursor().executemany(
+                self._sql(
+                    "INSERT INTO garmin_sync_data "
+                    "(account, endpoint, day, payload, fetched_at) "
+                    "VALUES (?, ?, ?, ?, ?) "
+                    "ON CONFLICT (account, endpoint, day) DO UPDATE SET "
+                    "payload = excluded.payload, fetched_at = excluded.fetched_at"
+                ),
+                rows,
+            )
+            self.conn.commit()
+        return len(rows)
+
+    def read(
+        self, account: str, endpoint: str, start: date, end: date
+    ) -> dict[date, Any]:
+        with self._lock:
+            cur = self.conn.cursor()
+            cur.execute(
+                self._sql(
+                    "SELECT day, payload FROM garmin_sync_data "
+                    "WHERE account = ? AND endpoint = ? AND day BETWEEN ? AND ? "
+                    "ORDER BY day"
+                ),
+                (account, endpoint, start.isoformat(), end.isoformat()),
+            )
+            rows = cur.fetchall()
+        return {
+            _as_date(day): json.loads(payload) if isinstance(payload, str) else payload
+            for day, payload in rows
+        }
+
+    def delete(self, account: str, endpoint: str, days: Iterable[date]) -> None:
+        rows = [(account, endpoint, day.isoformat()) for day in days]
+        if not rows:
+            return
+        with self._lock:
+            self.conn.cursor().executemany(
+                self._sql(
+                    "DELETE FROM garmin_sync_data "
+                    "WHERE account = ? AND endpoint = ? AND day = ?"
+                ),
+                rows,
+            )
+            self.conn.commit()
+
+    def close(self) -> None:
+        self.conn.close()
+
+
+class SQLiteSink(SQLSink):
+    """Sink in an SQLite database file (or ``":memory:"``)."""
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        import sqlite3
+
+        self.path = str(Path(path).expanduser()) if path != ":memory:" else path
+        if self.path != ":memory:":
+            Path(self.path).parent.mkdir(parents=True, exist_ok=True)
+        super().__init__(sqlite3.connect(self.path, check_same_thread=False))
+
+
+class PostgresSink(SQLSink):
+    """Sink in PostgreSQL through an open DB-API connection (e.g. psycopg2)."""
+
+    PARAM = "%s"
+    PAYLOAD_TYPE = "JSONB"
+
+
+class SyncReport(NamedTuple):
+    """Outcome of syncing one endpoint."""
+
+    endpoint: str
+    start: date | None
+    end: date
+    written: int
+    watermark: date | None
+    error: str | None = None
+
+
+class SyncEngine:
+    """Sync daily endpoints of one account into ``sink``.
+
+    :param account: Key the records and watermarks are stored under
+    :param endpoints: (Optional) ``Garmin`` method names, defaults to
+        :data:`DEFAULT_ENDPOINTS`; of endpoints requesting the same URL only
+        the first is synced
+    :param settle_days: Recent days that are fetched again on every sync
+    :param history_days: Days fetched by the first sync of an endpoint
+    :param listeners: Callables ``(account, endpoint, days)`` notified after
+        records are written, e.g. to update derived data
+    """
+
+    def __init__(
+        self,
+        api: Garmin,
+        sink: Sink,
+        account: str = "default",
+        endpoints: Sequence[str] | None = None,
+        settle_days: int = DEFAULT_SETTLE_DAYS,
+        history_days: int = DEFAULT_HISTORY_DAYS,
+        listeners: Iterable[SyncListener] = (),
+    ) -> None:
+        if settle_days < 0 or history_days < 1:
+            raise ValueError("settle_days must be >= 0 and history_days >= 1")
+        if endpoints is None:
+            endpoints = DEFAULT_ENDPOINTS
+        unique: dict[Any, str] = {}
+        for name in endpoints:
+            if name not in DAILY_ENDPOINTS and name not in RANGE_DATE_KEYS:
+                raise ValueError(f"{name!r} is not a daily endpoint that can be synced")
+            same = unique.setdefault(ENDPOINTS[name], name)
+            if same != name:
+                logger.info("Skipping %s, it requests the same URL as %s", name, same)
+        self.api = api
+        self.sink = sink
+        self.account = account
+        self.endpoints = list(unique.values())
+        self.settle_days = settle_days
+        self.history_days = history_days
+        self.listeners = list(listeners)
+
+    def pending(self, endpoint: str, today: date | None = None) -> list[date]:
+        """Return the days the next sync of ``endpoint`` will fetch."""
+        today = today or date.today()
+        watermark = self.sink.get_watermark(self.account, endpoint)
+        if watermark is None:
+            start = today - timedelta(days=self.history_days - 1)
+        else:
+            settled = today - timedelta(days=self.settle_days)
+            start = min(watermark, settled) + timedelta(days=1)
+        return _days(start, today) if start <= today else []
+
+    def sync(self, today: date | str | None = None) -> list[SyncReport]:
+        """Sync every endpoint up to ``today`` and return one report each.
+
+        A connection error on one day is recorded and the other days are
+        still fetched; the watermark stops before the failed day until it
+        succeeds or has failed :data:`MAX_DAY_ATTEMPTS` times. For a range
+        endpoint it stops the whole endpoint. Rate limit and authentication
+        errors are raised after saving the progress so far.
+        """
+        today = _as_date(today) if today else date.today()
+        return [self.sync_endpoint(name, today) for name in self.endpoints]
+
+    def sync_endpoint(self, endpoint: str, today: date) -> SyncReport:
+        days = self.pending(endpoint, today)
+        old = self.sink.get_watermark(self.account, endpoint)
+        if not days:
+            return SyncReport(endpoint, None, today, 0, old)
+
+        records: list[tuple[date, Any]] = []
+        fetched_through = days[0] - timedelta(days=1)
+        error = None
+        failures_key = f"{FAILURES}:{endpoint}"
+        failures: dict[date, Any] = {}
+        failed: dict[date, Any] = {}
+        try:
+            if endpoint in RANGE_DATE_KEYS:
+                records = self._fetch_range(endpoint, days[0], days[-1])
+                fetched_through = days[-1]
+            else:
+                method = getattr(self.api, endpoint)
+                failures = self.sink.read(self.account, failures_key, days[0], days[-1])
+                blocked = False
+                for day in days:
+                    try:
+                        records.append((day, method(day.isoformat())))
+                    except GarminConnectConnectionError as e:
+                        error = str(e)
+                        attempts = failures.get(day, {}).get("attempts", 0) + 1
+                        failed[day] = {"attempts": attempts, "error": error}
+                        logger.warning("Sync of %s failed for %s: %s", endpoint, day, e)
+                        if attempts < MAX_DAY_ATTEMPTS:
+                            blocked = True
+                            continue
+                        records.append((day, None))
+                    if not blocked:
+                        fetched_through = day
+        except GarminConnectConnectionError as e:
+            error = str(e)
+            logger.warning("Sync of %s stopped: %s", endpoint, e)
+        finally:
+            self.sink.write(self.account, failures_key, failed.items())
+            self.sink.delete(
+                self.account,
+                failures_key,
+                [day for day, _ in records if day in failures and day not in failed],
+            )
+            written = self.sink.write(self.account, endpoint, records)
+            watermark = self._advance(endpoint, old, fetched_through, today)
+            if records:
+                synced = [day for day, _ in records]
+                for listener in self.listeners:
+                    listener(self.account, endpoint, synced)
+
+        return SyncReport(endpoint, days[0], today, written, watermark, error)
+
+    def _fetch_range(
+        self, endpoint: str, start: date, end: date
+    ) -> list[tuple[date, Any]]:
+        key = RANGE_DATE_KEYS[endpoint]
+        entries = getattr(self.api, endpoint)(start.isoformat(), end.isoformat())
+        return [
+            (_as_date(entry[key]), entry)
+            for entry in entries or []
+            if entry.get(key) is not None
+        ]
+
+    def _advance(
+        self, endpoint: str, old: date | None, fetched_through: date, today: date
+    ) -> date | None:
+        settled = today - timedelta(days=self.settle_days)
+        watermark = min(settled, fetched_through)
+        if old is not None and watermark <= old:
+            return old
+        first = today - timedelta(days=self.history_days)
+        if old is None and watermark <= first:
+            return None
+        self.sink.set_watermark(self.account, endpoint, watermark)
+        return watermark
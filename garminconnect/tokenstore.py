@@ -0,0 +1,371 @@
+"""Token store backends and a background OAuth2 refresher.
+
+A token store persists the garth OAuth1/OAuth2 token pair as the base64 blob
+produced by ``garth.Client.dumps``. Pass one to :meth:`Garmin.login
+<garminconnect.Garmin.login>` instead of a path::
+
+    store = CachedTokenStore(FileTokenStore("~/.garminconnect"))
+    api = Garmin(email, password)
+    api.login(tokenstore=store)  # loads tokens, or logs in and saves them
+    TokenRefresher(api.garth, store).start()
+
+Backends: :class:`FileTokenStore` (garth's ``oauth*_token.json`` directory
+layout, compatible with ``garth.save``), :class:`SQLiteTokenStore`,
+:class:`KeyValueTokenStore` (any Redis-like client with ``get``/``set``/
+``delete``; :class:`MemoryKV` is a local stand-in) and :class:`EnvTokenStore`.
+Every store also caches the login profile next to the tokens so ``login``
+can skip the profile and settings requests.
+"""
+
+from __future__ import annotations
+
+import base64
+import json
+import logging
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    import garth
+
+logger = logging.getLogger(__name__)
+
+OAUTH1_FILE = "oauth1_token.json"
+OAUTH2_FILE = "oauth2_token.json"
+PROFILE_FILE = "profile.json"
+DEFAULT_REFRESH_MARGIN = 300  # seconds before expiry
+
+
+def encode_tokens(oauth1: dict[str, Any], oauth2: dict[str, Any]) -> str:
+    """Encode a token pair in the ``garth.Client.dumps`` format."""
+    return base64.b64encode(json.dumps([oauth1, oauth2]).encode()).decode()
+
+
+def decode_tokens(blob: str) -> tuple[dict[str, Any], dict[str, Any]]:
+    """Decode a ``garth.Client.dumps`` blob into the two token dicts."""
+    oauth1, oauth2 = json.loads(base64.b64decode(blob))
+    return oauth1, oauth2
+
+
+class TokenStore(ABC):
+    """Interface of a token store; subclasses implement the three methods."""
+
+    @abstractmethod
+    def load(self) -> str | None:
+        """Return the stored token blob, or ``None`` if there is none."""
+
+    @abstractmethod
+    def save(self, blob: str) -> None:
+        """Persist a token blob."""
+
+    @abstractmethod
+    def clear(self) -> None:
+        """Remove the stored tokens (and the cached profile)."""
+
+    def load_profile(self) -> dict[str, Any] | None:
+        """Return the cached login profile (see ``Garmin.login``), if any."""
+        return None
+
+    # Optional hook: stores without a profile cache simply keep the default.
+    def save_profile(self, profile: dict[str, Any]) -> None:  # noqa: B027
+        """Cache the login profile next to the tokens."""
+
+
+class FileTokenStore(TokenStore):
+    """Directory with ``oauth1_token.json`` and ``oauth2_token.json``."""
+
+    def __init__(self, path: str | os.PathLike[str]) -> None:
+        self.path = Path(path).expanduser()
+
+    def load(self) -> str | None:
+        try:
+            oauth1 = json.loads((self.path / OAUTH1_FILE).read_text())
+            oauth2 = json.loads((self.path / OAUTH2_FILE).read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        return encode_tokens(oauth1, oauth2)
+
+    def save(self, blob: str) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        tokens = decode_tokens(blob)
+        for name, token in zip((OAUTH1_FILE, OAUTH2_FILE), tokens, strict=True):
+            target = self.path / name
+            tmp = target.with_suffix(".tmp")
+            tmp.write_text(json.dumps(token, indent=4))
+            os.replace(tmp, target)
+
+    def clear(self) -> None:
+        for name in (OAUTH1_FILE, OAUTH2_FILE, PROFILE_FILE):
+            (self.path / name).unlink(missing_ok=True)
+
+    def load_profile(self) -> dict[str, Any] | None:
+        try:
+            return json.loads((self.path / PROFILE_FILE).read_text())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def save_profile(self, profile: dict[str, Any]) -> None:
+        self.path.mkdir(parents=True, exist_ok=True)
+        target = self.path / PROFILE_FILE
+        tmp = target.with_suffix(".tmp")
+        tmp.write_text(json.dumps(profile))
+        os.replace(tmp, target)
+
+
+class SQLiteTokenStore(TokenStore):
+    """Tokens in an SQLite table, one row per ``key`` (e.g. per account)."""
+
+    def __init__(self, path: str | os.PathLike[str], key: str = "default") -> None:
+        self.path = str(Path(path).expanduser()) if path != ":memory:" else path
+        self.key = key
+        self._lock = threading.Lock()
+        import sqlite3
+
+        self._conn = sqlite3.connect(self.path, check_same_thread=False)
+        with self._conn:
+            self._conn.execute(
+                "CREATE TABLE IF NOT EXISTS garmin_tokens ("
+                "key TEXT PRIMARY KEY, blob TEXT NOT NULL, updated_at REAL NOT NULL)"
+            )
+
+    def _get(self, key: str) -> str | None:
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT blob FROM garmin_tokens WHERE key = ?", (key,)
+            ).fetchone()
+        return row[0] if row else None
+
+    def _put(self, key: str, blob: str) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO garmin_tokens (key, blob, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(key) DO UPDATE SET blob = excluded.blob, "
+                "updated_at = excluded.updated_at",
+                (key, blob, time.time()),
+            )
+
+    def load(self) -> str | None:
+        return self._get(self.key)
+
+    def save(self, blob: str) -> None:
+        self._put(self.key, blob)
+
+    def clear(self) -> None:
+        with self._lock, self._conn:
+            self._conn.execute(
+                "DELETE FROM garmin_tokens WHERE key IN (?, ?)",
+                (self.key, self.key + ":profile"),
+            )
+
+    def load_profile(self) -> dict[str, Any] | None:
+        data = self._get(self.key + ":profile")
+        return json.loads(data) if data else None
+
+    def save_profile(self, profile: dict[str, Any]) -> None:
+        self._put(self.key + ":profile", json.dumps(profile))
+
+    def close(self) -> None:
+        self._conn.close()
+
+
+class MemoryKV:
+    """Thread-safe in-process stand-in for the Redis ``get``/``set``/``delete``."""
+
+    def __init__(self) -> None:
+        self._data: dict[str, bytes] = {}
+        self._lock = threading.Lock()
+
+    def get(self, key: str) -> bytes | None:
+        with self._lock:
+            return self._data.get(key)
+
+    def set(self, key: str, value: str | bytes) -> bool:
+        with self._lock:
+            self._data[key] = value.encode() if isinstance(value, str) else value
+        return True
+
+    def delete(self, key: str) -> int:
+        with self._lock:
+            return 1 if self._data.pop(key, None) is not None else 0
+
+
+class KeyValueTokenStore(TokenStore):
+    """Tokens under ``key`` in a Redis-compatible key-value client."""
+
+    def __init__(self, client: Any, key: str = "garminconnect:tokens") -> None:
+        self.client = client
+        self.key = key
+
+    def _get(self, key: str) -> str | None:
+        value = self.client.get(key)
+        if value is None:
+            return None
+        return value.decode() if isinstance(value, bytes) else str(value)
+
+    def load(self) -> str | None:
+        return self._get(self.key)
+
+    def save(self, blob: str) -> None:
+        self.client.set(self.key, blob)
+
+    def clear(self) -> None:
+        self.client.delete(self.key)
+        self.client.delete(self.key + ":profile")
+
+    def load_profile(self) -> dict[str, Any] | None:
+        data = self._get(self.key + ":profile")
+        return json.loads(data) if data else None
+
+    def save_profile(self, profile: dict[str, Any]) -> None:
+        self.client.set(self.key + ":profile", json.dumps(profile))
+
+
+class EnvTokenStore(TokenStore):
+    """Tokens in an environment variable (saving only affects this process)."""
+
+    def __init__(self, var: str = "GARMINTOKENS") -> None:
+        self.var = var
+
+    def load(self) -> str | None:
+        return os.environ.get(self.var) or None
+
+    def save(self, blob: str) -> None:
+        os.environ[self.var] = blob
+
+    def clear(self) -> None:
+        os.environ.pop(self.var, None)
+        os.environ.pop(self.var + "_PROFILE", None)
+
+    def load_profile(self) -> dict[str, Any] | None:
+        data = os.environ.get(self.var + "_PROFILE")
+        return json.loads(data) if data else None
+
+    def save_profile(self, profile: dict[str, Any]) -> None:
+        os.environ[self.var + "_PROFILE"] = json.dumps(profile)
+
+
+class CachedTokenStore(TokenStore):
+    """Keep the last loaded or saved blob in memory in front of ``store``.
+
+    :param ttl: (Optional) Seconds after which the backing store is read
+        again, e.g. to pick up tokens refreshed by another process
+    """
+
+    def __init__(self, store: TokenStore, ttl: float | None = None) -> None:
+        self.store = store
+        self.ttl = ttl
+        self._blob: str | None = None
+        self._profile: dict[str, Any] | None = None
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+
+    def load(self) -> str | None:
+        with self._lock:
+            fresh = self.ttl is None or time.monotonic() - self._loaded_at < self.ttl
+            if self._blob is None or not fresh:
+                self._blob = self.store.load()
+                self._loaded_at = time.monotonic()
+            return self._blob
+
+    def save(self, blob: str) -> None:
+        with self._lock:
+            self.store.save(blob)
+            self._blob = blob
+            self._loaded_at = time.monotonic()
+
+    def clear(self) -> None:
+        with self._lock:
+            self.store.clear()
+            self._blob = None
+            self._profile = None
+
+    def load_profile(self) -> dict[str, Any] | None:
+        with self._lock:
+            if self._profile is None:
+                self._profile = self.store.load_profile()
+            return self._profile
+
+    def save_profile(self, profile: dict[str, Any]) -> None:
+        with self._lock:
+            self.store.save_profile(profile)
+            self._profile = profile
+
+
+def token_expires_in(client: garth.Client) -> float:
+    """Seconds until the client's OAuth2 token expires (negative if expired)."""
+    token = getattr(client, "oauth2_token", None)
+    if token is None or not hasattr(token, "expires_at"):
+        return float("-inf")
+    return token.expires_at - time.time()
+
+
+class TokenRefresher:
+    """Renew a client's OAuth2 token shortly before it expires.
+
+    :meth:`ensure_fresh` refreshes under :attr:`lock` when the token expires
+    within ``margin`` seconds and saves the new tokens to ``store``. Callers
+    that lose the race for the lock find the token already renewed and do
+    not refresh again. :meth:`start` runs the check every ``interval``
+    seconds in a daemon thread.
+    """
+
+    def __init__(
+        self,
+        client: garth.Client,
+        store: TokenStore | None = None,
+        margin: float = DEFAULT_REFRESH_MARGIN,
+        interval: float = 60.0,
+        lock: threading.Lock | None = None,
+    ) -> None:
+        self.client = client
+        self.store = store
+        self.margin = margin
+        self.interval = interval
+        self.lock = lock or threading.Lock()
+        self.refreshes = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread | None = None
+
+    def needs_refresh(self) -> bool:
+        return token_expires_in(self.client) <= self.margin
+
+    def ensure_fresh(self) -> bool:
+        """Refresh the token if it is about to expire; return True if renewed."""
+        if not self.needs_refresh():
+            return False
+        with self.lock:
+            # another thread may have refreshed while we waited for the lock
+            if not self.needs_refresh():
+                return False
+            self.client.refresh_oauth2()
+            self.refreshes += 1
+            if self.store is not None:
+                self.store.save(self.client.dumps())
+            logger.debug("OAuth2 token refreshed")
+            return True
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            try:
+                self.ensure_fresh()
+            except Exception:
+                logger.exception("Background token refresh failed")
+
+    def start(self) -> TokenRefresher:
+        if self._thread is None or not self._thread.is_alive():
+            self._stop.clear()
+            self._thread = threading.Thread(
+                target=self._run, name="TokenRefresher", daemon=True
+            )
+            self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
@@ -0,0 +1,305 @@
+"""Acute/chronic training load computed locally from the activity list.
+
+Garmin Connect only reports acute and chronic load, the acute:chronic
+workload ratio (ACWR) and the four-week load balance through
+``get_training_status``, one request per day, and not for every device.
+The same figures can be derived from the ``activityTrainingLoad`` and
+training effect fields of the activity list, which a single
+``get_activities_by_date`` request returns for a whole range::
+
+    activities = api.get_activities_by_date("2024-01-01", "2024-06-30")
+    load = TrainingLoad.from_activities(
+        activities, date(2024, 4, 1), date(2024, 6, 30)
+    )
+    load.row(date(2024, 6, 30))["acwr"]
+
+The daily loads, exponentially weighted moving averages and rolling sums are
+computed vectorized with NumPy over the whole range in one pass. Continue
+later from :meth:`TrainingLoad.state` with only the new activities::
+
+    state = load.state()
+    newer = TrainingLoad.from_activities(new_activities, start, end, state=state)
+
+Acute and chronic load are EWMAs (``alpha = 2 / (days + 1)``) of the daily
+load over 7 and 28 days, scaled to one week of load like Garmin's
+``dailyTrainingLoadAcute``. The balance columns sum the load of the last 28
+days by focus: low aerobic, high aerobic and anaerobic. Activities before
+``start`` warm up the averages; fetch :data:`WARMUP_DAYS` before it for
+settled values. NumPy is an optional dependency - install it with:
+pip install numpy or: pip install garminconnect[analysis]
+"""
+
+from __future__ import annotations
+
+import math
+from collections.abc import Iterable
+from datetime import date, timedelta
+from typing import TYPE_CHECKING, Any, NamedTuple
+
+from .series import _require_numpy
+
+if TYPE_CHECKING:
+    import numpy as np
+else:
+    try:
+        import numpy as np
+    except ImportError:
+        np = None
+
+DEFAULT_ACUTE_DAYS = 7
+DEFAULT_CHRONIC_DAYS = 28
+BALANCE_DAYS = 28
+LOAD_SCALE = 7  # report the averages as one week of load
+WARMUP_DAYS = 84  # the chronic EWMA keeps < 0.5% of its starting value
+
+# upper ACWR bound of each status; above the last one it is VERY_HIGH
+ACWR_STATUS = ((0.8, "LOW"), (1.3, "OPTIMAL"), (1.5, "HIGH"))
+
+LOW_AEROBIC, HIGH_AEROBIC, ANAEROBIC = range(3)
+FOCUS_COLUMNS = ("aerobic_low", "aerobic_high", "anaerobic")
+# trainingEffectLabel (primary benefit) -> load focus
+FOCUS_LABELS = {
+    "RECOVERY": LOW_AEROBIC,
+    "AEROBIC_BASE": LOW_AEROBIC,
+    "TEMPO": HIGH_AEROBIC,
+    "LACTATE_THRESHOLD": HIGH_AEROBIC,
+    "VO2MAX": HIGH_AEROBIC,
+    "ANAEROBIC_CAPACITY": ANAEROBIC,
+    "SPEED": ANAEROBIC,
+}
+HIGH_AEROBIC_EFFECT = 3.0  # aerobic training effect of "improving" and above
+
+_EWMA_BLOCK = 64  # days per vectorized EWMA step, keeps decay**-k finite
+
+
+class LoadState(NamedTuple):
+    """Where a :class:`TrainingLoad` ended, to continue from it."""
+
+    day: date
+    acute: float
+    chronic: float
+    # focus loads of the last BALANCE_DAYS - 1 days, oldest first
+    recent: tuple[tuple[float, float, float], ...]
+
+
+def load_focus(activity: dict[str, Any]) -> tuple[float, float, float]:
+    """Share of an activity's load that is low aerobic, high aerobic, anaerobic.
+
+    The primary benefit (``trainingEffectLabel``) assigns the whole load to
+    one focus. Without it the load is split by the ratio of anaerobic to
+    aerobic training effect, the aerobic part counting as high from
+    :data:`HIGH_AEROBIC_EFFECT`.
+    """
+    shares = [0.0, 0.0, 0.0]
+    focus = FOCUS_LABELS.get(activity.get("trainingEffectLabel") or "")
+    if focus is not None:
+        shares[focus] = 1.0
+        return shares[0], shares[1], shares[2]
+    aerobic = activity.get("aerobicTrainingEffect") or 0.0
+    anaerobic = activity.get("anaerobicTrainingEffect") or 0.0
+    if aerobic + anaerobic <= 0:
+        return 1.0, 0.0, 0.0
+    shares[ANAEROBIC] = anaerobic / (aerobic + anaerobic)
+    aerobic_focus = HIGH_AEROBIC if aerobic >= HIGH_AEROBIC_EFFECT else LOW_AEROBIC
+    shares[aerobic_focus] = 1.0 - shares[ANAEROBIC]
+    return shares[0], shares[1], shares[2]
+
+
+def daily_loads(
+    activities: Iterable[dict[str, Any]], first: date, days: int
+) -> np.ndarray:
+    """Sum the load of ``activities`` per day and focus.
+
+    Returns a ``(3, days)`` float64 array of low aerobic, high aerobic and
+    anaerobic load for the days from ``first``. Activities without a load or
+    outside the range are ignored.
+    """
+    _require_numpy()
+    starts: list[str] = []
+    loads: list[float] = []
+    shares: list[tuple[float, float, float]] = []
+    for activity in activities:
+        load = activity.get("activityTrainingLoad")
+        start = activity.get("startTimeLocal")
+        if not load or load < 0 or not start:
+            continue
+        starts.append(start[:10])
+        loads.append(load)
+        shares.append(load_focus(activity))
+    result = np.zeros((3, days))
+    if not starts:
+        return result
+    offsets = (
+        np.array(starts, dtype="datetime64[D]") - np.datetime64(first, "D")
+    ).astype(np.int64)
+    inside = (offsets >= 0) & (offsets < days)
+    weighted = np.array(loads)[:, None] * np.array(shares)
+    for focus in range(3):
+        result[focus] = np.bincount(
+            offsets[inside], weights=weighted[inside, focus], minlength=days
+        )
+    return result
+
+
+def ewma(values: np.ndarray, alpha: float, initial: float = 0.0) -> np.ndarray:
+    """Exponentially weighted moving average of ``values`` after ``initial``.
+
+    ``y[i] = y[i - 1] + alpha * (values[i] - y[i - 1])`` evaluated in closed
+    form per block of days, so there is no Python loop per day.
+    """
+    _require_numpy()
+    decay = 1.0 - alpha
+    result = np.empty(len(values))
+    level = initial
+    for begin in range(0, len(values), _EWMA_BLOCK):
+        block = values[begin : begin + _EWMA_BLOCK]
+        powers = decay ** np.arange(1, len(block) + 1)
+        result[begin : begin + len(block)] = powers * (
+            level + alpha * np.cumsum(block / powers)
+        )
+        level = result[begin + len(block) - 1]
+    return result
+
+
+def acwr_status(ratio: float | None) -> str | None:
+    """Classify an acute:chronic workload ratio like Garmin's ``acwrStatus``."""
+    if ratio is None or math.isnan(ratio):
+        return None
+    for bound, status in ACWR_STATUS:
+        if ratio < bound:
+            return status
+    return "VERY_HIGH"
+
+
+class TrainingLoad:
+    """Daily training load, acute/chronic load, ACWR and load balance.
+
+    ``load``, ``acute``, ``chronic`` and ``acwr`` are float64 arrays with one
+    value per day from ``start`` (``acwr`` is NaN while the chronic load is
+    zero). ``focus`` holds the daily and ``balance`` the rolling 28-day load
+    by focus, one row per entry of :data:`FOCUS_COLUMNS`.
+    """
+
+    def __init__(
+        self,
+        start: date,
+        focus: np.ndarray,
+        acute: np.ndarray,
+        chronic: np.ndarray,
+        balance: np.ndarray,
+        recent: np.ndarray | None = None,
+    ) -> None:
+        self.start = start
+        self.focus = focus
+        self.load = focus.sum(axis=0)
+        self.acute = acute
+        self.chronic = chronic
+        with np.errstate(divide="ignore", invalid="ignore"):
+            self.acwr = np.where(chronic > 0, acute / chronic, np.nan)
+        self.balance = balance
+        # focus loads of the last BALANCE_DAYS - 1 days, including carried ones
+        self._recent = focus[:, -(BALANCE_DAYS - 1) :] if recent is None else recent
+
+    @classmethod
+    def from_activities(
+        cls,
+        activities: Iterable[dict[str, Any]],
+        start: date,
+        end: date,
+        state: LoadState | None = None,
+        acute_days: int = DEFAULT_ACUTE_DAYS,
+        chronic_days: int = DEFAULT_CHRONIC_DAYS,
+    ) -> TrainingLoad:
+        """Compute the days ``start..end`` in one pass.
+
+        Without ``state`` the averages start from zero at the first activity
+        (or ``start``); with it they continue from ``state.day``, whose
+        activities are already counted and must not be passed again.
+        """
+        _require_numpy()
+        activities = list(activities)
+        if end < start:
+            raise ValueError("end must not be before start")
+        if state is not None:
+            if start <= state.day:
+                raise ValueError(f"state already covers {state.day}")
+            first = state.day + timedelta(days=1)
+        else:
+            days = [
+                a["startTimeLocal"][:10] for a in activities if a.get("startTimeLocal")
+            ]
+            first = min([start, *map(date.fromisoformat, days)])
+        total = (end - first).days + 1
+
+        focus = daily_loads(activities, first, total)
+        load = focus.sum(axis=0)
+        acute = ewma(
+            load * LOAD_SCALE,
+            2 / (acute_days + 1),
+            state.acute if state is not None else 0.0,
+        )
+        chronic = ewma(
+            load * LOAD_SCALE,
+            2 / (chronic_days + 1),
+            state.chronic if state is not None else 0.0,
+        )
+
+        # rolling BALANCE_DAYS sums, seeded with the days before ``first``
+        carried = np.zeros((3, BALANCE_DAYS - 1))
+        if state is not None and state.recent:
+            recent = np.array(state.recent).T
+            carried[:, -recent.shape[1] :] = recent
+        padded = np.concatenate([carried, focus], axis=1)
+        sums = np.cumsum(padded, axis=1)
+        sums = np.concatenate([np.zeros((3, 1)), sums], axis=1)
+        balance = sums[:, BALANCE_DAYS:] - sums[:, :-BALANCE_DAYS]
+
+        skip = (start - first).days
+        return cls(
+            start,
+            focus[:, skip:],
+            acute[skip:],
+            chronic[skip:],
+            balance[:, skip:],
+            padded[:, -(BALANCE_DAYS - 1) :],
+        )
+
+    def __len__(self) -> int:
+        return len(self.load)
+
+    @property
+    def end(self) -> date:
+        return self.start + timedelta(days=len(self) - 1)
+
+    def row(self, day: date) -> dict[str, Any]:
+        """Return the values of one day, rounded like Garmin reports them."""
+        i = (day - self.start).days
+        if not 0 <= i < len(self):
+            raise KeyError(day)
+        acwr = float(self.acwr[i])
+        ratio = None if math.isnan(acwr) else round(acwr, 2)
+        return {
+            "date": day,
+            "load": round(float(self.load[i]), 1),
+            "acute_load": round(float(self.acute[i]), 1),
+            "chronic_load": round(float(self.chronic[i]), 1),
+            "acwr": ratio,
+            "acwr_status": acwr_status(ratio),
+            **{
+                name: round(float(self.balance[f, i]), 1)
+                for f, name in enumerate(FOCUS_COLUMNS)
+            },
+        }
+
+    def rows(self) -> list[dict[str, Any]]:
+        """Return :meth:`row` for every day."""
+        return [self.row(self.start + timedelta(days=i)) for i in range(len(self))]
+
+    def state(self) -> LoadState:
+        """Return the state after the last day, see :meth:`from_activities`."""
+        return LoadState(
+            self.end,
+            float(self.acute[-1]),
+            float(self.chronic[-1]),
+            tuple((float(a), float(b), float(c)) for a, b, c in self._recent.T),
+        )
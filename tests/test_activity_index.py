@@ -0,0 +1,228 @@
+import json
+import random
+from collections.abc import Iterator
+from datetime import date, datetime, timedelta
+from pathlib import Path
+from typing import Any, cast
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from garminconnect import Garmin  # noqa: E402
+from garminconnect.activity_index import ActivityIndex, gear_by_activity  # noqa: E402
+from garminconnect.lazyjson import loads_lazy  # noqa: E402
+
+TYPES = ["running", "tennis", "cycling", "strength_training"]
+WORDS = ["morning", "track", "intervals", "club", "doubles", "easy", "long"]
+
+
+def _activities(count: int, seed: int = 11) -> list[dict[str, Any]]:
+    rng = random.Random(seed)  # noqa: S311
+    start = datetime(2023, 1, 1, 6)
+    activities: list[dict[str, Any]] = []
+    for i in range(count):
+        when = start + timedelta(minutes=rng.randint(0, 3 * 365 * 24 * 60))
+        activities.append(
+            {
+                "activityId": 1000 + i,
+                "activityName": " ".join(rng.sample(WORDS, 2)).title(),
+                "activityType": {"typeKey": rng.choice(TYPES)},
+                "startTimeLocal": when.strftime("%Y-%m-%d %H:%M:%S"),
+                "duration": rng.uniform(600, 3 * 3600),
+                "distance": rng.choice([None, rng.uniform(0, 40_000)]),
+                "averageHR": rng.choice([None, rng.randint(90, 175)]),
+                "calories": rng.randint(50, 1500),
+            }
+        )
+    return activities
+
+
+def _brute(
+    activities: list[dict[str, Any]],
+    gear: dict[int, str],
+    start: str | None = None,
+    end: str | None = None,
+    type: str | None = None,
+    gear_name: str | None = None,
+    text: str | None = None,
+    **ranges: tuple[float | None, float | None],
+) -> list[int]:
+    result = []
+    for a in activities:
+        day = a["startTimeLocal"][:10]
+        if start and day < start or end and day > end:
+            continue
+        if type and a["activityType"]["typeKey"] != type:
+            continue
+        if gear_name and gear.get(a["activityId"]) != gear_name:
+            continue
+        if text and not set(text.lower().split()) <= set(
+            a["activityName"].lower().split()
+        ):
+            continue
+        fields = {
+            "duration": "duration",
+            "distance": "distance",
+            "average_hr": "averageHR",
+        }
+        ok = True
+        for name, (low, high) in ranges.items():
+            value = a[fields[name]]
+            if (
+                value is None
+                or (low is not None and value < low)
+                or (high is not None and value > high)
+            ):
+                ok = False
+        if ok:
+            result.append(a["activityId"])
+    return sorted(result)
+
+
+def test_queries_match_brute_force() -> None:
+    activities = _activities(3000)
+    gear = {a["activityId"]: "shoes" for a in activities[::3]}
+    index = ActivityIndex(activities, gear)
+    assert len(index) == 3000
+    queries: list[dict[str, Any]] = [
+        {},
+        {
+            "type": "tennis",
+            "start": "2025-01-01",
+            "end": "2025-12-31",
+            "duration": (3600, None),
+            "average_hr": (150, None),
+        },
+        {"text": "track intervals"},
+        {"text": "Easy", "type": "running", "distance": (5000, 10000)},
+        {"gear_name": "shoes", "duration": (None, 1800)},
+        {"start": "2024-02-29", "end": "2024-02-29"},
+        {"type": "swimming"},
+        {"text": "nothing"},
+    ]
+    for query in queries:
+        expected = _brute(activities, gear, **query)
+        kwargs = dict(query)
+        if "gear_name" in kwargs:
+            kwargs["gear"] = kwargs.pop("gear_name")
+        assert sorted(index.query(**kwargs).ids) == expected, query
+
+
+def test_aggregations_and_groups() -> None:
+    activities = [
+        {
+            "activityId": 1,
+            "activityName": "Run",
+            "startTimeLocal": "2025-03-03 07:00:00",
+            "activityType": {"typeKey": "running"},
+            "duration": 1800.0,
+            "distance": 5000.0,
+        },
+        {
+            "activityId": 2,
+            "activityName": "Run",
+            "startTimeLocal": "2025-03-09 07:00:00",
+            "activityType": {"typeKey": "running"},
+            "duration": 3600.0,
+            "distance": None,
+        },
+        {
+            "activityId": 3,
+            "activityName": "Tennis",
+            "startTimeLocal": "2025-04-01 18:00:00",
+            "activityType": {"typeKey": "tennis"},
+            "duration": 5400.0,
+        },
+    ]
+    index = ActivityIndex(activities)
+    runs = index.query(type="running")
+    assert runs.sum("duration") == 5400
+    assert runs.mean("distance") == 5000
+    assert runs.aggregate("distance", "count") == 1
+    assert index.query(type="tennis").max("distance") is None
+
+    everything = index.query()
+    assert everything.group_by("type") == {"running": 2, "tennis": 1}
+    assert everything.group_by("month", "duration") == {
+        date(2025, 3, 1): 5400.0,
+        date(2025, 4, 1): 5400.0,
+    }
+    assert everything.group_by("week") == {
+        date(2025, 3, 3): 2,
+        date(2025, 3, 31): 1,
+    }
+    assert everything.group_by("year", "duration", "max") == {2025: 5400.0}
+    assert everything.group_by("gear") == {None: 3}
+
+    row = runs.rows()[0]
+    assert row["start"] == datetime(2025, 3, 3, 7)
+    assert row["type"] == "running"
+    assert row["average_hr"] is None
+    with pytest.raises(ValueError):
+        index.query(heart_rate=(1, 2))
+
+
+def test_add_replaces_and_save_load(tmp_path: Path) -> None:
+    activities = _activities(200)
+    index = ActivityIndex(activities[:150])
+    renamed = dict(activities[0], activityName="Renamed")
+    assert index.add([renamed, *activities[150:]]) == 51
+    assert len(index) == 200
+    assert index.query(text="renamed").ids == [renamed["activityId"]]
+
+    path = tmp_path / "activities.npz"
+    index.save(path)
+    loaded = ActivityIndex.load(path)
+    query: dict[str, Any] = {"type": "running", "duration": (1800, None)}
+    assert loaded.query(**query).ids == index.query(**query).ids
+    assert loaded.query(text="renamed").ids == [renamed["activityId"]]
+    assert loaded.get(renamed["activityId"])["activityName"] == "Renamed"
+    loaded.add([dict(activities[1], activityName="Again")])
+    assert len(loaded) == 200
+    assert loaded.query(text="again").ids == [activities[1]["activityId"]]
+
+
+def test_save_lazy_activities(tmp_path: Path) -> None:
+    activities = _activities(20)
+    index = ActivityIndex(loads_lazy(json.dumps(activities)))
+    index.save(tmp_path / "lazy.npz")
+    loaded = ActivityIndex.load(tmp_path / "lazy.npz")
+    assert loaded.get(1000) == activities[0]
+    assert loaded.query(type="running").ids == index.query(type="running").ids
+
+
+def test_save_load_add_the_npz_suffix(tmp_path: Path) -> None:
+    index = ActivityIndex(_activities(5))
+    index.save(tmp_path / "activities")
+    assert [p.name for p in tmp_path.iterdir()] == ["activities.npz"]
+    assert len(ActivityIndex.load(tmp_path / "activities")) == 5
+    assert len(ActivityIndex.load(str(tmp_path / "activities.npz"))) == 5
+
+
+def test_api_helpers() -> None:
+    class FakeApi:
+        def __init__(self) -> None:
+            self.ranges: list[tuple[str, str | None]] = []
+
+        def iter_activities_by_date(
+            self, startdate: str, enddate: str | None = None
+        ) -> Iterator[dict[str, Any]]:
+            self.ranges.append((startdate, enddate))
+            yield from _activities(20)
+
+        def get_gear_activities(self, uuid: str) -> list[dict[str, Any]]:
+            return [{"activityId": 1000}] if uuid == "a" else []
+
+    api = FakeApi()
+    garmin = cast(Garmin, api)
+    index = ActivityIndex.from_api(
+        garmin, "2023-01-01", gear=gear_by_activity(garmin, "ab")
+    )
+    assert index.query(gear="a").ids == [1000]
+    index.update_from_api(garmin, days=7)
+    newest = max(a["startTimeLocal"][:10] for a in _activities(20))
+    assert api.ranges[-1] == (
+        str(date.fromisoformat(newest) - timedelta(days=7)),
+        None,
+    )
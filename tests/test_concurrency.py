@@ -0,0 +1,114 @@
+import json
+import threading
+import time
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+from urllib.parse import urlsplit
+
+import garth
+import pytest
+from garth.auth_tokens import OAuth1Token, OAuth2Token
+from requests import PreparedRequest, Response
+from requests.adapters import HTTPAdapter
+
+from garminconnect import Garmin
+
+
+class EchoHandler(BaseHTTPRequestHandler):
+    def do_GET(self) -> None:
+        time.sleep(0.001)
+        body = json.dumps(
+            {"path": self.path, "auth": self.headers.get("Authorization")}
+        ).encode()
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args: Any) -> None:
+        pass
+
+
+class LocalAdapter(HTTPAdapter):
+    """Send every https request to the local plain-HTTP server instead."""
+
+    def __init__(self, port: int) -> None:
+        super().__init__(pool_maxsize=32)
+        self.port = port
+
+    def send(self, request: PreparedRequest, *args: Any, **kwargs: Any) -> Response:
+        parts = urlsplit(request.url or "")
+        request.url = f"http://127.0.0.1:{self.port}{parts.path}?{parts.query}"
+        return super().send(request, *args, **kwargs)
+
+
+@pytest.fixture(scope="module")
+def server() -> Iterator[int]:
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), EchoHandler)
+    thread = threading.Thread(target=httpd.serve_forever, daemon=True)
+    thread.start()
+    yield httpd.server_address[1]
+    httpd.shutdown()
+
+
+def token(access: str, expires_at: int) -> OAuth2Token:
+    fields: dict[str, Any] = {
+        "scope": "x",
+        "jti": "j",
+        "token_type": "Bearer",
+        "access_token": access,
+        "refresh_token": "r",
+        "expires_in": 3600,
+        "expires_at": expires_at,
+        "refresh_token_expires_in": 7200,
+        "refresh_token_expires_at": int(time.time()) + 7200,
+    }
+    return OAuth2Token(**fields)
+
+
+def make_api(port: int, access: str, expires_at: int) -> Garmin:
+    api = Garmin()
+    oauth1: dict[str, Any] = {"oauth_token": "o", "oauth_token_secret": "s"}
+    api.garth.configure(
+        oauth1_token=OAuth1Token(**oauth1),
+        oauth2_token=token(access, expires_at),
+    )
+    # configure() mounts a fresh adapter, so redirect after it
+    api.garth.sess.mount("https://", LocalAdapter(port))
+    return api
+
+
+def test_single_flight_refresh(server: int, monkeypatch: pytest.MonkeyPatch) -> None:
+    exchanges: list[int] = []
+
+    def exchange(oauth1: OAuth1Token, client: Any) -> OAuth2Token:
+        exchanges.append(threading.get_ident())
+        time.sleep(0.05)
+        return token(f"fresh{len(exchanges)}", int(time.time()) + 3600)
+
+    monkeypatch.setattr(garth.sso, "exchange", exchange)
+    api = make_api(server, "stale", 0)
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        results = list(pool.map(lambda i: api.connectapi(f"/svc/item/{i}"), range(200)))
+
+    assert len(exchanges) == 1
+    assert {r["auth"] for r in results} == {"Bearer fresh1"}
+    assert sorted(r["path"] for r in results) == sorted(
+        f"/svc/item/{i}" for i in range(200)
+    )
+
+
+def test_clients_do_not_share_headers(server: int) -> None:
+    apis = [make_api(server, f"user{i}", int(time.time()) + 3600) for i in range(4)]
+
+    def call(i: int) -> tuple[int, str]:
+        api = apis[i % len(apis)]
+        return i % len(apis), api.connectapi("/svc/me")["auth"]
+
+    with ThreadPoolExecutor(max_workers=16) as pool:
+        for index, auth in pool.map(call, range(400)):
+            assert auth == f"Bearer user{index}"
@@ -0,0 +1,48 @@
+import pytest
+
+from garminconnect import Garmin
+from garminconnect.endpoints import (
+    DATE,
+    DISPLAY_NAME,
+    ENDPOINTS,
+    RANGE,
+    endpoints_keyed_by,
+)
+
+
+def test_registry_matches_methods() -> None:
+    for name, endpoint in ENDPOINTS.items():
+        assert callable(getattr(Garmin, name)), name
+        assert endpoint.method in ("GET", "POST", "PUT", "DELETE")
+        assert set(endpoint.keyed_by) <= {DATE, RANGE, DISPLAY_NAME}
+
+
+def test_urls_are_class_level() -> None:
+    api = Garmin()
+    assert "garmin_connect_hill_score_url" not in vars(api)
+    assert api.garmin_connect_hill_score_url == Garmin.garmin_connect_hill_score_url
+    assert Garmin.garmin_workouts_schedule_url == "/workout-service/schedule"
+    # registry paths are not duplicated as class constants
+    assert not hasattr(Garmin, "garmin_connect_daily_sleep_url")
+
+
+def test_url_building() -> None:
+    api = Garmin()
+    api.display_name = "runner"
+    assert (
+        api._url("get_sleep_data") == "/wellness-service/wellness/dailySleepData/runner"
+    )
+    assert (
+        api._url("get_max_metrics", cdate="2024-01-01")
+        == "/metrics-service/metrics/maxmet/daily/2024-01-01/2024-01-01"
+    )
+    with pytest.raises(KeyError):
+        api._url("get_daily_steps", start="2024-01-01")
+
+
+def test_endpoints_keyed_by() -> None:
+    daily = endpoints_keyed_by(DATE)
+    assert "get_hrv_data" in daily
+    assert "get_sleep_data" not in daily
+    assert "get_sleep_data" in endpoints_keyed_by(DATE, DISPLAY_NAME)
+    assert "get_weigh_ins" in endpoints_keyed_by(RANGE)
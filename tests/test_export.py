@@ -0,0 +1,118 @@
+from pathlib import Path
+from typing import Any
+
+import pytest
+
+pa = pytest.importorskip("pyarrow")
+
+from garminconnect.export import (  # noqa: E402
+    ACTIVITIES,
+    HRV,
+    ParquetExporter,
+    export_daily,
+    read_dataset,
+    to_arrow,
+)
+
+
+def activity(i: int, start: str) -> dict[str, Any]:
+    return {
+        "activityId": 1000 + i,
+        "activityName": f"Run {i}",
+        "activityType": {"typeKey": "running"},
+        "startTimeLocal": start,
+        "duration": 1800.5,
+        "averageHR": 150.0,
+        "steps": 4000.0,
+    }
+
+
+ACTIVITIES_2024 = [
+    activity(0, "2024-01-30 07:00:00"),
+    activity(1, "2024-01-31 07:00:00"),
+    activity(2, "2024-02-01 07:00:00"),
+    {"activityId": 9},  # no start time, skipped
+]
+
+
+def test_partitioned_parquet_round_trip(tmp_path: Path) -> None:
+    with ParquetExporter(tmp_path, ACTIVITIES, "alice", row_group_size=1) as exporter:
+        assert exporter.write(ACTIVITIES_2024) == 3
+    assert exporter.skipped == 1
+
+    january = tmp_path / "activities/account=alice/year=2024/month=01"
+    assert [p.name for p in january.iterdir()] == ["part-0.parquet"]
+    metadata = pa.parquet.ParquetFile(january / "part-0.parquet").metadata
+    assert metadata.num_row_groups == 2
+
+    table = read_dataset(tmp_path, "activities", account="alice")
+    assert table.schema.field("activity_id").type == pa.int64()
+    assert sorted(table.column("activity_id").to_pylist()) == [1000, 1001, 1002]
+    assert set(table.column("month").to_pylist()) == {1, 2}
+
+    # exporting a day again replaces its rows and keeps the rest of the month
+    renamed = dict(ACTIVITIES_2024[0], activityName="Renamed")
+    with ParquetExporter(tmp_path, ACTIVITIES, "alice") as exporter:
+        exporter.write([renamed])
+    assert exporter.rows_kept == 1
+    assert [p.name for p in january.iterdir()] == ["part-0.parquet"]
+    table = read_dataset(tmp_path, "activities").sort_by("activity_id")
+    assert table.column("activity_id").to_pylist() == [1000, 1001, 1002]
+    assert table.column("activity_name").to_pylist()[0] == "Renamed"
+
+
+def test_partial_range_export_keeps_other_days(tmp_path: Path) -> None:
+    first = [activity(i, f"2024-03-{i + 1:02d} 07:00:00") for i in range(20)]
+    first.append(activity(30, "2024-04-02 07:00:00"))
+    with ParquetExporter(tmp_path, ACTIVITIES) as exporter:
+        exporter.write(first)
+
+    # 2024-03-12 was deleted since, April has no activity in the range
+    update = [a for a in first[10:20] if a["activityId"] != 1011]
+    with ParquetExporter(
+        tmp_path, ACTIVITIES, start="2024-03-11", end="2024-04-05"
+    ) as exporter:
+        exporter.write(update)
+    assert (exporter.rows_written, exporter.rows_kept) == (9, 10)
+    ids = read_dataset(tmp_path, "activities").column("activity_id").to_pylist()
+    assert sorted(ids) == [1000 + i for i in range(20) if i != 11]
+
+
+def test_failed_export_keeps_stored_rows(tmp_path: Path) -> None:
+    def fetch(cdate: str) -> dict[str, Any]:
+        if cdate == failing:
+            raise ConnectionError(cdate)
+        return {"hrvSummary": {"calendarDate": cdate, "lastNightAvg": 40}}
+
+    failing = None
+    assert export_daily(fetch, tmp_path, "hrv", "2024-01-01", "2024-01-31") == 31
+
+    failing = "2024-01-05"
+    with pytest.raises(ConnectionError):
+        export_daily(
+            fetch, tmp_path, "hrv", "2024-01-01", "2024-01-31", row_group_size=2
+        )
+    assert read_dataset(tmp_path, "hrv").num_rows == 31
+    january = tmp_path / "hrv/account=default/year=2024/month=01"
+    assert [p.name for p in january.iterdir()] == ["part-0.parquet"]
+
+
+def test_to_arrow_keeps_schema_for_missing_fields() -> None:
+    table = to_arrow([{"hrvSummary": {"calendarDate": "2024-03-01"}}], HRV)
+    assert table.schema == HRV.arrow_schema()
+    assert table.column("last_night_avg").null_count == 1
+    assert to_arrow([], "hrv").num_rows == 0
+
+
+def test_export_daily_streams_days(tmp_path: Path) -> None:
+    calls = []
+
+    def fetch(cdate: str) -> dict[str, Any]:
+        calls.append(cdate)
+        return {"hrvSummary": {"calendarDate": cdate, "lastNightAvg": 40 + len(calls)}}
+
+    rows = export_daily(fetch, tmp_path, "hrv", "2024-02-27", "2024-03-02")
+    assert rows == 5
+    assert calls[0] == "2024-02-27" and calls[-1] == "2024-03-02"
+    table = read_dataset(tmp_path, "hrv").sort_by("calendar_date")
+    assert table.column("last_night_avg").to_pylist() == [41, 42, 43, 44, 45]
@@ -0,0 +1,124 @@
+import io
+import zipfile
+from struct import pack
+
+import pytest
+
+from garminconnect.archive import (
+    ArchiveMemberTooLargeError,
+    decode_original,
+    extract_fit,
+    iter_archive,
+    iter_archive_chunks,
+)
+from garminconnect.fit import (  # type: ignore[attr-defined]
+    FIT_EPOCH_OFFSET,
+    FitDataMessage,
+    FitDecodeError,
+    FitDecoder,
+    FitDefinition,
+    _calcCRC,
+)
+
+FIT_FILE = "tests/12129115726_ACTIVITY.fit"
+
+
+def _fit(records: bytes) -> bytes:
+    header = pack("<BBHI4s", 12, 16, 2132, len(records), b".FIT")
+    crc = 0
+    for byte in header + records:
+        crc = _calcCRC(crc, byte)
+    return header + records + pack("<H", crc)
+
+
+def test_decode_sample_activity() -> None:
+    with open(FIT_FILE, "rb") as fh:
+        decoder = FitDecoder(fh.read(), check_crc=True)
+    messages = list(decoder.messages())
+    assert any(isinstance(m, FitDefinition) for m in messages)
+    file_id = next(
+        m for m in messages if isinstance(m, FitDataMessage) and m.global_num == 0
+    )
+    assert file_id.fields[0] == 4  # activity file
+
+    records = decoder.records()
+    assert len(records) == 10
+    assert all(len(col) == len(records) for col in records.columns().values())
+    assert records.timestamp[0] > FIT_EPOCH_OFFSET
+    assert 0 < records.heart_rate[0] < 0xFF
+
+
+def test_open_uses_mmap() -> None:
+    with FitDecoder.open(FIT_FILE) as decoder:
+        assert len(decoder.records()) == 10
+
+
+def test_compressed_timestamps_and_developer_fields() -> None:
+    body = b"".join(
+        [
+            # field_description: dev index 0, field 0, uint16, "Pace"
+            pack("<BBBHB", 0x40, 0, 0, 206, 4),
+            pack("<BBB", 0, 1, 0x02) + pack("<BBB", 1, 1, 0x02),
+            pack("<BBB", 2, 1, 0x02) + pack("<BBB", 3, 5, 0x07),
+            pack("<BBBB", 0, 0, 0, 0x84) + b"Pace\x00",
+            # record definition with timestamp, heart rate and a developer field
+            pack("<BBBHB", 0x61, 0, 0, 20, 2),
+            pack("<BBB", 253, 4, 0x86) + pack("<BBB", 3, 1, 0x02),
+            pack("<BBBB", 1, 0, 2, 0),
+            pack("<B", 0x01) + pack("<IBH", 1000, 120, 300),
+            # compressed header: local type 0 is reused for a record definition
+            pack("<BBBHB", 0x40, 0, 0, 20, 1),
+            pack("<BBB", 3, 1, 0x02),
+            pack("<BB", 0x80 | 10, 130),  # 5-bit offset rolls 1000 forward to 1002
+        ]
+    )
+    decoder = FitDecoder(_fit(body), check_crc=True)
+    data = [m for m in decoder.messages() if isinstance(m, FitDataMessage)]
+    assert data[1].developer_fields == {"Pace": 300}
+    assert data[2].timestamp == FIT_EPOCH_OFFSET + 1002
+
+    records = decoder.records()
+    assert list(records.heart_rate) == [120, 130]
+    assert list(records.timestamp) == [
+        FIT_EPOCH_OFFSET + 1000,
+        FIT_EPOCH_OFFSET + 1002,
+    ]
+
+
+def test_decode_rejects_bad_data() -> None:
+    with pytest.raises(FitDecodeError):
+        list(FitDecoder(b"not a fit file at all").messages())
+    corrupt = bytearray(_fit(b""))
+    corrupt[-1] ^= 0xFF
+    with pytest.raises(FitDecodeError):
+        list(FitDecoder(bytes(corrupt), check_crc=True).messages())
+
+
+def _zip(members: dict[str, bytes]) -> bytes:
+    buf = io.BytesIO()
+    with zipfile.ZipFile(buf, "w", zipfile.ZIP_DEFLATED) as zf:
+        for name, content in members.items():
+            zf.writestr(name, content)
+    return buf.getvalue()
+
+
+def test_original_download_in_memory() -> None:
+    with open(FIT_FILE, "rb") as fh:
+        fit = fh.read()
+    original = _zip({"12129115726_ACTIVITY.fit": fit, "notes.txt": b"hello"})
+
+    assert [name for name, _ in iter_archive(original)] == ["12129115726_ACTIVITY.fit"]
+    assert extract_fit(io.BytesIO(original)) == fit
+    (name, decoder), *_ = decode_original(original)
+    assert len(decoder.records()) == 10
+
+    chunks = {
+        name: b"".join(parts)
+        for name, parts in iter_archive_chunks(original, suffixes=None, chunk_size=100)
+    }
+    assert chunks == {"12129115726_ACTIVITY.fit": fit, "notes.txt": b"hello"}
+
+    with pytest.raises(ArchiveMemberTooLargeError):
+        extract_fit(original, max_member_size=100)
+    with pytest.raises(ValueError):
+        extract_fit(_zip({"notes.txt": b"hello"}))
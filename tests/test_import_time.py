@@ -0,0 +1,55 @@
+import subprocess
+import sys
+
+# modules that must not be imported by a bare ``import garminconnect``
+HEAVY = ("garth", "requests", "pydantic", "numpy", "sqlite3")
+# cumulative import time of the package itself, in microseconds
+BUDGET_US = 150_000
+
+
+def run(*args: str) -> subprocess.CompletedProcess[str]:
+    return subprocess.run(  # noqa: S603
+        [sys.executable, *args], capture_output=True, text=True, check=True
+    )
+
+
+def import_times(code: str) -> dict[str, int]:
+    result = run("-X", "importtime", "-c", code)
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line.split("|")
+        if cumulative.strip().isdigit():
+            times[name.strip()] = int(cumulative)
+    return times
+
+
+def test_import_is_light() -> None:
+    times = import_times("import garminconnect")
+    assert not [name for name in HEAVY if name in times]
+    assert times["garminconnect"] < BUDGET_US
+
+
+def test_submodules_load_on_access() -> None:
+    code = (
+        "import sys, garminconnect\n"
+        "print('garminconnect.fit' in sys.modules)\n"
+        "garminconnect.fit.FitDecoder\n"
+        "print('garminconnect.fit' in sys.modules, 'garth' in sys.modules)"
+    )
+    assert run("-c", code).stdout.split() == ["False", "True", "False"]
+
+
+def test_fit_encoder_stays_importable() -> None:
+    code = (
+        "from garminconnect import FitEncoderWeight\n"
+        "from garminconnect.fit import FitEncoderWeight as encoder\n"
+        "print(FitEncoderWeight is encoder)"
+    )
+    assert run("-c", code).stdout.split() == ["True"]
+
+
+def test_client_imports_http_stack() -> None:
+    times = import_times("import garminconnect; garminconnect.Garmin()")
+    assert "garth" in times and "requests" in times
@@ -0,0 +1,153 @@
+import random
+from collections.abc import Iterable
+from datetime import date, timedelta
+from typing import Any, cast
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from garminconnect import Garmin, GarminConnectConnectionError  # noqa: E402
+from garminconnect.intensity import IntensityEngine, ZoneModel  # noqa: E402
+from garminconnect.series import HeartRateSeries  # noqa: E402
+from garminconnect.sync import SQLiteSink  # noqa: E402
+
+STEP = 2 * 60 * 1000
+DAY_MS = 24 * 60 * 60 * 1000
+START = date(2024, 3, 1)
+MODEL = ZoneModel.create((100, 120, 140, 160, 180), 110, 130)
+
+
+def _heart_rates(day: int, values: list[int | None]) -> dict[str, Any]:
+    start = day * DAY_MS
+    return {"heartRateValues": [[start + i * STEP, v] for i, v in enumerate(values)]}
+
+
+def _series(day: int, values: list[int | None]) -> HeartRateSeries:
+    return HeartRateSeries.from_response(_heart_rates(day, values))
+
+
+def _loop(values: list[int | None]) -> tuple[int, int]:
+    # the per-sample walk of the scripts, each reading covering two minutes
+    moderate = sum(1 for v in values if v is not None and 110 <= v < 130)
+    vigorous = sum(1 for v in values if v is not None and v >= 130)
+    return moderate * STEP, vigorous * STEP
+
+
+def test_matches_sample_by_sample_counts() -> None:
+    rng = random.Random(5)  # noqa: S311
+    days = {}
+    values = {}
+    for i in range(10):
+        values[i] = [rng.choice([None, *range(60, 190, 7)]) for _ in range(720)]
+        days[START + timedelta(days=i)] = _series(i, values[i])
+
+    results = IntensityEngine(MODEL, today=date(2025, 1, 1)).compute(days)
+    for i in range(10):
+        day = results[START + timedelta(days=i)]
+        moderate, vigorous = _loop(values[i])
+        # the last sample of a day covers the median interval as well
+        assert day.moderate_ms == moderate
+        assert day.vigorous_ms == vigorous
+        assert sum(day.zones_ms) == sum(v is not None for v in values[i]) * STEP
+        assert sum(b.moderate_ms + b.vigorous_ms for b in day.bouts) == (
+            moderate + vigorous
+        )
+
+
+def test_bouts_and_minimum_bout_length() -> None:
+    values = [80] * 5 + [115] * 3 + [140, 150] + [90] * 5 + [112] * 2 + [None, 95]
+    engine = IntensityEngine(MODEL, min_bout_ms=5 * STEP, today=date(2025, 1, 1))
+    day = engine.compute({START: _series(0, values)})[START]
+    first, second = day.bouts
+    assert (first.start_ms, first.end_ms) == (5 * STEP, 10 * STEP)
+    assert (first.moderate_ms, first.vigorous_ms) == (3 * STEP, 2 * STEP)
+    assert first.max_hr == 150
+    assert first.avg_hr == pytest.approx((3 * 115 + 140 + 150) / 5)
+    assert (second.moderate_ms, second.vigorous_ms) == (2 * STEP, 0)
+    # only the first bout is long enough to count
+    assert (day.moderate_ms, day.vigorous_ms) == (3 * STEP, 2 * STEP)
+    assert day.moderate_minutes == 6
+    assert day.intensity_minutes == 6 + 2 * 4
+    assert day.zones_ms[:4] == (11 * STEP, 5 * STEP, 0, 2 * STEP)
+
+
+def test_bouts_end_at_midnight_and_gaps() -> None:
+    late = HeartRateSeries(
+        np.array([DAY_MS - STEP, DAY_MS - STEP // 2], dtype=np.int64),
+        np.array([150, 150], dtype=np.uint8),
+        np.zeros(2, dtype=bool),
+    )
+    early = _series(1, [150, 150])
+    gap = _series(2, [150])
+    gap = HeartRateSeries.concat([gap, _series(2, [None] * 10 + [150])])
+    results = IntensityEngine(MODEL, today=date(2025, 1, 1)).compute(
+        {START: late, START + timedelta(days=1): early, START + timedelta(days=2): gap}
+    )
+    assert [len(results[START + timedelta(days=i)].bouts) for i in range(3)] == [
+        1,
+        1,
+        2,
+    ]
+
+
+def test_zone_models() -> None:
+    model = ZoneModel.percent_max(200)
+    assert model.zones == (100, 120, 140, 160, 180)
+    assert (model.moderate, model.vigorous) == (128, 154)
+    model = ZoneModel.percent_reserve(190, 50)
+    assert model.zones[0] == 120
+    assert (model.moderate, model.vigorous) == (106, 134)
+    model = ZoneModel.from_lactate_threshold(
+        {"speed_and_heart_rate": {"heartRate": 170}, "power": {}}
+    )
+    assert model.zones[-1] == 170
+    with pytest.raises(ValueError):
+        ZoneModel.from_lactate_threshold({"speed_and_heart_rate": {}})
+    with pytest.raises(ValueError):
+        ZoneModel.create((120, 100), 110, 130)
+
+
+class FakeApi:
+    def __init__(self, fail: Iterable[str] = ()) -> None:
+        self.calls: list[str] = []
+        self.fail = set(fail)
+
+    def get_heart_rates(self, cdate: str) -> dict[str, Any]:
+        self.calls.append(cdate)
+        if cdate in self.fail:
+            raise GarminConnectConnectionError("boom")
+        day = (date.fromisoformat(cdate) - START).days
+        return _heart_rates(day, [80, 120, 140, 90])
+
+
+def test_days_are_cached_and_invalidated() -> None:
+    sink = SQLiteSink(":memory:")
+    today = START + timedelta(days=6)
+    api = FakeApi(fail={"2024-03-03"})
+    engine = IntensityEngine(MODEL, sink=sink, account="alice", today=today)
+    results = engine.from_api(cast(Garmin, api), START, today)
+    assert len(results) == 6  # the failed day is left out
+    assert results[START].moderate_ms == STEP
+
+    api.fail.clear()
+    api.calls.clear()
+    again = IntensityEngine(MODEL, sink=sink, account="alice", today=today)
+    results = again.from_api(cast(Garmin, api), START, today)
+    # only the failed day and today are fetched again
+    assert api.calls == ["2024-03-03", today.isoformat()]
+    assert len(results) == 7
+    assert again.summary(results.values())["intensity_minutes"] == 7 * (2 + 2 * 2)
+
+    again.invalidate("alice", "get_heart_rates", [START])
+    api.calls.clear()
+    again.from_api(cast(Garmin, api), START, START + timedelta(days=1))
+    assert api.calls == [START.isoformat()]
+
+    # a different model does not reuse the stored results
+    api.calls.clear()
+    other = IntensityEngine(
+        ZoneModel.percent_max(190), sink=sink, account="alice", today=today
+    )
+    other.from_api(cast(Garmin, api), START, START + timedelta(days=1))
+    assert len(api.calls) == 2
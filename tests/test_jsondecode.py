@@ -0,0 +1,74 @@
+import json
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from garminconnect import Garmin, GarminConnectConnectionError
+from garminconnect.jsondecode import DecodeStats, get_decoder
+from garminconnect.lazyjson import MIN_LAZY_BYTES, LazyObject
+
+PAYLOAD = json.dumps({"a": [1, 2, {"b": None}], "c": "é"}).encode()
+
+
+@pytest.mark.parametrize("name", ["json", "orjson", "msgspec"])
+def test_backends_agree(name: str) -> None:
+    try:
+        decoder = get_decoder(name)
+    except ImportError:
+        pytest.skip(f"{name} not installed")
+    assert decoder.name == name
+    assert decoder.loads(PAYLOAD) == json.loads(PAYLOAD)
+
+
+def test_auto_and_unknown() -> None:
+    assert Garmin().json_decoder.name == "json"
+    assert get_decoder("auto").name in ("orjson", "msgspec", "json")
+    with pytest.raises(ValueError):
+        get_decoder("simplejson")
+    with pytest.raises(ValueError):
+        Garmin(json_decoder="simplejson")
+
+
+def test_decode_stats() -> None:
+    stats = DecodeStats()
+    stats.record("/sleep-service/sleep/dailySleepData/x?date=1", 100, 0.5)
+    stats.record("sleep-service/other", 50, 0.25)
+    stats.record("/activitylist-service/activities/search", 10, 0.25)
+    result = stats.as_dict()
+    assert result["/sleep-service"] == {"calls": 2, "bytes": 150, "seconds": 0.75}
+    assert result["total"] == {"calls": 3, "bytes": 160, "seconds": 1.0}
+    stats.reset()
+    assert stats.as_dict()["total"]["calls"] == 0
+
+
+def _fake_garth(
+    monkeypatch: pytest.MonkeyPatch,
+    api: Garmin,
+    status_code: int = 200,
+    content: bytes = PAYLOAD,
+) -> None:
+    def request(method: str, subdomain: str, path: str, **kwargs: Any) -> Any:
+        return SimpleNamespace(status_code=status_code, content=content)
+
+    monkeypatch.setattr(api.garth, "request", request)
+
+
+def test_connectapi_decodes_and_records(monkeypatch: pytest.MonkeyPatch) -> None:
+    api = Garmin(json_decoder="json")
+    _fake_garth(monkeypatch, api)
+    assert api.connectapi("/wellness-service/x") == json.loads(PAYLOAD)
+    assert api.decode_stats.as_dict()["/wellness-service"]["bytes"] == len(PAYLOAD)
+
+    lazy = Garmin(lazy_json=True)
+    _fake_garth(monkeypatch, lazy)
+    assert isinstance(lazy.connectapi("/wellness-service/x"), dict)
+    large = json.dumps({"values": list(range(MIN_LAZY_BYTES // 4))}).encode()
+    _fake_garth(monkeypatch, lazy, content=large)
+    assert isinstance(lazy.connectapi("/wellness-service/x"), LazyObject)
+
+    _fake_garth(monkeypatch, api, status_code=204, content=b"")
+    assert api.connectapi("/wellness-service/x") is None
+    _fake_garth(monkeypatch, api, content=b"")
+    with pytest.raises(GarminConnectConnectionError):
+        api.connectapi("/wellness-service/x")
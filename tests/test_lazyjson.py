@@ -0,0 +1,117 @@
+import json
+import tracemalloc
+from collections.abc import Callable
+
+import pytest
+
+from garminconnect.lazyjson import (
+    LazyArray,
+    LazyJSONError,
+    LazyObject,
+    json_default,
+    loads_lazy,
+    materialize,
+)
+
+DOC = json.dumps(
+    {
+        "name": 'say "hi" [not a list] {nor object}',
+        "nested": {"a": [1, 2.5, None, True], "b": {"c": "\\u00e9"}},
+        "items": [{"id": i, "tags": ["x", "]"]} for i in range(5)],
+        "empty": {},
+        "none": [],
+    }
+)
+
+
+def test_lazy_object_access() -> None:
+    obj = loads_lazy(DOC)
+    assert isinstance(obj, LazyObject)
+    assert obj["name"] == 'say "hi" [not a list] {nor object}'
+    assert obj["nested"]["a"][1] == 2.5
+    assert obj["nested"]["b"]["c"] == "\\u00e9"
+    assert "items" in obj and "missing" not in obj
+    assert obj.get("missing") is None
+    assert len(obj["empty"]) == 0
+    assert list(obj) == ["name", "nested", "items", "empty", "none"]
+
+
+def test_lazy_array_access() -> None:
+    items = loads_lazy(DOC)["items"]
+    assert isinstance(items, LazyArray)
+    assert len(items) == 5
+    assert items[-1]["id"] == 4
+    assert [i["id"] for i in items[1:4]] == [1, 2, 3]
+    assert items[0]["tags"][1] == "]"
+    with pytest.raises(IndexError):
+        items[5]
+    with pytest.raises(IndexError):
+        items[-6]
+    with pytest.raises(IndexError):
+        loads_lazy(b"[1,2,3]          ")[-5]
+
+
+def test_to_python_matches_json() -> None:
+    obj = loads_lazy(DOC.encode())
+    assert obj.to_python() == json.loads(DOC)
+    assert dict(obj["nested"]["b"]) == {"c": "\\u00e9"}
+    assert json.loads(obj["items"].raw()) == json.loads(DOC)["items"]
+
+
+def test_scalar_document() -> None:
+    assert loads_lazy(b" 42 ") == 42
+    assert loads_lazy("null") is None
+
+
+@pytest.mark.parametrize("doc", ["", '{"a" 1}', '{"a": 1', "[1 2]"])
+def test_malformed(doc: str) -> None:
+    with pytest.raises(LazyJSONError):
+        obj = loads_lazy(doc)
+        list(obj)
+
+
+def test_deep_nesting_and_escaped_keys() -> None:
+    doc = '{"a\\"b": 1, "deep": ' + "[" * 40 + '"]{"' + "]" * 40 + ', "z": 2}'
+    obj = loads_lazy(doc)
+    assert obj['a"b'] == 1
+    assert obj["z"] == 2
+    assert obj.to_python() == json.loads(doc)
+
+
+def test_serialize_lazy_proxies() -> None:
+    obj = loads_lazy(DOC)
+    with pytest.raises(TypeError):
+        json.dumps(obj)
+    payload = {"day": "2024-01-01", "items": obj["items"], "obj": obj}
+    assert json.loads(json.dumps(payload, default=json_default)) == {
+        "day": "2024-01-01",
+        "items": json.loads(DOC)["items"],
+        "obj": json.loads(DOC),
+    }
+    plain = materialize([obj["nested"], {"x": obj["none"]}])
+    assert plain == [json.loads(DOC)["nested"], {"x": []}]
+    assert isinstance(plain[0], dict) and isinstance(plain[1]["x"], list)
+
+
+def _peak(func: Callable[[], object]) -> int:
+    tracemalloc.start()
+    try:
+        func()
+        return tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+
+
+def test_lazy_read_peak_memory() -> None:
+    # the reason lazy_json exists: reading a few fields of a large response
+    # must not build the parsed tree
+    raw = json.dumps(
+        {
+            "descriptors": [{"key": f"m{i}", "index": i} for i in range(10)],
+            "metrics": [{"values": [i * 0.5] * 10} for i in range(5_000)],
+        }
+    ).encode()
+    eager = _peak(lambda: json.loads(raw)["metrics"][2_500]["values"][3])
+    lazy = _peak(lambda: loads_lazy(raw)["metrics"][2_500]["values"][3])
+    assert loads_lazy(raw)["metrics"][2_500]["values"][3] == 1250.0
+    assert lazy * 4 < eager
@@ -0,0 +1,68 @@
+from garminconnect.models import (
+    ActivitySummary,
+    BodyBatteryDay,
+    UserSummary,
+    WeighIn,
+    compile_path,
+)
+
+ACTIVITY = {
+    "activityId": 1,
+    "activityName": "Morning Run",
+    "activityType": {"typeId": 1, "typeKey": "running"},
+    "startTimeLocal": "2023-07-01 07:00:00",
+    "duration": 1800.0,
+    "distance": 5000.0,
+    "averageHR": 150.0,
+    "unusedKey": [1, 2, 3],
+}
+
+
+def test_activity_summary() -> None:
+    (activity,) = ActivitySummary.from_list([ACTIVITY])
+    assert activity.activity_id == 1
+    assert activity.type_key == "running"
+    assert activity.average_hr == 150.0
+    assert activity.max_hr is None
+    assert activity.raw is None
+    assert not hasattr(activity, "__dict__")
+    assert activity.to_dict()["name"] == "Morning Run"
+    assert ActivitySummary(ACTIVITY, keep_raw=True).raw is ACTIVITY
+    assert ActivitySummary(ACTIVITY) == activity
+
+
+def test_user_summary_and_body_battery() -> None:
+    summary = UserSummary({"calendarDate": "2023-07-01", "totalSteps": 1234})
+    assert summary.total_steps == 1234
+    assert summary.resting_heart_rate is None
+    assert BodyBatteryDay.from_list(None) == []
+    (day,) = BodyBatteryDay.from_list([{"date": "2023-07-01", "charged": 40}])
+    assert day.charged == 40
+
+
+def test_weigh_ins() -> None:
+    response = {
+        "dailyWeightSummaries": [
+            {
+                "summaryDate": "2023-07-01",
+                "allWeightMetrics": [
+                    {"samplePk": 1, "weight": 80000.0},
+                    {"samplePk": 2, "weight": 79500.0},
+                ],
+            }
+        ]
+    }
+    assert [w.weight for w in WeighIn.from_response(response)] == [80000.0, 79500.0]
+    assert WeighIn.from_response(None) == []
+
+
+def test_fields_are_annotated() -> None:
+    for cls in (ActivitySummary, UserSummary, WeighIn, BodyBatteryDay):
+        assert list(cls.__annotations__) == list(cls.FIELDS), cls.__name__
+
+
+def test_compile_path() -> None:
+    get = compile_path("a.0.b")
+    assert get({"a": [{"b": 1}]}) == 1
+    assert get({"a": []}) is None
+    assert get({"a": None}) is None
@@ -0,0 +1,149 @@
+import base64
+import json
+import threading
+import time
+
+import pytest
+
+from garminconnect import Garmin
+from garminconnect.pool import GarminPool, RateLimiter, TokenBucket
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_token_bucket() -> None:
+    bucket = TokenBucket(rate=2.0, capacity=2, now=0.0)
+    assert bucket.delay(0.0) == 0
+    bucket.take()
+    bucket.take()
+    assert bucket.delay(0.0) == pytest.approx(0.5)
+    assert bucket.delay(0.25) == pytest.approx(0.25)
+    assert bucket.delay(10.0) == 0
+    assert bucket.tokens == 2
+    with pytest.raises(ValueError):
+        TokenBucket(rate=0, capacity=1, now=0.0)
+
+
+def test_rate_limiter_blocks_when_empty() -> None:
+    clock = FakeClock()
+    sleeps: list[float] = []
+
+    def sleep(seconds: float) -> None:
+        sleeps.append(seconds)
+        clock.now += seconds
+
+    limiter = RateLimiter(rate=4.0, burst=2, clock=clock, sleep=sleep)
+    waits = [limiter.acquire() for _ in range(4)]
+    assert waits == [0, 0, pytest.approx(0.25), pytest.approx(0.25)]
+    assert clock.now == pytest.approx(0.5)
+
+
+def _drain(pool: GarminPool, now: float = 0.0) -> tuple[list[str], float | None]:
+    """Run the scheduler by hand and return the account order."""
+    order: list[str] = []
+    while True:
+        picked = pool._next_job(now)
+        if not isinstance(picked, tuple):
+            return order, picked
+        account, (future, method, args, kwargs) = picked
+        future.set_result(method(account.api, *args, **kwargs))
+        order.append(account.key)
+        account.busy = False
+        if account.queue:
+            pool._ready.append(account.key)
+
+
+def test_round_robin_and_rate_limit(monkeypatch: pytest.MonkeyPatch) -> None:
+    clock = FakeClock()
+    pool = GarminPool(max_workers=1, rate=1.0, burst=3, clock=clock)
+    monkeypatch.setattr(pool, "_start_workers", lambda: None)  # schedule by hand
+    pool.add_account("a", login=False)
+    pool.add_account("b", login=False, burst=1)
+    futures = [pool.submit("a", lambda api: "a") for _ in range(5)]
+    futures += [pool.submit("b", lambda api: "b") for _ in range(2)]
+
+    order, wait = _drain(pool)
+    assert order == ["a", "b", "a", "a"]
+    assert wait == pytest.approx(1.0)
+
+    # b waited longest, so it goes first once both buckets refill
+    order, wait = _drain(pool, now=1.0)
+    assert order == ["b", "a"]
+    order, wait = _drain(pool, now=2.0)
+    assert order == ["a"]
+    assert wait is None
+    assert [f.result() for f in futures] == ["a"] * 5 + ["b"] * 2
+
+
+def test_accounts_share_connection_pool() -> None:
+    pool = GarminPool(max_workers=2)
+    api_a = pool.add_account("a", login=False)
+    api_b = pool.add_account("b", login=False)
+    api_cn = pool.add_account("cn", login=False, is_cn=True)
+    url = "https://connectapi.garmin.com/"
+    assert api_a.garth.sess.get_adapter(url) is api_b.garth.sess.get_adapter(url)
+    assert api_a.garth.sess is not api_b.garth.sess
+    assert pool.adapter("garmin.cn") is api_cn.garth.sess.get_adapter(
+        "https://connectapi.garmin.cn/"
+    )
+    with pytest.raises(ValueError):
+        pool.add_account("a", login=False)
+
+
+def _token_blob() -> str:
+    oauth1 = {"oauth_token": "o" * 200, "oauth_token_secret": "s" * 200}
+    oauth2 = {
+        "scope": "x",
+        "jti": "j",
+        "token_type": "Bearer",
+        "access_token": "a" * 200,
+        "refresh_token": "r" * 100,
+        "expires_in": 3600,
+        "expires_at": int(time.time()) + 3600,
+        "refresh_token_expires_in": 7200,
+        "refresh_token_expires_at": int(time.time()) + 7200,
+    }
+    return base64.b64encode(json.dumps([oauth1, oauth2]).encode()).decode()
+
+
+def test_shared_adapter_survives_token_login_and_configure() -> None:
+    pool = GarminPool(max_workers=2)
+    api = pool.add_account("a", tokenstore=_token_blob(), lazy_profile=True)
+    url = "https://connectapi.garmin.com/"
+    assert api.garth.oauth2_token is not None
+    assert api.garth.sess.get_adapter(url) is pool.adapter("garmin.com")
+    api.garth.configure(domain="garmin.com")
+    assert api.garth.sess.get_adapter(url) is pool.adapter("garmin.com")
+
+
+def test_workers_run_jobs() -> None:
+    pool = GarminPool(max_workers=3, rate=1000, burst=1000)
+    for key in ("a", "b"):
+        pool.add_account(key, login=False)
+    running = {"a": 0, "b": 0}
+    overlap: list[int] = []
+    lock = threading.Lock()
+
+    def job(api: Garmin, key: str) -> str:
+        with lock:
+            running[key] += 1
+            overlap.append(running[key])
+        with lock:
+            running[key] -= 1
+        return key
+
+    futures = [pool.submit(key, job, key) for key in "ab" * 10]
+    futures.append(pool.submit("a", "get_unit_system"))
+    with pool:
+        pass
+    assert [f.result() for f in futures[:-1]] == list("ab" * 10)
+    assert max(overlap) == 1
+    assert pool.stats()["a"]["completed"] == 11
+    with pytest.raises(RuntimeError):
+        pool.submit("a", job, "a")
@@ -0,0 +1,72 @@
+from typing import Any
+
+import pytest
+
+from garminconnect import Garmin
+from garminconnect.projection import Projection, compile_projection, project
+
+STATUS = {
+    "mostRecentVO2Max": {"generic": {"vo2MaxValue": 52}},
+    "mostRecentTrainingStatus": {
+        "latestTrainingStatusData": {
+            "3401": {"trainingStatus": 4, "acuteTrainingLoadDTO": {"acwrPercent": 38}}
+        }
+    },
+}
+
+
+def test_tuple_projection() -> None:
+    proj = Projection(["mostRecentVO2Max.generic.vo2MaxValue", "missing.path"])
+    assert proj(STATUS) == (52, None)
+    assert proj(None) == (None, None)
+
+
+def test_dict_projection_with_wildcard() -> None:
+    proj = Projection(
+        {
+            "status": "mostRecentTrainingStatus.latestTrainingStatusData.*"
+            ".trainingStatus",
+            "acwr": "mostRecentTrainingStatus.latestTrainingStatusData.*"
+            ".acuteTrainingLoadDTO.acwrPercent",
+        }
+    )
+    assert proj(STATUS) == {"status": 4, "acwr": 38}
+    assert proj({"mostRecentTrainingStatus": {"latestTrainingStatusData": {}}}) == {
+        "status": None,
+        "acwr": None,
+    }
+
+
+def test_batch_extraction() -> None:
+    proj = compile_projection({"id": "activityId", "hr": "averageHR"})
+    rows = [{"activityId": 1, "averageHR": 140}, {"activityId": 2}]
+    assert proj.extract_many(rows) == [{"id": 1, "hr": 140}, {"id": 2, "hr": None}]
+    assert proj.columns(rows) == {"id": [1, 2], "hr": [140, None]}
+    assert proj.columns([]) == {"id": [], "hr": []}
+
+
+def test_compile_projection_is_cached() -> None:
+    assert compile_projection(["a", "b.c"]) is compile_projection(["a", "b.c"])
+    assert project({"a": 1}, None) == {"a": 1}
+    with pytest.raises(TypeError):
+        compile_projection("a.b")
+    with pytest.raises(ValueError):
+        Projection([])
+
+
+def test_get_daily_fields(monkeypatch: pytest.MonkeyPatch) -> None:
+    api = Garmin()
+    calls: list[str] = []
+
+    def connectapi(url: str, **kwargs: Any) -> dict[str, Any]:
+        calls.append(url)
+        return {"overallStressLevel": len(calls), "stressValuesArray": [[0, 1]] * 10}
+
+    monkeypatch.setattr(api, "connectapi", connectapi)
+    rows = api.get_daily_fields(
+        "get_stress_data", {"avg": "overallStressLevel"}, "2024-01-01", "2024-01-03"
+    )
+    assert rows == [{"avg": 1}, {"avg": 2}, {"avg": 3}]
+    assert calls[0].endswith("/2024-01-01")
+    with pytest.raises(ValueError):
+        api.get_daily_fields("get_activities", ["a"], "2024-01-01")
@@ -0,0 +1,167 @@
+from datetime import date, timedelta
+from typing import Any, cast
+
+import pytest
+
+from garminconnect import Garmin, GarminConnectConnectionError
+from garminconnect.reports import DAILY, MONTH, WEEK, ReportData, summarize
+from garminconnect.sync import SQLiteSink, SyncEngine
+
+TODAY = date(2024, 3, 13)  # a Wednesday
+
+
+class FakeApi:
+    def __init__(self) -> None:
+        self.calls = 0
+        self.steps = 1000
+        self.fail_on: set[str] = set()
+
+    def _day(self, cdate: str) -> int:
+        self.calls += 1
+        return date.fromisoformat(cdate).day
+
+    def get_user_summary(self, cdate: str) -> dict[str, Any]:
+        day = self._day(cdate)
+        return {"totalSteps": self.steps * day, "moderateIntensityMinutes": 10}
+
+    def get_sleep_data(self, cdate: str) -> dict[str, Any]:
+        self._day(cdate)
+        if cdate in self.fail_on:
+            raise GarminConnectConnectionError("boom")
+        return {"dailySleepDTO": {"sleepTimeSeconds": 7 * 3600}}
+
+    def get_heart_rates(self, cdate: str) -> dict[str, Any]:
+        return {"restingHeartRate": 50 + self._day(cdate) % 3}
+
+    def get_hrv_data(self, cdate: str) -> None:
+        self._day(cdate)
+        return None
+
+    def get_stress_data(self, cdate: str) -> dict[str, Any]:
+        return {"avgStressLevel": self._day(cdate)}
+
+    def get_body_battery(self, startdate: str, enddate: str) -> list[dict[str, Any]]:
+        # only the first day of the range has data
+        self.calls += 1
+        return [{"date": startdate, "charged": 40, "drained": 30}]
+
+
+@pytest.fixture
+def sink() -> SQLiteSink:
+    return SQLiteSink(":memory:")
+
+
+def test_daily_rows_come_from_the_store(sink: SQLiteSink) -> None:
+    api = FakeApi()
+    data = ReportData(sink, "alice", api=cast(Garmin, api), today=TODAY)
+    start = TODAY - timedelta(days=6)
+    rows = data.daily(start, TODAY)
+    assert [r["date"] for r in rows] == [start + timedelta(days=i) for i in range(7)]
+    assert rows[0]["steps"] == 7000 and rows[0]["sleep_hours"] == 7
+    assert rows[0]["body_battery_charged"] == 40
+    assert rows[1]["body_battery_charged"] is None
+    assert api.calls == 5 * 7 + 1
+
+    # later runs only fetch the hot day
+    api.calls = 0
+    assert data.daily(start, TODAY)[:-1] == rows[:-1]
+    assert api.calls == 5 + 1
+    rows = data.daily(start, TODAY)
+
+    offline = ReportData(sink, "alice", today=TODAY)
+    assert offline.daily(start, TODAY) == rows
+    assert offline.requests == 0
+
+
+def test_period_summaries_are_cached_and_invalidated(sink: SQLiteSink) -> None:
+    api = FakeApi()
+    data = ReportData(sink, "alice", api=cast(Garmin, api), today=TODAY)
+    weeks = data.weekly(date(2024, 3, 1), TODAY)
+    assert [w["start"] for w in weeks] == [date(2024, 2, 26), date(2024, 3, 4)] + [
+        date(2024, 3, 11)
+    ]
+    march_4 = weeks[1]
+    assert march_4["days"] == 7
+    assert march_4["steps"]["sum"] == sum(range(4, 11)) * 1000
+    assert march_4["resting_hr"]["min"] == 50
+    # the current week is still changing and is not cached
+    assert list(sink.read("alice", WEEK, date(2024, 2, 26), TODAY)) == [
+        date(2024, 2, 26),
+        date(2024, 3, 4),
+    ]
+
+    # a sync that rewrites a day drops the cached row and summaries
+    api.steps = 2000
+    engine = SyncEngine(
+        cast(Garmin, api),
+        sink,
+        "alice",
+        endpoints=["get_user_summary"],
+        settle_days=0,
+        history_days=10,
+        listeners=[data.invalidate],
+    )
+    engine.sync(TODAY)
+    assert sink.read("alice", WEEK, date(2024, 3, 4), date(2024, 3, 4)) == {}
+    assert sink.read("alice", MONTH, date(2024, 3, 1), date(2024, 3, 1)) == {}
+    offline = ReportData(sink, "alice", today=TODAY)
+    assert offline.weekly(date(2024, 3, 4), date(2024, 3, 10))[0]["steps"]["sum"] == (
+        sum(range(4, 11)) * 2000
+    )
+
+
+def test_failed_days_are_skipped_and_not_cached(sink: SQLiteSink) -> None:
+    api = FakeApi()
+    api.fail_on = {"2024-03-05"}
+    today = date(2024, 4, 10)
+    data = ReportData(sink, "alice", api=cast(Garmin, api), today=today)
+    (march,) = data.monthly(date(2024, 3, 1), date(2024, 3, 31))
+    assert march["sleep_hours"]["count"] == 30
+    assert march["steps"]["count"] == 31
+    # a period with an incomplete day is not cached
+    assert sink.read("alice", MONTH, date(2024, 3, 1), date(2024, 3, 1)) == {}
+
+    api.fail_on.clear()
+    (march,) = data.monthly(date(2024, 3, 1), date(2024, 3, 31))
+    assert march["sleep_hours"]["count"] == 31
+    assert list(sink.read("alice", MONTH, date(2024, 3, 1), date(2024, 3, 1)))
+    data.weekly(date(2024, 3, 4), date(2024, 3, 10))
+
+    # rebuilding a day drops both its week and its month
+    sink.delete("alice", DAILY, [date(2024, 3, 6)])
+    data.daily(date(2024, 3, 6), date(2024, 3, 6))
+    assert sink.read("alice", WEEK, date(2024, 3, 4), date(2024, 3, 4)) == {}
+    assert sink.read("alice", MONTH, date(2024, 3, 1), date(2024, 3, 1)) == {}
+
+
+def test_endpoints_limit_the_requests(sink: SQLiteSink) -> None:
+    api = FakeApi()
+    endpoints = ["get_user_summary", "get_sleep_data", "get_heart_rates"]
+    data = ReportData(
+        sink, "alice", api=cast(Garmin, api), today=TODAY, endpoints=endpoints
+    )
+    start = TODAY - timedelta(days=6)
+    week = data.summary(start, TODAY)
+    assert api.calls == 3 * 7
+    assert week["steps"]["count"] == week["resting_hr"]["count"] == 7
+    assert "avg_stress" not in week
+    # rows without every endpoint are rebuilt from the store, not cached
+    assert sink.read("alice", DAILY, start, TODAY) == {}
+    api.calls = 0
+    assert data.summary(start, TODAY) == week
+    assert api.calls == 3
+
+    # a full report only requests the endpoints that are not stored yet
+    full = ReportData(sink, "alice", api=cast(Garmin, api), today=TODAY)
+    api.calls = 0
+    assert full.summary(start, TODAY)["avg_stress"]["count"] == 7
+    assert api.calls == 2 * 7 + 1 + 3
+    with pytest.raises(ValueError):
+        ReportData(sink, endpoints=["get_stats"])
+
+
+def test_summarize_ignores_missing_values() -> None:
+    summary = summarize([{"steps": 10, "sleep_hours": None}, {"steps": 30}, {}])
+    assert summary["days"] == 2
+    assert summary["steps"] == {"count": 2, "sum": 40, "mean": 20, "min": 10, "max": 30}
+    assert "sleep_hours" not in summary
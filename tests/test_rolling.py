@@ -0,0 +1,103 @@
+import random
+from datetime import date, timedelta
+from typing import Any, cast
+
+import pytest
+
+from garminconnect import Garmin
+from garminconnect.rolling import RollingAggregates, RollingSeries
+from garminconnect.sync import SQLiteSink, SyncEngine
+
+START = date(2024, 1, 1)
+
+
+def brute_force(
+    values: dict[date, int], last: date, window: int, shift: int = 0
+) -> list[int]:
+    days = (last - timedelta(days=k) for k in range(shift, shift + window))
+    return [values[d] for d in days if d in values]
+
+
+def test_windows_match_brute_force_with_gaps_and_revisions() -> None:
+    rng = random.Random(7)  # noqa: S311
+    series = RollingSeries((7, 28))
+    values: dict[date, int] = {}
+    for i in range(200):
+        day = START + timedelta(days=i)
+        if rng.random() < 0.1:
+            continue
+        values[day] = rng.randint(40, 70)
+        series.push(day, values[day])
+        if rng.random() < 0.3:  # a recent day is revised
+            revised = day - timedelta(days=rng.randint(0, 3))
+            value = rng.choice([None, rng.randint(40, 70)])
+            assert series.push(revised, value)
+            if value is None:
+                values.pop(revised, None)
+            else:
+                values[revised] = value
+
+    last = START + timedelta(days=199)
+    series.push(last, values.get(last))
+    snapshot = series.snapshot()
+    for window in (7, 28):
+        current = brute_force(values, last, window)
+        previous = brute_force(values, last, window, shift=window)
+        stats = snapshot["windows"][window]
+        assert stats["count"] == len(current)
+        assert stats["sum"] == sum(current)
+        assert (stats["min"], stats["max"]) == (min(current), max(current))
+        assert stats["previous_mean"] == pytest.approx(sum(previous) / len(previous))
+
+    ewma: float | None = None
+    for day in sorted(values):
+        ewma = values[day] if ewma is None else ewma + 2 / 8 * (values[day] - ewma)
+    assert snapshot["ewma"][7] == pytest.approx(ewma)
+    assert RollingSeries.from_dict(series.to_dict()).snapshot() == snapshot
+
+
+def test_old_days_and_long_gaps() -> None:
+    series = RollingSeries((7,))
+    series.push(START, 10)
+    series.push(START + timedelta(days=100), 20)
+    assert series.snapshot()["windows"][7]["count"] == 1
+    assert series.push(START, 30) is False
+
+
+class FakeApi:
+    def __init__(self) -> None:
+        self.rhr = 50
+
+    def get_heart_rates(self, cdate: str) -> dict[str, Any]:
+        return {"restingHeartRate": self.rhr + date.fromisoformat(cdate).day % 2}
+
+
+def test_sync_listener_updates_and_persists() -> None:
+    sink = SQLiteSink(":memory:")
+    rolling = RollingAggregates(sink, "alice", metrics=["resting_hr"], windows=(7,))
+    api = FakeApi()
+    engine = SyncEngine(
+        cast(Garmin, api),
+        sink,
+        "alice",
+        endpoints=["get_heart_rates"],
+        settle_days=2,
+        history_days=10,
+        listeners=[rolling],
+    )
+    today = date(2024, 3, 10)
+    engine.sync(today)
+    week = rolling.snapshot()["resting_hr"]["windows"][7]
+    assert week["count"] == 7 and week["min"] == 50 and week["max"] == 51
+
+    # the settling window is re-synced with revised values
+    api.rhr = 60
+    engine.sync(today + timedelta(days=1))
+    loaded = RollingAggregates(sink, "alice", metrics=["resting_hr"], windows=(7,))
+    snapshot = loaded.snapshot()["resting_hr"]
+    assert snapshot["last"] == today + timedelta(days=1)
+    assert snapshot["windows"][7]["max"] == 61
+    assert snapshot["windows"][7]["sum"] == 51 + 50 + 51 + 50 + 61 + 60 + 61
+
+    loaded.rebuild(date(2024, 1, 1), today + timedelta(days=1))
+    assert loaded.snapshot()["resting_hr"]["windows"][7] == snapshot["windows"][7]
@@ -0,0 +1,144 @@
+from datetime import date
+from typing import Any
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from garminconnect.series import (  # noqa: E402
+    BodyBatterySeries,
+    HeartRateSeries,
+    StressSeries,
+    decode_activity_details,
+)
+
+
+def _activity_details() -> dict[str, Any]:
+    return {
+        "activityId": 42,
+        "metricDescriptors": [
+            {"metricsIndex": 1, "key": "directHeartRate", "unit": {"key": "bpm"}},
+            {"metricsIndex": 0, "key": "directTimestamp", "unit": {"key": "gmt"}},
+            {"metricsIndex": 2, "key": "directSpeed", "unit": {"key": "mps"}},
+        ],
+        "activityDetailMetrics": [
+            {"metrics": [1688198400000.0, 100.0, 2.5]},
+            {"metrics": [1688198401000.0, None, 3.0]},
+            {"metrics": [1688198402000.0, 120.0]},
+        ],
+        "geoPolylineDTO": {
+            "polyline": [{"lat": 52.1, "lon": 4.3}, {"lat": 52.2, "lon": 4.4}]
+        },
+    }
+
+
+def test_decode_activity_details() -> None:
+    details = decode_activity_details(_activity_details())
+    assert details.activity_id == 42
+    assert len(details) == 3
+    assert set(details.keys()) == {"directHeartRate", "directTimestamp", "directSpeed"}
+    assert details.units["directHeartRate"] == "bpm"
+    assert details["directHeartRate"].dtype == np.float64
+    assert np.isnan(details["directHeartRate"][1])
+    assert np.isnan(details["directSpeed"][2])
+    assert details.time[0] == np.datetime64("2023-07-01T08:00:00.000")
+    assert details.polyline.shape == (2, 2)
+
+    stats = details.stats("directHeartRate")
+    assert stats["count"] == 2
+    assert stats["mean"] == 110.0
+
+
+def test_decode_empty_activity_details() -> None:
+    details = decode_activity_details({})
+    assert len(details) == 0
+    assert details.polyline.shape == (0, 2)
+
+
+def _heart_rates(start_ms: int, values: list[int | None]) -> dict[str, Any]:
+    step = 2 * 60 * 1000
+    return {"heartRateValues": [[start_ms + i * step, v] for i, v in enumerate(values)]}
+
+
+def test_heart_rate_series() -> None:
+    series = HeartRateSeries.from_response(
+        _heart_rates(0, [60, 70, None, 125, 130, 90, 150])
+    )
+    assert series.bpm.dtype == np.uint8
+    assert series.timestamps.dtype == np.int64
+    assert series.mask.tolist() == [False, False, True] + [False] * 4
+    assert series.max() == 150
+    assert series.min() == 60
+
+    minutes = series.time_in_zones([100, 120]) // 60000
+    assert minutes.tolist() == [6, 0, 6]
+
+    step = 2 * 60 * 1000
+    assert series.periods_above(120) == [(3 * step, 5 * step), (6 * step, 7 * step)]
+    assert series.periods_above(120, min_duration_ms=2 * step) == [(3 * step, 5 * step)]
+
+    resampled = series.resample(4 * step)
+    assert resampled.bpm.tolist() == [85, 123]
+    assert resampled.timestamps.tolist() == [0, 4 * step]
+
+
+def test_heart_rate_series_concat() -> None:
+    day2 = HeartRateSeries.from_response(_heart_rates(10**9, [80]))
+    day1 = HeartRateSeries.from_response(_heart_rates(0, [60, 61]))
+    joined = HeartRateSeries.concat([day2, day1, HeartRateSeries.from_response({})])
+    assert joined.bpm.tolist() == [60, 61, 80]
+    assert np.all(np.diff(joined.timestamps) > 0)
+
+
+def _daily_stress(start_ms: int) -> dict[str, Any]:
+    step = 3 * 60 * 1000
+    stress = [10, 30, -1, 60, 80, -2, 20]
+    battery = [50, 55, 60, 58, 40, 41]
+    return {
+        "stressValueDescriptorsDTOList": [
+            {"key": "timestamp", "index": 0},
+            {"key": "stressLevel", "index": 1},
+        ],
+        "stressValuesArray": [[start_ms + i * step, v] for i, v in enumerate(stress)],
+        "bodyBatteryValueDescriptorsDTOList": [
+            {
+                "bodyBatteryValueDescriptorIndex": 0,
+                "bodyBatteryValueDescriptorKey": "timestamp",
+            },
+            {
+                "bodyBatteryValueDescriptorIndex": 1,
+                "bodyBatteryValueDescriptorKey": "bodyBatteryStatus",
+            },
+            {
+                "bodyBatteryValueDescriptorIndex": 2,
+                "bodyBatteryValueDescriptorKey": "bodyBatteryLevel",
+            },
+        ],
+        "bodyBatteryValuesArray": [
+            [start_ms + i * step, "MEASURED", v, 2.0] for i, v in enumerate(battery)
+        ],
+    }
+
+
+def test_stress_series() -> None:
+    stress = StressSeries.from_response(_daily_stress(0))
+    assert stress.mask.tolist() == [False, False, True, False, False, True, False]
+    minutes = {k: v // 60000 for k, v in stress.time_in_categories().items()}
+    assert minutes == {"rest": 6, "low": 3, "medium": 3, "high": 3}
+
+    two_days = StressSeries.concat(
+        [StressSeries.from_response(_daily_stress(86_400_000)), stress]
+    )
+    days, low, high = two_days.daily_extremes()
+    assert days.tolist() == [date(1970, 1, 1), date(1970, 1, 2)]
+    assert low.tolist() == [10, 10]
+    assert high.tolist() == [80, 80]
+
+
+def test_body_battery_series() -> None:
+    battery = BodyBatterySeries.from_response(_daily_stress(0))
+    assert battery.level.tolist() == [50, 55, 60, 58, 40, 41]
+    assert battery.charge_drain() == (11, 20)
+    slopes = battery.slopes()
+    assert slopes[0] == 100.0  # +5 in 3 minutes
+    assert slopes.size == 5
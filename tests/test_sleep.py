@@ -0,0 +1,74 @@
+from typing import Any
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from garminconnect.sleep import SleepSeries  # noqa: E402
+
+HOUR_MS = 3_600_000
+
+
+def _night(
+    day: str, start: str, levels: list[tuple[str, str, float]]
+) -> dict[str, Any]:
+    start_ms = int(np.datetime64(start, "ms").astype(np.int64))
+    end_ms = int(np.datetime64(levels[-1][1], "ms").astype(np.int64))
+    return {
+        "dailySleepDTO": {
+            "calendarDate": day,
+            "sleepStartTimestampGMT": start_ms,
+            "sleepEndTimestampGMT": end_ms,
+            "sleepStartTimestampLocal": start_ms + 2 * HOUR_MS,
+        },
+        "sleepLevels": [
+            {"startGMT": s, "endGMT": e, "activityLevel": lvl} for s, e, lvl in levels
+        ],
+    }
+
+
+NIGHT_1 = _night(
+    "2023-07-01",
+    "2023-06-30T21:00:00.0",
+    [
+        ("2023-06-30T21:00:00.0", "2023-06-30T22:00:00.0", 1.0),
+        ("2023-06-30T22:00:00.0", "2023-06-30T23:00:00.0", 0.0),
+        ("2023-06-30T23:00:00.0", "2023-06-30T23:10:00.0", 3.0),
+        ("2023-06-30T23:10:00.0", "2023-07-01T00:00:00.0", 2.0),
+        ("2023-07-01T00:00:00.0", "2023-07-01T05:00:00.0", 1.0),
+    ],
+)
+NIGHT_2 = _night(
+    "2023-07-02",
+    "2023-07-01T22:00:00.0",
+    [
+        ("2023-07-01T22:00:00.0", "2023-07-02T04:00:00.0", 1.0),
+        ("2023-07-02T04:00:00.0", "2023-07-02T06:00:00.0", 0.0),
+    ],
+)
+
+
+def test_sleep_series_stages() -> None:
+    series = SleepSeries.from_responses([NIGHT_1, None, {}, NIGHT_2])
+    assert len(series) == 2
+    assert series.offsets.tolist() == [0, 5, 7]
+    assert series.run_stage.dtype == np.int8
+
+    minutes = (series.stage_seconds() // 60).tolist()
+    assert minutes == [[60, 360, 50, 10], [120, 360, 0, 0]]
+    assert series.sleep_seconds().tolist() == [470 * 60, 480 * 60]
+    assert series.awakenings().tolist() == [1, 0]
+
+
+def test_sleep_series_regularity() -> None:
+    series = SleepSeries.concat(
+        [SleepSeries.from_responses([NIGHT_1]), SleepSeries.from_responses([NIGHT_2])]
+    )
+    assert series.offsets.tolist() == [0, 5, 7]
+    # local onsets are 23:00 and 00:00, i.e. 660 and 720 minutes after noon
+    assert series.onset_minutes().tolist() == [660.0, 720.0]
+    assert series.onset_regularity() == 30.0
+    assert series.midpoint_minutes().tolist() == [900.0, 960.0]
+    assert series.midpoint_drift() == pytest.approx(60.0)
+    summary = series.summary()
+    assert summary["sleep_hours"] == pytest.approx(7.9166, rel=1e-3)
@@ -0,0 +1,172 @@
+import json
+from datetime import date, timedelta
+from types import SimpleNamespace
+from typing import Any, cast
+
+import pytest
+
+from garminconnect import (
+    Garmin,
+    GarminConnectConnectionError,
+    GarminConnectTooManyRequestsError,
+)
+from garminconnect.lazyjson import MIN_LAZY_BYTES, LazyObject
+from garminconnect.sync import (
+    DEFAULT_ENDPOINTS,
+    FAILURES,
+    MAX_DAY_ATTEMPTS,
+    Sink,
+    SQLiteSink,
+    SyncEngine,
+)
+
+TODAY = date(2024, 3, 10)
+START = TODAY - timedelta(days=9)
+
+
+class FakeApi:
+    def __init__(self) -> None:
+        self.calls: list[tuple[str, ...]] = []
+        self.fail_on: set[str] = set()
+        self.error: type[Exception] = GarminConnectConnectionError
+
+    def get_hrv_data(self, cdate: str) -> dict[str, Any]:
+        self.calls.append(("hrv", cdate))
+        if cdate in self.fail_on:
+            raise self.error("boom")
+        return {"hrvSummary": {"calendarDate": cdate}}
+
+    def get_body_battery(self, startdate: str, enddate: str) -> list[dict[str, Any]]:
+        self.calls.append(("bb", startdate, enddate))
+        start = date.fromisoformat(startdate)
+        days = (date.fromisoformat(enddate) - start).days + 1
+        return [
+            {"date": (start + timedelta(days=i)).isoformat(), "charged": i}
+            for i in range(days)
+        ]
+
+
+@pytest.fixture
+def api() -> FakeApi:
+    return FakeApi()
+
+
+@pytest.fixture
+def engine(api: FakeApi) -> SyncEngine:
+    sink = SQLiteSink(":memory:")
+    return SyncEngine(
+        cast(Garmin, api),
+        sink,
+        account="alice",
+        endpoints=["get_hrv_data", "get_body_battery"],
+        settle_days=2,
+        history_days=10,
+    )
+
+
+def test_incremental_sync(engine: SyncEngine, api: FakeApi) -> None:
+    reports = engine.sync(TODAY)
+    assert [r.written for r in reports] == [10, 10]
+    assert all(r.watermark == TODAY - timedelta(days=2) for r in reports)
+    assert len(api.calls) == 11
+
+    # next day: the settling window plus the new day, regardless of history
+    api.calls.clear()
+    tomorrow = TODAY + timedelta(days=1)
+    engine.sync(tomorrow)
+    hrv_days = [call[1] for call in api.calls if call[0] == "hrv"]
+    assert hrv_days == ["2024-03-09", "2024-03-10", "2024-03-11"]
+    assert ("bb", "2024-03-09", "2024-03-11") in api.calls
+
+    stored = engine.sink.read("alice", "get_body_battery", TODAY, tomorrow)
+    assert list(stored) == [TODAY, tomorrow]
+    assert engine.sink.read("bob", "get_hrv_data", TODAY, tomorrow) == {}
+
+
+def test_connection_error_skips_the_day(engine: SyncEngine, api: FakeApi) -> None:
+    api.fail_on = {"2024-03-05"}
+    report = engine.sync_endpoint("get_hrv_data", TODAY)
+    assert report.error == "boom"
+    assert report.watermark == date(2024, 3, 4)
+    assert report.written == 9
+    failures = engine.sink.read("alice", f"{FAILURES}:get_hrv_data", START, TODAY)
+    assert failures == {date(2024, 3, 5): {"attempts": 1, "error": "boom"}}
+
+    api.fail_on = set()
+    assert engine.pending("get_hrv_data", TODAY)[0] == date(2024, 3, 5)
+    assert engine.sync_endpoint("get_hrv_data", TODAY).watermark == date(2024, 3, 8)
+    assert engine.sink.read("alice", f"{FAILURES}:get_hrv_data", START, TODAY) == {}
+
+
+def test_day_failing_every_time_is_stored_empty(
+    engine: SyncEngine, api: FakeApi
+) -> None:
+    api.fail_on = {"2024-03-05"}
+    watermarks = [
+        engine.sync_endpoint("get_hrv_data", TODAY).watermark
+        for _ in range(MAX_DAY_ATTEMPTS)
+    ]
+    assert watermarks[-2:] == [date(2024, 3, 4), date(2024, 3, 8)]
+    stored = engine.sink.read("alice", "get_hrv_data", START, TODAY)
+    assert len(stored) == 10 and stored[date(2024, 3, 5)] is None
+    failures = engine.sink.read("alice", f"{FAILURES}:get_hrv_data", START, TODAY)
+    assert failures[date(2024, 3, 5)]["attempts"] == MAX_DAY_ATTEMPTS
+
+
+def test_rate_limit_saves_progress(engine: SyncEngine, api: FakeApi) -> None:
+    api.fail_on = {"2024-03-03"}
+    api.error = GarminConnectTooManyRequestsError
+    with pytest.raises(GarminConnectTooManyRequestsError):
+        engine.sync(TODAY)
+    assert engine.sink.get_watermark("alice", "get_hrv_data") == date(2024, 3, 2)
+
+
+def test_rejects_unsyncable_endpoints() -> None:
+    with pytest.raises(ValueError):
+        SyncEngine(
+            cast(Garmin, FakeApi()), SQLiteSink(":memory:"), endpoints=["get_devices"]
+        )
+
+
+def test_incomplete_sink_fails_on_instantiation() -> None:
+    class ReadOnly(Sink):
+        def read(
+            self, account: str, endpoint: str, start: date, end: date
+        ) -> dict[date, Any]:
+            return {}
+
+    with pytest.raises(TypeError, match="write"):
+        ReadOnly()  # type: ignore[abstract]
+
+
+def test_default_and_duplicate_endpoints() -> None:
+    sink = SQLiteSink(":memory:")
+    engine = SyncEngine(cast(Garmin, FakeApi()), sink)
+    assert engine.endpoints == list(DEFAULT_ENDPOINTS)
+    engine = SyncEngine(
+        cast(Garmin, FakeApi()),
+        sink,
+        endpoints=["get_stress_data", "get_all_day_stress", "get_hrv_data"],
+    )
+    assert engine.endpoints == ["get_stress_data", "get_hrv_data"]
+
+
+def test_sync_lazy_client(monkeypatch: pytest.MonkeyPatch) -> None:
+    api = Garmin(lazy_json=True)
+    payload = {
+        "hrvSummary": {"weeklyAvg": 50},
+        "hrvReadings": [{"hrvValue": i} for i in range(MIN_LAZY_BYTES // 10)],
+    }
+    content = json.dumps(payload).encode()
+
+    def request(method: str, subdomain: str, path: str, **kwargs: Any) -> Any:
+        return SimpleNamespace(status_code=200, content=content)
+
+    monkeypatch.setattr(api.garth, "request", request)
+    assert isinstance(api.get_hrv_data(TODAY.isoformat()), LazyObject)
+
+    sink = SQLiteSink(":memory:")
+    engine = SyncEngine(api, sink, endpoints=["get_hrv_data"], history_days=2)
+    (report,) = engine.sync(TODAY)
+    assert report.written == 2 and report.error is None
+    assert sink.read("default", "get_hrv_data", TODAY, TODAY) == {TODAY: payload}
@@ -0,0 +1,272 @@
+import threading
+import time
+from collections.abc import Callable
+from pathlib import Path
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+from garth.auth_tokens import OAuth1Token
+
+from garminconnect import Garmin
+from garminconnect.tokenstore import (
+    CachedTokenStore,
+    EnvTokenStore,
+    FileTokenStore,
+    KeyValueTokenStore,
+    MemoryKV,
+    SQLiteTokenStore,
+    TokenRefresher,
+    TokenStore,
+    decode_tokens,
+    encode_tokens,
+)
+
+OAUTH1 = {
+    "oauth_token": "t1",
+    "oauth_token_secret": "s1",
+    "mfa_token": None,
+    "mfa_expiration_timestamp": None,
+    "domain": "garmin.com",
+}
+
+
+def oauth2(expires_at: int) -> dict[str, Any]:
+    return {
+        "scope": "x",
+        "jti": "j",
+        "token_type": "Bearer",
+        "access_token": "a",
+        "refresh_token": "r",
+        "expires_in": 3600,
+        "expires_at": expires_at,
+        "refresh_token_expires_in": 7200,
+        "refresh_token_expires_at": expires_at + 3600,
+    }
+
+
+BLOB = encode_tokens(OAUTH1, oauth2(int(time.time()) + 3600))
+
+
+@pytest.mark.parametrize(
+    "make_store",
+    [
+        lambda tmp_path: FileTokenStore(tmp_path / "tokens"),
+        lambda tmp_path: SQLiteTokenStore(tmp_path / "tokens.db", key="alice"),
+        lambda tmp_path: KeyValueTokenStore(MemoryKV()),
+        lambda tmp_path: EnvTokenStore("GARMINCONNECT_TEST_TOKENS"),
+        lambda tmp_path: CachedTokenStore(FileTokenStore(tmp_path)),
+    ],
+)
+def test_round_trip(tmp_path: Path, make_store: Callable[[Path], TokenStore]) -> None:
+    store = make_store(tmp_path)
+    assert store.load() is None
+    store.save(BLOB)
+    blob = store.load()
+    assert blob is not None and decode_tokens(blob) == decode_tokens(BLOB)
+    store.clear()
+    assert store.load() is None
+
+
+def test_file_store_matches_garth_layout(tmp_path: Path) -> None:
+    FileTokenStore(tmp_path).save(BLOB)
+    assert (tmp_path / "oauth1_token.json").exists()
+    client = Garmin().garth
+    client.load(str(tmp_path))
+    assert isinstance(client.oauth1_token, OAuth1Token)
+    assert client.oauth1_token.oauth_token == OAUTH1["oauth_token"]
+
+
+def test_cached_store_ttl(tmp_path: Path) -> None:
+    backing = FileTokenStore(tmp_path)
+    backing.save(BLOB)
+    cached = CachedTokenStore(backing, ttl=60)
+    assert cached.load() == backing.load()
+    backing.clear()
+    assert cached.load() is not None  # served from memory
+    cached.ttl = 0
+    assert cached.load() is None
+
+
+def test_login_with_token_store(monkeypatch: pytest.MonkeyPatch) -> None:
+    api = Garmin()
+    store = KeyValueTokenStore(MemoryKV())
+    store.save(BLOB)
+
+    def connectapi(path: str, **kwargs: Any) -> dict[str, Any]:
+        if path.endswith("/user-settings"):
+            return {"userData": {"measurementSystem": "metric"}}
+        return {"displayName": "runner", "fullName": "A Runner"}
+
+    monkeypatch.setattr(api.garth, "connectapi", connectapi)
+    assert api.login(tokenstore=store) == (None, None)
+    assert isinstance(api.garth.oauth1_token, OAuth1Token)
+    assert api.garth.oauth1_token.oauth_token == OAUTH1["oauth_token"]
+    assert api.display_name == "runner"
+
+
+def test_refresher_single_flight() -> None:
+    now = time.time()
+    client: Any = SimpleNamespace(oauth2_token=SimpleNamespace(expires_at=now + 10))
+    calls = []
+
+    def refresh_oauth2() -> None:
+        calls.append(1)
+        time.sleep(0.05)
+        client.oauth2_token = SimpleNamespace(expires_at=time.time() + 3600)
+
+    client.refresh_oauth2 = refresh_oauth2
+    client.dumps = lambda: BLOB
+    store = KeyValueTokenStore(MemoryKV())
+    refresher = TokenRefresher(client, store, margin=60)
+
+    threads = [threading.Thread(target=refresher.ensure_fresh) for _ in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(calls) == 1
+    assert refresher.refreshes == 1
+    assert store.load() == BLOB
+    assert refresher.ensure_fresh() is False
+
+
+def test_refresher_background_thread() -> None:
+    client: Any = SimpleNamespace(oauth2_token=SimpleNamespace(expires_at=0))
+    done = threading.Event()
+
+    def refresh_oauth2() -> None:
+        client.oauth2_token = SimpleNamespace(expires_at=time.time() + 3600)
+        done.set()
+
+    client.refresh_oauth2 = refresh_oauth2
+    refresher = TokenRefresher(client, interval=0.01).start()
+    try:
+        assert done.wait(2)
+    finally:
+        refresher.stop()
+
+
+def _counting_connectapi(monkeypatch: pytest.MonkeyPatch, api: Garmin) -> list[str]:
+    calls: list[str] = []
+
+    def connectapi(path: str, **kwargs: Any) -> dict[str, Any]:
+        calls.append(path)
+        if path.endswith("/user-settings"):
+            return {"userData": {"measurementSystem": "metric"}}
+        return {"displayName": "runner", "fullName": "A Runner"}
+
+    monkeypatch.setattr(api.garth, "connectapi", connectapi)
+    return calls
+
+
+def test_login_reuses_cached_profile(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path
+) -> None:
+    store = FileTokenStore(tmp_path)
+    store.save(BLOB)
+
+    first = Garmin()
+    first_calls = _counting_connectapi(monkeypatch, first)
+    first.login(tokenstore=str(tmp_path))
+    profile = store.load_profile()
+    assert first_calls and profile and profile["display_name"] == "runner"
+
+    second = Garmin()
+    second_calls = _counting_connectapi(monkeypatch, second)
+    second.login(tokenstore=store)
+    assert second_calls == []
+    assert (second.display_name, second.unit_system) == ("runner", "metric")
+
+    expired = Garmin()
+    expired_calls = _counting_connectapi(monkeypatch, expired)
+    expired.login(tokenstore=store, profile_ttl=0)
+    assert expired_calls
+
+
+def test_lazy_profile(monkeypatch: pytest.MonkeyPatch) -> None:
+    store = KeyValueTokenStore(MemoryKV())
+    store.save(BLOB)
+    api = Garmin()
+    calls = _counting_connectapi(monkeypatch, api)
+    api.login(tokenstore=store, lazy_profile=True)
+    assert calls == []
+    assert api._url("get_hrv_data", cdate="2024-01-01").endswith("/2024-01-01")
+    assert calls == []
+    assert api.get_full_name() == "A Runner"
+    assert calls
+    profile = store.load_profile()
+    assert profile and profile["unit_system"] == "metric"
+
+
+def test_cached_profile_is_keyed_to_the_token(monkeypatch: pytest.MonkeyPatch) -> None:
+    store = KeyValueTokenStore(MemoryKV())
+    store.save(BLOB)
+    first = Garmin()
+    _counting_connectapi(monkeypatch, first)
+    first.login(tokenstore=store)
+
+    # another account's tokens replaced the stored ones
+    other = {**OAUTH1, "oauth_token": "t2", "oauth_token_secret": "s2"}
+    store.save(encode_tokens(other, oauth2(int(time.time()) + 3600)))
+    second = Garmin()
+    calls = _counting_connectapi(monkeypatch, second)
+    second.login(tokenstore=store)
+    assert calls
+
+
+def test_profile_cache_write_is_best_effort(
+    monkeypatch: pytest.MonkeyPatch, tmp_path: Path, caplog: pytest.LogCaptureFixture
+) -> None:
+    store = FileTokenStore(tmp_path)
+    store.save(BLOB)
+
+    def save_profile(profile: dict[str, Any]) -> None:
+        raise OSError("read-only file system")
+
+    monkeypatch.setattr(store, "save_profile", save_profile)
+    api = Garmin()
+    _counting_connectapi(monkeypatch, api)
+    api.login(tokenstore=store)
+    assert api.display_name == "runner"
+    assert "Could not cache the profile" in caplog.text
+
+
+def test_lazy_profile_loads_once_across_threads(
+    monkeypatch: pytest.MonkeyPatch,
+) -> None:
+    store = KeyValueTokenStore(MemoryKV())
+    store.save(BLOB)
+    api = Garmin()
+    calls = _counting_connectapi(monkeypatch, api)
+    api.login(tokenstore=store, lazy_profile=True)
+    fetch = api.garth.connectapi
+
+    def slow_connectapi(path: str, **kwargs: Any) -> Any:
+        time.sleep(0.05)
+        return fetch(path, **kwargs)
+
+    monkeypatch.setattr(api.garth, "connectapi", slow_connectapi)
+    barrier = threading.Barrier(8)
+    names: list[str | None] = []
+
+    def read() -> None:
+        barrier.wait()
+        names.append(api.display_name)
+
+    threads = [threading.Thread(target=read) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert names == ["runner"] * 8
+    assert len(calls) == 2  # profile and settings, fetched once
+
+
+def test_incomplete_store_fails_on_instantiation() -> None:
+    class LoadOnly(TokenStore):
+        def load(self) -> str | None:
+            return None
+
+    with pytest.raises(TypeError, match="clear"):
+        LoadOnly()  # type: ignore[abstract]
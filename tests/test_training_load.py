@@ -0,0 +1,145 @@
+import random
+from datetime import date, timedelta
+from typing import Any
+
+import pytest
+
+np = pytest.importorskip("numpy")
+
+from garminconnect.training_load import (  # noqa: E402
+    BALANCE_DAYS,
+    TrainingLoad,
+    acwr_status,
+    ewma,
+    load_focus,
+)
+
+START = date(2024, 1, 1)
+
+
+def _activities(days: int, seed: int = 3) -> list[dict[str, Any]]:
+    rng = random.Random(seed)  # noqa: S311
+    labels = ["AEROBIC_BASE", "TEMPO", "VO2MAX", "SPEED", None]
+    activities: list[dict[str, Any]] = []
+    for i in range(days):
+        for _ in range(rng.choice([0, 0, 1, 1, 2])):
+            activities.append(
+                {
+                    "startTimeLocal": f"{START + timedelta(days=i)} 07:30:00",
+                    "activityTrainingLoad": rng.uniform(20, 250),
+                    "trainingEffectLabel": rng.choice(labels),
+                    "aerobicTrainingEffect": rng.uniform(1, 5),
+                    "anaerobicTrainingEffect": rng.uniform(0, 3),
+                }
+            )
+    return activities
+
+
+def _loop(
+    activities: list[dict[str, Any]], days: int, span: int
+) -> tuple[list[float], list[float]]:
+    daily = [0.0] * days
+    for a in activities:
+        daily[(date.fromisoformat(a["startTimeLocal"][:10]) - START).days] += a[
+            "activityTrainingLoad"
+        ]
+    level, result = 0.0, []
+    for value in daily:
+        level += 2 / (span + 1) * (value * 7 - level)
+        result.append(level)
+    return daily, result
+
+
+def test_matches_day_by_day_computation() -> None:
+    activities = _activities(300)
+    load = TrainingLoad.from_activities(activities, START, START + timedelta(days=299))
+    daily, acute = _loop(activities, 300, 7)
+    _, chronic = _loop(activities, 300, 28)
+    assert np.allclose(load.load, daily)
+    assert np.allclose(load.acute, acute)
+    assert np.allclose(load.chronic, chronic)
+    assert np.allclose(load.acwr[1:], np.array(acute[1:]) / chronic[1:])
+    for i in (0, 10, 27, 150, 299):
+        window = daily[max(0, i - BALANCE_DAYS + 1) : i + 1]
+        assert load.balance[:, i].sum() == pytest.approx(sum(window))
+
+
+def test_incremental_update_matches_one_pass() -> None:
+    activities = _activities(200)
+    end = START + timedelta(days=199)
+    whole = TrainingLoad.from_activities(activities, START, end)
+
+    split = START + timedelta(days=119)
+    first = TrainingLoad.from_activities(
+        [a for a in activities if a["startTimeLocal"][:10] <= str(split)],
+        START,
+        split,
+    )
+    later = [a for a in activities if a["startTimeLocal"][:10] > str(split)]
+    rest = TrainingLoad.from_activities(
+        later, split + timedelta(days=30), end, state=first.state()
+    )
+    assert rest.start == split + timedelta(days=30)
+    assert np.allclose(rest.acute, whole.acute[149:])
+    assert np.allclose(rest.chronic, whole.chronic[149:])
+    assert np.allclose(rest.balance, whole.balance[:, 149:])
+    assert rest.row(end) == whole.row(end)
+
+    with pytest.raises(ValueError):
+        TrainingLoad.from_activities(later, split, end, state=first.state())
+
+
+def test_earlier_activities_warm_up_the_range() -> None:
+    activities = _activities(120)
+    start = START + timedelta(days=90)
+    load = TrainingLoad.from_activities(activities, start, start + timedelta(days=9))
+    whole = TrainingLoad.from_activities(activities, START, start + timedelta(days=9))
+    assert len(load) == 10
+    assert load.end == start + timedelta(days=9)
+    assert np.allclose(load.chronic, whole.chronic[90:])
+    assert load.row(start)["chronic_load"] > 0
+    with pytest.raises(KeyError):
+        load.row(START)
+
+
+def test_load_focus_and_row() -> None:
+    assert load_focus({"trainingEffectLabel": "LACTATE_THRESHOLD"}) == (0, 1, 0)
+    assert load_focus(
+        {"aerobicTrainingEffect": 2.0, "anaerobicTrainingEffect": 2.0}
+    ) == (0.5, 0, 0.5)
+    assert load_focus(
+        {"aerobicTrainingEffect": 3.0, "anaerobicTrainingEffect": 1.0}
+    ) == (0, 0.75, 0.25)
+    assert load_focus({}) == (1, 0, 0)
+
+    activities: list[dict[str, Any]] = [
+        {
+            "startTimeLocal": "2024-01-01 08:00:00",
+            "activityTrainingLoad": 100.0,
+            "trainingEffectLabel": "SPEED",
+        },
+        {"startTimeLocal": "2024-01-02 08:00:00", "activityTrainingLoad": None},
+        {"startTimeLocal": "2023-12-01 08:00:00", "activityTrainingLoad": 50.0},
+    ]
+    load = TrainingLoad.from_activities(activities, START, START + timedelta(days=1))
+    row = load.row(START + timedelta(days=1))
+    assert row["load"] == 0
+    assert row["anaerobic"] == 100.0
+    assert row["aerobic_low"] == 0  # December is outside the balance window
+    assert row["acwr_status"] in {"LOW", "OPTIMAL", "HIGH", "VERY_HIGH"}
+
+
+def test_acwr_status_and_ewma_blocks() -> None:
+    assert acwr_status(None) is None
+    assert acwr_status(float("nan")) is None
+    assert acwr_status(0.5) == "LOW"
+    assert acwr_status(1.0) == "OPTIMAL"
+    assert acwr_status(1.4) == "HIGH"
+    assert acwr_status(2.0) == "VERY_HIGH"
+
+    values = np.random.default_rng(1).uniform(0, 300, 1000)
+    level, expected = 10.0, []
+    for value in values:
+        level += 0.25 * (value - level)
+        expected.append(level)
+    assert np.allclose(ewma(values, 0.25, 10.0), expected)